@@ -0,0 +1,282 @@
+"""
+Offline batch mode: analyze every video in one Gemini batch job.
+
+Batch jobs trade latency (results can take hours) for lower cost and higher
+total throughput, which suits events with hundreds of submissions. Videos are
+uploaded with the File API, one inline request per video is submitted as a
+single batch job, and the job is polled until it finishes. Each response is
+then mapped back to its video and recorded like a crew result, so aggregation
+works the same way in both modes.
+
+The Gemini client is injectable, so the flow can be run against a local
+stand-in of the Files and Batches endpoints (see test_batch_mode.py).
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from discovery import mime_type_for
+from logging_config import get_logger
+from result_sink import JsonlResultSink, hash_file
+from sampling import sampling_for_video
+from scheduler import Deadline
+from tools.gemini_file_manager import active_file_manager, delete_file
+from tools.resumable_upload import upload_video
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+SUCCEEDED = 'JOB_STATE_SUCCEEDED'
+TERMINAL_STATES = {SUCCEEDED, 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+
+# Same output format as video_analysis_task, since no agent reformats batch responses
+BATCH_PROMPT = (
+    "Transcribe the audio from this hackathon project demo video and use it, together with "
+    "what is shown, to summarize the project in EXACTLY this format and nothing else:\n\n"
+    "[Actual project name as presented]\n\n"
+    "[One-line description of what it does]\n\n"
+    "[Catchy tagline or category]\n"
+    "@unknown"
+)
+
+
+def _state(job) -> str:
+    state = job.state
+    return getattr(state, 'name', str(state))
+
+
+class GeminiBatchRunner:
+    """Submits per-video analyses as one Gemini batch job."""
+
+    def __init__(self, client=None, model: str = DEFAULT_MODEL, poll_interval: float = 30.0,
+                 processing_timeout: Optional[float] = None):
+        """
+        Args:
+            client: google-genai Client, or a stand-in with the same files/batches methods
+                (created from GOOGLE_API_KEY if omitted)
+            model: Gemini model for the analyses
+            poll_interval: Seconds between batch job status checks
+            processing_timeout: Seconds to wait for an upload to become ACTIVE
+                (GEMINI_PROCESSING_TIMEOUT if omitted)
+        """
+        self._client = client
+        self.model = model
+        self.poll_interval = poll_interval
+        self.processing_timeout = processing_timeout or float(os.getenv("GEMINI_PROCESSING_TIMEOUT", "60"))
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        return self._client
+
+    def upload(self, video_path: str):
+        """
+        Upload a video and wait until Gemini has processed it (blocking).
+
+        With the run's file manager open, the upload goes through its quota admission.
+        It doesn't wait for space: uploads held by this job are only released when
+        the job ends, so a video that doesn't fit fails with FileQuotaError instead.
+        Every upload must be released once the job is done.
+        """
+        manager = active_file_manager()
+        if manager is not None:
+            video_name = manager.acquire(self.client, video_path, timeout=0)
+        else:
+            video_name = upload_video(self.client, video_path)
+        try:
+            waited = 0.0
+            while True:
+                file_info = self.client.files.get(name=video_name)
+                if _state(file_info) == 'ACTIVE':
+                    return file_info
+                if _state(file_info) == 'FAILED':
+                    raise RuntimeError("Video processing failed")
+                if waited >= self.processing_timeout:
+                    raise TimeoutError(f"File not ready after {self.processing_timeout:.0f} seconds")
+                time.sleep(2)
+                waited += 2
+        except Exception:
+            self.release(video_name)
+            raise
+
+    def release(self, video_name: str) -> None:
+        """Give back an upload: to the run's file manager if one is open, otherwise delete it."""
+        manager = active_file_manager()
+        if manager is not None:
+            manager.release(video_name)
+        else:
+            delete_file(self.client, video_name)
+
+    def build_request(self, file_info, video_path: str) -> Dict:
+        """Build the inline batch request for one uploaded video."""
+        sampling = sampling_for_video(video_path)
+        video_metadata = {'fps': sampling['fps']}
+        if sampling['end_offset'] is not None:
+            video_metadata['end_offset'] = f"{sampling['end_offset']}s"
+
+        return {
+            'contents': [{
+                'role': 'user',
+                'parts': [
+                    {
+                        'file_data': {
+                            'file_uri': file_info.uri,
+                            'mime_type': getattr(file_info, 'mime_type', None) or mime_type_for(video_path)
+                        },
+                        'video_metadata': video_metadata
+                    },
+                    {'text': BATCH_PROMPT}
+                ]
+            }]
+        }
+
+    def submit(self, requests: List[Dict]):
+        """Create the batch job."""
+        return self.client.batches.create(
+            model=self.model,
+            src=requests,
+            config={'display_name': f"hackreporter-{int(time.time())}"}
+        )
+
+    def get(self, job_name: str):
+        return self.client.batches.get(name=job_name)
+
+    def cancel(self, job_name: str) -> None:
+        self.client.batches.cancel(name=job_name)
+
+    @staticmethod
+    def responses(job, count: int) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Map a finished job's inline responses to (summary, error) pairs in request order.
+        """
+        if _state(job) != SUCCEEDED:
+            error = getattr(getattr(job, 'error', None), 'message', None) or f"Batch job ended in {_state(job)}"
+            return [(None, error)] * count
+
+        inlined = list(getattr(job.dest, 'inlined_responses', None) or [])
+        results = []
+        for i in range(count):
+            if i >= len(inlined):
+                results.append((None, "No response in batch output"))
+                continue
+            item = inlined[i]
+            if getattr(item, 'error', None):
+                results.append((None, getattr(item.error, 'message', None) or str(item.error)))
+                continue
+            text = getattr(item.response, 'text', None)
+            results.append((text.strip(), None) if text else (None, "Empty response"))
+        return results
+
+
+async def process_batch(
+    video_inputs: List[Dict],
+    sink: JsonlResultSink,
+    output_dir: Path,
+    runner: Optional[GeminiBatchRunner] = None,
+    deadline: Optional[Deadline] = None,
+    reserve: float = 0.0,
+    max_uploads: int = 8
+) -> AsyncIterator[Tuple[Dict, Dict]]:
+    """
+    Analyze videos in one batch job and yield (video_input, record) pairs like scheduler.schedule.
+
+    Every record is written to the sink first. Videos that fail to upload are recorded
+    as errors straight away and left out of the job. If the deadline (minus the
+    reserve) passes before the job finishes, the job is cancelled and the remaining
+    videos are recorded with status 'timeout'. The uploads are released once the job
+    has finished, failed or been cancelled.
+
+    Args:
+        video_inputs: Video inputs as built by process_videos
+        sink: Result sink records are appended to
+        output_dir: Directory for the per-video summary files
+        runner: Batch runner (a default GeminiBatchRunner if omitted)
+        deadline: Global deadline for the run
+        reserve: Seconds before the deadline kept free, e.g. for aggregation
+        max_uploads: Maximum number of concurrent uploads
+    """
+    runner = runner or GeminiBatchRunner()
+    deadline = deadline or Deadline()
+    semaphore = asyncio.Semaphore(max_uploads)
+
+    def save(video_input: Dict, status: str, summary: Optional[str], error: Optional[str]) -> Dict:
+        record = {
+            'video_hash': video_input['video_hash'],
+            'video_filename': video_input['video_filename'],
+            'video_path': video_input['video_path'],
+            'status': status,
+            'error': error,
+            'summary': summary if status == 'success' else f"Error processing {video_input['video_filename']}: {error}",
+            'mode': 'batch'
+        }
+        sink.write(record)
+        summary_name = f"video_summary_{Path(video_input['video_filename']).stem}_{record['video_hash'][:8]}.txt"
+        with open(output_dir / summary_name, 'w') as f:
+            f.write(record['summary'])
+        return record
+
+    uploaded = []
+
+    async def prepare(video_input: Dict):
+        async with semaphore:
+            video_input = {**video_input}
+            if not video_input.get('video_hash'):
+                video_input['video_hash'] = await asyncio.to_thread(hash_file, video_input['video_path'])
+            try:
+                file_info = await asyncio.to_thread(runner.upload, video_input['video_path'])
+            except Exception as e:
+                return video_input, None, str(e)
+            uploaded.append(file_info.name)
+            try:
+                request = await asyncio.to_thread(runner.build_request, file_info, video_input['video_path'])
+            except Exception as e:
+                return video_input, None, str(e)
+            return video_input, request, None
+
+    try:
+        submitted, requests = [], []
+        for video_input, request, error in await asyncio.gather(*(prepare(v) for v in video_inputs)):
+            if error:
+                yield video_input, save(video_input, 'error', None, f"Upload failed: {error}")
+            else:
+                submitted.append(video_input)
+                requests.append(request)
+
+        if not submitted:
+            return
+
+        job = await asyncio.to_thread(runner.submit, requests)
+        logger.info(f"📦 Submitted batch job {job.name} with {len(submitted)} videos")
+
+        try:
+            while _state(job) not in TERMINAL_STATES:
+                remaining = deadline.remaining()
+                if remaining is not None and remaining - reserve <= 0:
+                    logger.warning(f"⏱️  Deadline reached, cancelling batch job {job.name}")
+                    await asyncio.to_thread(runner.cancel, job.name)
+                    for video_input in submitted:
+                        yield video_input, save(video_input, 'timeout', None,
+                                                "Batch job did not finish before the deadline")
+                    return
+                await asyncio.sleep(runner.poll_interval if remaining is None
+                                    else min(runner.poll_interval, remaining - reserve))
+                job = await asyncio.to_thread(runner.get, job.name)
+        except asyncio.CancelledError:
+            # Interrupted: don't leave the job running (and billing) in the background
+            await asyncio.to_thread(runner.cancel, job.name)
+            raise
+
+        logger.info(f"📦 Batch job {job.name} finished: {_state(job)}")
+        results = runner.responses(job, len(submitted))
+    finally:
+        # The job no longer reads the videos, whether it finished, failed or was cancelled
+        for name in uploaded:
+            await asyncio.to_thread(runner.release, name)
+
+    for video_input, (summary, error) in zip(submitted, results):
+        yield video_input, save(video_input, 'success' if summary else 'error', summary, error)
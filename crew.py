@@ -1,15 +1,82 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from pathlib import Path
+from pydantic import BaseModel, Field
 import json
 import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 
-from tools import GeminiVideoTool, TwitterSearchTool, TypefullyTool
-from crewai_tools import StagehandTool
+from tools import GeminiVideoTool, TwitterSearchTool, TypefullyBatchPublisher, TypefullyTool
+from result_sink import JsonlResultSink, hash_file
+from batch_mode import process_batch
+from dedup import find_duplicates
+from preflight import preflight_summary, preflight_videos
+from sampling import remember_duration
+from history_store import ProjectHistory
+from discovery import describe_video, discover_videos
+from scheduler import CostModel, Deadline, min_timeout, run_started, schedule
+from ranking import (insert_ranked, load_ranking, merge_team_handles, parse_summary, published_state,
+                     reference_projects, save_ranking)
+from thread_renderer import (TWEET_MAX_LENGTH, render_project_draft, render_project_tweet, render_thread, validate_thread,
+                             weighted_length)
+from tools.compact_analysis import load_team_members
+from tools.gemini_file_manager import close_file_manager, open_file_manager
+from tools.gemini_prompt_cache import close_prompt_cache, open_prompt_cache
+from worker_pool import WorkerPool
+from triage import TRIAGE_MODEL, record_triage, select_deep_pass, triage_videos
+from logging_config import agents_verbose, configure_logging, get_logger
 import os
-from stagehand.schemas import AvailableModel
+import signal
+
+logger = get_logger(__name__)
+
+
+NOT_PROVIDED = 'Not provided'
+
+# Videos processed at once by default: the size of Python's default thread pool.
+# Crews run in a pool of this many threads, so more videos would only queue.
+DEFAULT_CONCURRENCY = min(32, (os.cpu_count() or 1) + 4)
+
+# Inputs a task needs to do useful work; without them the task is skipped
+# instead of spending an agent round-trip on "no information available".
+TASK_REQUIRED_INPUTS = {
+    'team_research_task': ['project_gallery_url'],
+    'person_research_task': ['attendee_list'],
+}
+
+
+def has_required_inputs(task_name: str, inputs: dict) -> bool:
+    """Check whether every input required by a task was actually provided."""
+    return all(
+        inputs.get(key) not in (None, '', NOT_PROVIDED)
+        for key in TASK_REQUIRED_INPUTS.get(task_name, [])
+    )
+
+
+class ProjectScore(BaseModel):
+    """Engagement score for one newly added project."""
+    index: int = Field(description="Index of the new project as shown in the task")
+    score: float = Field(description="Engagement score from 0 to 100")
+    reason: str = Field(default="", description="One-sentence reason for the score")
+
+
+class ProjectScores(BaseModel):
+    """Output schema for project_scoring_task."""
+    scores: List[ProjectScore]
+
+
+class PolishedDescription(BaseModel):
+    """Rewritten description for one project."""
+    index: int = Field(description="Index of the project as shown in the task")
+    description: str = Field(description="Polished one-line description")
+
+
+class PolishedDescriptions(BaseModel):
+    """Output schema for thread_polish_task."""
+    descriptions: List[PolishedDescription]
 
 
 @CrewBase
@@ -25,11 +92,15 @@ class HackReporterCrew():
         return Agent(
             config=self.agents_config['video_summarizer'],  # type: ignore[index]
             tools=[GeminiVideoTool()],
-            verbose=True
+            verbose=agents_verbose()
         )
 
     @agent
     def person_finder(self) -> Agent:
+        # Stagehand pulls in a browser automation stack, so only import it when this agent is built
+        from crewai_tools import StagehandTool
+        from stagehand.schemas import AvailableModel
+
         return Agent(
             config=self.agents_config['person_finder'],  # type: ignore[index]
             tools=[
@@ -41,7 +112,7 @@ class HackReporterCrew():
                 ),
                 # TwitterSearchTool()
             ],
-            verbose=True
+            verbose=agents_verbose()
         )
 
     @agent
@@ -49,92 +120,370 @@ class HackReporterCrew():
         return Agent(
             config=self.agents_config['thread_composer'],  # type: ignore[index]
             tools=[TypefullyTool()],
-            verbose=True
+            verbose=agents_verbose()
         )
 
     @agent
     def video_ranker(self) -> Agent:
         return Agent(
             config=self.agents_config['video_ranker'],  # type: ignore[index]
-            verbose=True
+            verbose=agents_verbose()
         )
 
     # Individual video processing tasks
     @task
     def video_analysis_task(self) -> Task:
         return Task(
-            config=self.tasks_config['video_analysis_task']  # type: ignore[index]
+            config=self.tasks_config['video_analysis_task'],  # type: ignore[index]
+            agent=self.video_summarizer()
         )
 
     @task
     def person_research_task(self) -> Task:
         return Task(
-            config=self.tasks_config['person_research_task']  # type: ignore[index]
+            config=self.tasks_config['person_research_task'],  # type: ignore[index]
+            agent=self.person_finder()
         )
 
     @task
     def team_research_task(self) -> Task:
         return Task(
-            config=self.tasks_config['team_research_task']  # type: ignore[index]
+            config=self.tasks_config['team_research_task'],  # type: ignore[index]
+            agent=self.person_finder()
         )
 
     @task
     def create_tweet_summary_task(self) -> Task:
         return Task(
-            config=self.tasks_config['create_tweet_summary_task']  # type: ignore[index]
+            config=self.tasks_config['create_tweet_summary_task'],  # type: ignore[index]
+            agent=self.video_summarizer()
         )
 
     # Aggregation tasks
     @task
     def aggregate_summaries_task(self) -> Task:
         return Task(
-            config=self.tasks_config['aggregate_summaries_task']  # type: ignore[index]
+            config=self.tasks_config['aggregate_summaries_task'],  # type: ignore[index]
+            agent=self.thread_composer()
         )
 
     @task
     def video_ranking_task(self) -> Task:
         return Task(
-            config=self.tasks_config['video_ranking_task']  # type: ignore[index]
+            config=self.tasks_config['video_ranking_task'],  # type: ignore[index]
+            agent=self.video_ranker()
+        )
+
+    @task
+    def project_scoring_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['project_scoring_task'],  # type: ignore[index]
+            agent=self.video_ranker(),
+            output_pydantic=ProjectScores
+        )
+
+    @task
+    def thread_polish_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['thread_polish_task'],  # type: ignore[index]
+            agent=self.thread_composer(),
+            output_pydantic=PolishedDescriptions
         )
 
     @task
     def final_tweet_composition_task(self) -> Task:
         return Task(
             config=self.tasks_config['final_tweet_composition_task'],  # type: ignore[index]
+            agent=self.thread_composer(),
             output_file='output/tweet_thread.md'
         )
 
-    @crew
-    def individual_crew(self) -> Crew:
-        """Creates the crew for individual video processing"""
+    # The crews below are plain methods rather than @crew: the decorator instantiates
+    # every task and agent of the class up front, including unused tasks and tools.
+    def _build_crew(self, task_names: List[str], inputs: dict | None = None) -> Crew:
+        """
+        Build a sequential crew from the named tasks, dropping tasks whose inputs are missing.
+
+        Only the tasks that remain (and the agents they are assigned to) are constructed.
+        """
+        if inputs is not None:
+            task_names = [name for name in task_names if has_required_inputs(name, inputs)]
+
+        tasks = [getattr(self, name)() for name in task_names]
+
+        agents = {}
+        for t in tasks:
+            agents.setdefault(t.agent.role, t.agent)
+
         return Crew(
-            agents=[self.video_summarizer(),
-                    self.person_finder()  # Re-enabled for team research
-                    ],
-            tasks=[
-                self.video_analysis_task(),
-                self.team_research_task()  # Re-enabled for team research
-            ],
+            agents=list(agents.values()),
+            tasks=tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=agents_verbose(),
         )
 
-    @crew
+    def individual_crew(self, inputs: dict | None = None) -> Crew:
+        """
+        Creates the crew for individual video processing
+
+        Args:
+            inputs: Video inputs the crew will be kicked off with. When given, tasks whose
+                required inputs are 'Not provided' (e.g. team research without a project
+                gallery URL) are left out.
+        """
+        return self._build_crew(['video_analysis_task', 'team_research_task'], inputs)
+
     def aggregator_crew(self) -> Crew:
-        """Creates the crew for aggregating results"""
-        return Crew(
-            agents=[self.thread_composer(), self.video_ranker()],
-            tasks=[
-                self.aggregate_summaries_task(),
-                self.video_ranking_task(),
-                self.final_tweet_composition_task()
-            ],
-            process=Process.sequential,
-            verbose=True,
-        )
+        """
+        Creates the crew that aggregates, ranks and composes the thread entirely with LLMs.
+
+        aggregate_summaries renders the thread deterministically instead; this crew is
+        kept for comparison (see test_aggregation.py).
+        """
+        return self._build_crew([
+            'aggregate_summaries_task',
+            'video_ranking_task',
+            'final_tweet_composition_task'
+        ])
+
+    def scoring_crew(self) -> Crew:
+        """Creates the crew that scores projects for ranking"""
+        return self._build_crew(['project_scoring_task'])
+
+    def polish_crew(self) -> Crew:
+        """Creates the crew that optionally polishes project descriptions"""
+        return self._build_crew(['thread_polish_task'])
 
 
-async def process_videos(directory: str, attendee_list: str | None = None, project_gallery_url: str | None = None) -> dict:
+def crew_summary(result) -> str:
+    """
+    The summary of an individual crew run: the video analysis, plus team handles.
+
+    With a project gallery the crew's final output is the team research report, so
+    the summary is taken from the first task's output instead.
+    """
+    outputs = [getattr(output, 'raw', None) or str(output) for output in getattr(result, 'tasks_output', None) or []]
+    if not outputs:
+        return getattr(result, 'raw', None) or str(result)
+    return merge_team_handles(outputs[0], outputs[1] if len(outputs) > 1 else None)
+
+
+# Base crews of a pool worker process, one per distinct attendee list/gallery URL
+_process_crews = {}
+
+
+def run_individual_crew(video_input: dict) -> dict:
+    """
+    Run the individual crew on one video inside a process pool worker.
+
+    Each worker process builds its base crew once and copies it per video, like
+    the in-process backend does. Only plain data crosses the process boundary, so
+    the duration probed by the parent's preflight travels in the video input.
+
+    Returns:
+        Picklable record with the summary, the worker's pid and the elapsed seconds
+    """
+    started = time.monotonic()
+    if video_input.get('duration'):
+        remember_duration(video_input['video_path'], video_input['duration'])
+    key = (video_input['attendee_list'], video_input['project_gallery_url'])
+    if key not in _process_crews:
+        _process_crews[key] = HackReporterCrew().individual_crew(video_input)
+    result = _process_crews[key].copy().kickoff(inputs=video_input)
+    return {
+        'summary': crew_summary(result),
+        'pid': os.getpid(),
+        'elapsed': time.monotonic() - started
+    }
+
+
+def _init_crew_worker(file_manager_settings: dict | None, prompt_cache_ttl: float | None = None) -> None:
+    # Ctrl+C reaches the whole process group. Workers ignore it, so an in-flight crew isn't
+    # killed and recorded as an error; the parent cancels the video and terminates the worker.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Logging settings come from the environment the parent stored them in
+    configure_logging()
+    if file_manager_settings is not None:
+        open_file_manager(**file_manager_settings)
+    if prompt_cache_ttl is not None:
+        open_prompt_cache(prompt_cache_ttl)
+
+
+def _close_crew_worker() -> None:
+    close_file_manager()
+    close_prompt_cache()
+
+
+def create_crew_workers(max_workers: int | None = None, file_manager_settings: dict | None = None,
+                        prompt_cache_ttl: float | None = None) -> WorkerPool:
+    """
+    Create a bounded pool of worker processes for per-video crews.
+
+    Workers are spawned rather than forked, so they don't inherit the event loop,
+    threads or open HTTP connections of the parent. Unlike the threads of the
+    default backend, a worker whose crew overruns its timeout is terminated and
+    replaced, so it doesn't keep using API quota or hold up the videos after it.
+    Workers ignore Ctrl+C: the parent cancels the in-flight videos, records them as
+    interrupted and terminates their workers.
+
+    Args:
+        max_workers: Number of worker processes (one per CPU if omitted)
+        file_manager_settings: Settings of the parent's file manager; each worker opens
+            its own with them, counting the other processes' uploads against the quota,
+            and deletes its uploads when it shuts down
+        prompt_cache_ttl: Lifetime of a prompt cache opened in each worker (no cache if omitted);
+            the parent's cached contents can't be shared, so every worker caches the instructions once
+    """
+    return WorkerPool(max_workers or os.cpu_count(), initializer=_init_crew_worker,
+                      initargs=(file_manager_settings, prompt_cache_ttl), finalizer=_close_crew_worker)
+
+
+async def process_video(crew: Crew | None, video_input: dict, sink: JsonlResultSink, output_dir: Path,
+                        timeout: float | None = None, executor: Executor | None = None,
+                        workers: WorkerPool | None = None) -> dict:
+    """
+    Run the individual crew on one video and persist its result immediately.
+
+    Args:
+        crew: Individual crew to run (not shared with other concurrent videos)
+        video_input: Inputs for the crew, as built by process_videos
+        sink: Result sink the record is appended to
+        output_dir: Directory for the per-video summary file
+        timeout: Seconds the crew may run before the video is given up (optional)
+        executor: Thread pool the crew runs in (the default thread pool if omitted).
+            The timeout starts once a thread picks the crew up.
+        workers: With crew=None, run run_individual_crew in this worker pool instead.
+            The timeout starts once a worker picks the video up.
+
+    Returns:
+        The result record written to the sink
+    """
+    video_hash = video_input.get('video_hash') or await asyncio.to_thread(hash_file, video_input['video_path'])
+
+    started = time.monotonic()
+    started_at = time.time()
+    try:
+        # The crew runs in a worker thread. On timeout the video is given up and recorded
+        # straight away; the thread itself can't be interrupted and winds down in the background.
+        if crew is None:
+            result = await workers.run(run_individual_crew, video_input, timeout)
+            summary = result['summary']
+        else:
+            result = await run_started(executor, lambda: crew.kickoff(inputs=video_input), timeout)
+            summary = crew_summary(result)
+        status, error = 'success', None
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout:.0f}s" if timeout is not None else "Timed out"
+        summary = f"Error processing {video_input['video_filename']}: {error}"
+        status = 'timeout'
+    except Exception as e:
+        error = str(e)
+        summary = f"Error processing {video_input['video_filename']}: {error}"
+        status = 'error'
+
+    record = {
+        'video_hash': video_hash,
+        'video_filename': video_input['video_filename'],
+        'video_path': video_input['video_path'],
+        'status': status,
+        'error': error,
+        'summary': summary,
+        # Timings of earlier runs are used to estimate how long each video takes
+        'elapsed': round(time.monotonic() - started, 1),
+        'size_bytes': video_input.get('size_bytes'),
+        'duration': video_input.get('duration'),
+        # Names from this run's compact analysis, for the project history
+        'team': load_team_members(video_input['video_path'], since=started_at) if status == 'success' else []
+    }
+    sink.write(record)
+
+    # Save individual summary, named by video rather than by position in the batch
+    summary_name = f"video_summary_{Path(video_input['video_filename']).stem}_{video_hash[:8]}.txt"
+    with open(output_dir / summary_name, 'w') as f:
+        f.write(summary)
+
+    return record
+
+
+def write_run_report(output_dir: Path, video_paths: List[str], statuses: dict, interrupted: bool,
+                     rejected: List[dict] | None = None) -> List[dict]:
+    """
+    Write output/run_report.json, listing every video without a successful result and why.
+
+    Args:
+        output_dir: Directory to write the report to
+        video_paths: Every video the run was expected to process
+        statuses: Final status of each video by path (missing ones count as interrupted)
+        interrupted: Whether the run was interrupted
+        rejected: Videos rejected by preflight (optional)
+
+    Returns:
+        The missing videos, each with its path and reason
+    """
+    missing = [{
+        'video': video_path,
+        'reason': statuses.get(video_path, 'interrupted')
+    } for video_path in video_paths if statuses.get(video_path) != 'success']
+    with open(output_dir / 'run_report.json', 'w') as f:
+        json.dump({
+            'expected_videos': len(video_paths),
+            'successful_videos': len(video_paths) - len(missing),
+            'interrupted': interrupted,
+            'missing': missing,
+            'rejected': rejected or []
+        }, f, indent=2)
+    if missing:
+        logger.warning(f"⚠️  {len(missing)} video(s) missing from the results (see {output_dir / 'run_report.json'}):")
+        for entry in missing:
+            logger.warning(f"   - {Path(entry['video']).name}: {entry['reason']}",
+                           extra={'video': entry['video'], 'status': entry['reason']})
+    return missing
+
+
+async def preflight_inputs(video_files: List[Path], sizes: dict, output_dir: Path,
+                           repair_dir: Path | None = None) -> tuple[List[Path], dict, List[dict]]:
+    """
+    Run the preflight check and keep the videos that can be analyzed.
+
+    Repaired videos replace their originals, and their sizes are added to sizes.
+    Every entry is written to output_dir/preflight.json.
+
+    Returns:
+        (usable video paths, probed duration per path, rejected videos with their reason)
+    """
+    checked = await preflight_videos(video_files, repair_dir=repair_dir or output_dir / 'preflight')
+    logger.info(f"🩺 Preflight: {preflight_summary(checked)}")
+    usable, durations, rejected = [], {}, []
+    for entry in checked:
+        if entry['status'] == 'rejected':
+            rejected.append({'video': str(entry['path']), 'reason': entry['reason']})
+            logger.warning(f"🚫 Rejected {entry['path'].name}: {entry['reason']}",
+                           extra={'video': str(entry['path']), 'status': 'rejected'})
+            continue
+        if entry['status'] == 'repaired':
+            logger.info(f"🔧 Repaired {entry['path'].name} ({entry['reason']}) as {entry['video_path']}",
+                        extra={'video': str(entry['path'])})
+            sizes[str(entry['video_path'])] = entry['size']
+        usable.append(entry['video_path'])
+        durations[str(entry['video_path'])] = (entry['metadata'] or {}).get('duration')
+    with open(output_dir / 'preflight.json', 'w') as f:
+        json.dump([{**entry, 'path': str(entry['path']), 'video_path': str(entry['video_path'])}
+                   for entry in checked], f, indent=2)
+    return usable, durations, rejected
+
+
+async def process_videos(directory: str, attendee_list: str | None = None, project_gallery_url: str | None = None,
+                         video_files: List[Path] | None = None, aggregate: bool = True,
+                         incremental: bool = False, dedup: bool = True, fingerprint: bool = False,
+                         recursive: bool = False, include: List[str] | None = None,
+                         exclude: List[str] | None = None, sniff: bool = False,
+                         max_concurrency: int | None = None, video_timeout: float | None = None,
+                         deadline: Deadline | None = None, aggregation_reserve: float = 300.0,
+                         aggregate_partial: bool = True, tiered: bool = False, deep_top_k: int = 10,
+                         min_confidence: float = 0.6, context_cache: bool = False,
+                         batch: bool = False, processes: bool = False, event: str | None = None,
+                         reuse_history: bool = False, polish: bool = False, preflight: bool = True,
+                         longest_first: bool = True, share: bool = False, project_drafts: bool = False) -> dict:
     """
     Process all videos in a directory and generate social media content.
 
@@ -142,26 +491,96 @@ async def process_videos(directory: str, attendee_list: str | None = None, proje
         directory: Path to directory containing video files
         attendee_list: Path to attendee list file (optional)
         project_gallery_url: URL of hackathon project gallery to scrape (optional)
+        video_files: Process exactly these files instead of scanning the directory (optional)
+        aggregate: Whether to run the aggregator crew once all videos are processed
+        incremental: Score only projects missing from output/ranking.json and insert them
+            into the existing ranking and Typefully draft instead of re-aggregating everything
+        dedup: Process each unique video once; duplicates are reported in output/duplicates.json
+        fingerprint: Also treat re-encoded copies as duplicates (perceptual fingerprint, needs ffmpeg)
+        recursive: Also search subdirectories of the directory
+        include: Glob patterns video files must match (optional)
+        exclude: Glob patterns of files and directories to skip (hidden files by default)
+        sniff: Detect videos by container bytes as well as by extension
+        max_concurrency: Maximum number of videos processed at once (DEFAULT_CONCURRENCY, or
+            one per CPU with processes, if omitted)
+        video_timeout: Seconds each video's crew may run before it is given up (optional)
+        deadline: Global deadline for the whole run. New videos stop being started once
+            there isn't enough time left to finish one, and in-flight videos are cut off
+            at the deadline (optional)
+        aggregation_reserve: Seconds before the deadline kept free for aggregation
+        aggregate_partial: When interrupted, still aggregate the videos completed so far.
+            Videos without a successful result are always listed in output/run_report.json.
+        tiered: Give every video a cheap triage pass first (smaller model, lower FPS, no
+            transcription) and run the full crew only on the most promising videos
+        deep_top_k: In tiered mode, number of top videos by preliminary engagement score
+            that get the full analysis
+        min_confidence: In tiered mode, videos triaged with lower confidence also get the
+            full analysis
+        context_cache: Store the analysis instructions shared by every video in a Gemini
+            context cache for the duration of the run instead of resending them per video
+        batch: Analyze all videos in one Gemini batch job instead of running the individual
+            crew per video. Much cheaper, but results may take hours, and the team research
+            task is not run.
+        processes: Run each video's crew in a worker process from a bounded pool
+            (max_concurrency processes, or one per CPU) instead of in a thread
+        event: Event name under which results are added to the project history
+            (the directory name if omitted)
+        reuse_history: Reuse the analysis of any video already in the project history
+            (e.g. the same demo shown at an earlier event) instead of processing it again
+        polish: Let an LLM polish the project descriptions before the thread is rendered
+        preflight: Probe every video with ffprobe first, rejecting empty, corrupt and
+            audio-only files and remuxing repairable ones before any upload
+        longest_first: Start the videos expected to take longest first (estimated from size,
+            probed duration and earlier runs' timings) instead of in discovery order
+        share: Ask Typefully for a shareable link to the thread's draft
+        project_drafts: Also create a Typefully draft for every project (not with incremental)
 
     Returns:
         Dictionary with processing results
     """
     # Check for sequential processing mode (useful when hitting API quotas)
     SEQUENTIAL_MODE = os.getenv("SEQUENTIAL_VIDEO_PROCESSING", "false").lower() == "true"
+    if max_concurrency is None and os.getenv("MAX_CONCURRENT_VIDEOS"):
+        max_concurrency = int(os.getenv("MAX_CONCURRENT_VIDEOS"))
 
     # Find all video files in directory
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
-    video_dir = Path(directory)
-    video_files = []
-
-    for ext in video_extensions:
-        video_files.extend(video_dir.glob(f'*{ext}'))
-        video_files.extend(video_dir.glob(f'*{ext.upper()}'))
+    if video_files is None:
+        videos = discover_videos(directory, recursive=recursive, include=include, exclude=exclude, sniff=sniff)
+        video_files = [video['path'] for video in videos]
+    else:
+        videos = [describe_video(Path(path)) for path in video_files]
+        video_files = [video['path'] for video in videos]
+    sizes = {str(video['path']): video['size'] for video in videos}
 
     if not video_files:
         return {"error": f"No video files found in {directory}"}
 
-    print(f"Found {len(video_files)} video files to process")
+    logger.info(f"Found {len(video_files)} video files to process")
+
+    # Results are streamed to an append-only JSONL file as each video completes
+    output_dir = Path('output')
+    output_dir.mkdir(exist_ok=True)
+
+    rejected = []
+    durations = {}
+    if preflight:
+        video_files, durations, rejected = await preflight_inputs(video_files, sizes, output_dir)
+        if not video_files:
+            return {"error": f"No usable video files in {directory} (see {output_dir / 'preflight.json'})"}
+
+    duplicates = []
+    known_hashes = {}
+    if dedup:
+        dedup_result = await asyncio.to_thread(find_duplicates, video_files, fingerprint)
+        video_files = dedup_result['unique']
+        duplicates = dedup_result['duplicates']
+        known_hashes = dedup_result['hashes']
+        for duplicate in duplicates:
+            logger.info(f"♻️  Skipping duplicate {duplicate['path'].name} "
+                        f"({duplicate['match']} match of {duplicate['canonical'].name})",
+                        extra={'video': str(duplicate['path']), 'duplicate_of': str(duplicate['canonical'])})
+        if duplicates:
+            logger.info(f"{len(video_files)} unique videos after removing {len(duplicates)} duplicate(s)")
 
     # Create the crew instance
     crew_instance = HackReporterCrew()
@@ -171,134 +590,447 @@ async def process_videos(directory: str, attendee_list: str | None = None, proje
     for video_file in video_files:
         # Use absolute path to ensure agent can find the file
         absolute_path = video_file.resolve()
-        print(f"\nDEBUG - Processing video: {video_file.name}")
-        print(f"  Absolute path: {absolute_path}")
-        print(f"  File exists: {absolute_path.exists()}")
-        print(f"  File size: {absolute_path.stat().st_size / (1024*1024):.1f}MB")
+        logger.debug(f"Queued {video_file.name} ({sizes[str(video_file)] / (1024*1024):.1f}MB): {absolute_path}",
+                     extra={'video': str(absolute_path), 'size_bytes': sizes[str(video_file)]})
 
         video_inputs.append({
             'video_path': str(absolute_path),
             'video_filename': video_file.name,
-            'attendee_list': attendee_list or 'Not provided',
-            'project_gallery_url': project_gallery_url or 'Not provided'
+            'video_hash': known_hashes.get(str(video_file)),
+            'attendee_list': attendee_list or NOT_PROVIDED,
+            'project_gallery_url': project_gallery_url or NOT_PROVIDED,
+            'size_bytes': sizes[str(video_file)],
+            'duration': durations.get(str(video_file))
         })
 
-    # Process videos using CrewAI's built-in parallel processing
-    print(f"\nProcessing {len(video_files)} videos in parallel using CrewAI's kickoff_for_each_async...")
+    sink = JsonlResultSink(output_dir / 'results.jsonl')
+
+    cost = None
+    if longest_first:
+        cost_model = await asyncio.to_thread(CostModel.from_history, sink.records())
+
+        def estimate_cost(video_input: dict) -> float:
+            return cost_model.estimate(video_input['size_bytes'], video_input['duration'])
+        cost = estimate_cost
+        # Triage follows the same order; the scheduler keeps it for the full analysis
+        video_inputs.sort(key=cost, reverse=True)
+        logger.debug(f"Longest first, at {cost_model.seconds_per_video_second:.2f}s per second of video: "
+                     + ", ".join(f"{v['video_filename']} (~{cost(v):.0f}s)" for v in video_inputs))
+    video_hashes = []
+    successful_count = 0
+
+    deadline = deadline or Deadline()
+    skipped = []
+
+    # Every fully analyzed project is kept in the cross-event history
+    history = ProjectHistory()
+    event = event or Path(directory).resolve().name
+
+    # Every input shares the same attendee list and gallery URL, so the first one decides
+    # which tasks run. Like CrewAI's kickoff_for_each_async, each video gets its own crew copy.
+    # With the process backend, each worker process builds its own crews instead.
+    if max_concurrency is None:
+        max_concurrency = os.cpu_count() if processes else DEFAULT_CONCURRENCY
+    use_processes = processes and not batch
+    pool = None
+    base_crew = None if use_processes else crew_instance.individual_crew(video_inputs[0])
+    # Crews get their own threads, so hashing, uploads and triage on the default pool don't delay them
+    crew_threads = None if use_processes or batch else ThreadPoolExecutor(max_workers=max_concurrency,
+                                                                          thread_name_prefix='crew')
+
+    async def run_video(video_input: dict, budget: float | None) -> dict:
+        timeout = min_timeout(video_timeout, budget)
+        if pool:
+            return await process_video(None, video_input, sink, output_dir, timeout=timeout, workers=pool)
+        return await process_video(base_crew.copy(), video_input, sink, output_dir, timeout=timeout,
+                                   executor=crew_threads)
 
     # Check if we should process sequentially to avoid quota issues
     if SEQUENTIAL_MODE:
-        print("🔄 Running in SEQUENTIAL mode to avoid API quota issues")
-        individual_results = []
-        for i, video_input in enumerate(video_inputs):
-            print(f"\n📹 Processing video {i+1}/{len(video_inputs)}: {video_input['video_filename']}")
-            try:
-                result = await crew_instance.individual_crew().kickoff_async(inputs=video_input)
-                individual_results.append(result)
-                print(f"✅ Completed video {i+1}")
-
-                # Add a delay between videos to respect API rate limits
-                if i < len(video_inputs) - 1:  # Don't delay after the last video
-                    delay = 3  # seconds
-                    print(f"⏳ Waiting {delay}s before next video...")
-                    await asyncio.sleep(delay)
-            except Exception as e:
-                print(f"❌ ERROR processing video {i+1}: {str(e)}")
-                individual_results.append(f"Error processing {video_input['video_filename']}: {str(e)}")
+        logger.info("🔄 Running in SEQUENTIAL mode to avoid API quota issues")
+        max_concurrency, cooldown = 1, 3  # Delay between videos to respect API rate limits
     else:
-        # Use CrewAI's built-in parallel processing for multiple inputs
-        print(f"⚡ Running in PARALLEL mode using CrewAI's kickoff_for_each_async")
-        try:
-            # kickoff_for_each_async processes all inputs concurrently
-            individual_results = await crew_instance.individual_crew().kickoff_for_each_async(inputs=video_inputs)
-            print(f"✅ Completed processing all {len(video_files)} videos in parallel")
-        except Exception as e:
-            print(f"❌ ERROR in parallel processing: {str(e)}")
-            # Fallback to sequential processing if parallel fails
-            print("Falling back to sequential processing...")
-            individual_results = []
-            for i, video_input in enumerate(video_inputs):
-                try:
-                    result = await crew_instance.individual_crew().kickoff_async(inputs=video_input)
-                    individual_results.append(result)
-                except Exception as e:
-                    individual_results.append(f"Error processing {video_input['video_filename']}: {str(e)}")
-
-    # Count successful results
-    successful_count = sum(1 for r in individual_results if not isinstance(
-        r, Exception) and not str(r).startswith("Error"))
-    print(f"\nProcessed {successful_count}/{len(individual_results)} videos successfully!")
-
-    # Save individual results for aggregation
-    output_dir = Path('output')
-    output_dir.mkdir(exist_ok=True)
+        logger.info(f"⚡ Running in PARALLEL mode, processing up to {max_concurrency} videos at a time"
+                    + (" in worker processes" if use_processes else ""))
+        cooldown = 0
+    if deadline.remaining() is not None:
+        logger.info(f"⏱️  Deadline in {deadline.remaining():.0f}s ({aggregation_reserve:.0f}s reserved for aggregation)")
 
-    summaries = []
-    for i, result in enumerate(individual_results):
-        print(f"\nDEBUG - Processing result {i+1}:")
-        print(f"  Result type: {type(result)}")
+    if context_cache:
+        # The cache lives as long as the run may; it's deleted explicitly once the videos are done
+        open_prompt_cache(deadline.remaining() or 3600)
 
-        summary = ""  # Initialize summary
+    # Uploads are shared between the triage and deep passes, kept within the storage
+    # quota and deleted when the videos are done
+    file_manager = open_file_manager()
+    if use_processes:
+        # Worker processes can't share the parent's manager, so each opens one with its settings
+        pool = create_crew_workers(max_concurrency, file_manager.settings,
+                                   prompt_cache_ttl=(deadline.remaining() or 3600) if context_cache else None)
 
-        # Check if this is an error or exception
-        if isinstance(result, Exception):
-            print(f"  ERROR: Exception occurred - {str(result)}")
-            summary = f"Error processing video: {str(result)}"
-        elif isinstance(result, str) and result.startswith("Error"):
-            print(f"  ERROR: {result}")
-            summary = result
+    statuses = {}
+    interrupted = False
+    try:
+        deep_inputs = video_inputs
+        if reuse_history:
+            deep_inputs = []
+            for video_input in video_inputs:
+                if not video_input['video_hash']:
+                    video_input['video_hash'] = await asyncio.to_thread(hash_file, video_input['video_path'])
+                # Triage-only analyses are only good enough for a tiered run
+                known = history.lookup(video_input['video_hash'], full_only=not tiered)
+                if known is None:
+                    deep_inputs.append(video_input)
+                    continue
+                record = {
+                    'video_hash': video_input['video_hash'],
+                    'video_filename': video_input['video_filename'],
+                    'video_path': video_input['video_path'],
+                    'status': 'success',
+                    'error': None,
+                    'summary': known['summary'],
+                    'fidelity': known['fidelity'],
+                    'reused_from': known['event']
+                }
+                sink.write(record)
+                # Listed under this event too, so searching it finds every project shown
+                history.add(record, event, team=known['team'])
+                video_hashes.append(record['video_hash'])
+                statuses[record['video_path']] = 'success'
+                successful_count += 1
+                logger.info(f"📚 Reusing analysis of {known['name']} from {known['event']}: {video_input['video_filename']}",
+                            extra={'video': video_input['video_path'], 'status': 'success', 'reused_from': known['event']})
+
+        if tiered:
+            logger.info(f"🔎 Triage pass on {len(deep_inputs)} videos with {TRIAGE_MODEL}")
+            triaged = await triage_videos(deep_inputs, max_concurrency=max_concurrency)
+            selected = select_deep_pass(triaged, deep_top_k, min_confidence)
+            selected_paths = {entry['video_input']['video_path'] for entry in selected}
+            for entry in triaged:
+                if entry['video_input']['video_path'] in selected_paths:
+                    continue
+                # Good enough from triage alone: its summary is the final result for this video
+                record = record_triage(sink, entry)
+                history.add(record, event)
+                video_hashes.append(record['video_hash'])
+                statuses[record['video_path']] = 'success'
+                successful_count += 1
+            deep_inputs = [entry['video_input'] for entry in selected]
+            logger.info(f"🔬 Full analysis for {len(deep_inputs)}/{len(triaged)} videos "
+                        f"(top {deep_top_k} by preliminary score plus low-confidence triage)")
+
+        reserve = aggregation_reserve if aggregate else 0.0
+        if batch:
+            logger.info(f"📦 BATCH mode: {len(deep_inputs)} videos are analyzed in one Gemini batch job")
+            completed = process_batch(deep_inputs, sink, output_dir, deadline=deadline, reserve=reserve)
         else:
-            # At this point, result is a valid crew output object
-            print(f"  Has 'raw' attribute: {hasattr(result, 'raw')}")
-            # Extract the summary from the result
-            try:
-                if hasattr(result, 'raw'):
-                    summary = getattr(result, 'raw', str(result))
-                else:
-                    summary = str(result)
-                print(f"  Summary length: {len(summary)} chars")
-                print(f"  First 100 chars: {summary[:100]}...")
-            except Exception as e:
-                print(f"  ERROR extracting summary: {str(e)}")
-                summary = f"Error extracting summary: {str(e)}"
-
-        summaries.append(summary)
-
-        # Save individual summary
-        with open(output_dir / f'video_summary_{i+1}.txt', 'w') as f:
-            f.write(summary)
+            completed = schedule(deep_inputs, run_video, max_concurrency=max_concurrency,
+                                 deadline=deadline, reserve=reserve, cooldown=cooldown, cost=cost)
 
-    # Save all summaries for aggregation
-    with open(output_dir / 'all_summaries.json', 'w') as f:
-        json.dump(summaries, f, indent=2)
+        async for video_input, record in completed:
+            if record is None:
+                skipped.append(video_input['video_path'])
+                statuses[video_input['video_path']] = 'not_started'
+                logger.warning(f"⏭️  Not started (deadline too close): {video_input['video_filename']}",
+                               extra={'video': video_input['video_path'], 'status': 'not_started'})
+                continue
 
-    # Now run the aggregator crew configuration
-    print(f"\nAggregating results and creating final tweet thread...")
-
-    # Debug: Show what summaries we're passing
-    print(f"\nDEBUG - Summaries being passed to aggregator:")
-    print(f"Number of summaries: {len(summaries)}")
-    for i, summary in enumerate(summaries):
-        print(f"\nSummary {i+1}:")
-        print(summary)
-        print("-" * 50)
-
-    aggregation_inputs = {
-        'all_summaries': '\n\n'.join(summaries),
-        'video_count': len(video_files),
-        'summaries_file': str(output_dir / 'all_summaries.json')
-    }
+            video_hashes.append(record['video_hash'])
+            statuses[video_input['video_path']] = record['status']
+            if record['status'] == 'success':
+                successful_count += 1
+                history.add(record, event)
+                logger.info(f"✅ Completed {record['video_filename']} ({len(video_hashes)}/{len(video_inputs)})",
+                            extra={'video': record['video_path'], 'status': 'success'})
+            else:
+                logger.error(f"❌ ERROR processing {record['video_filename']}: {record['error']}",
+                             extra={'video': record['video_path'], 'status': record['status']})
+    except asyncio.CancelledError:
+        # Ctrl+C: in-flight videos are cancelled, but everything completed so far is
+        # already in the sink, so carry on and report (and optionally aggregate) it
+        interrupted = True
+        logger.warning("⚠️  Processing interrupted, continuing with the videos completed so far")
+    finally:
+        if pool:
+            # Workers delete their own uploads first
+            pool.shutdown()
+        close_file_manager()
+        if context_cache:
+            close_prompt_cache()
+        if crew_threads:
+            # Timed-out crews can't be stopped; don't wait for them
+            crew_threads.shutdown(wait=False, cancel_futures=True)
 
-    print(f"\nDEBUG - Aggregation inputs:")
-    print(f"- all_summaries length: {len(aggregation_inputs['all_summaries'])} chars")
-    print(f"- video_count: {aggregation_inputs['video_count']}")
-    print(f"- summaries_file: {aggregation_inputs['summaries_file']}")
+    logger.info(f"Processed {successful_count}/{len(video_inputs)} videos successfully!",
+                extra={'successful_videos': successful_count, 'expected_videos': len(video_inputs)})
+    logger.info(f"Per-video results: {sink.path}")
 
-    final_result = await crew_instance.aggregator_crew().kickoff_async(inputs=aggregation_inputs)
+    missing = write_run_report(output_dir, [video_input['video_path'] for video_input in video_inputs],
+                               statuses, interrupted, rejected)
 
-    return {
+    if duplicates:
+        # Link each duplicate to the result record of the video that was processed instead
+        hash_by_path = {record['video_path']: video_hash for video_hash, record in sink.latest(video_hashes).items()}
+        duplicate_report = [{
+            'path': str(d['path']),
+            'canonical': str(d['canonical']),
+            'canonical_hash': hash_by_path.get(str(Path(d['canonical']).resolve())),
+            'match': d['match']
+        } for d in duplicates]
+        with open(output_dir / 'duplicates.json', 'w') as f:
+            json.dump(duplicate_report, f, indent=2)
+        logger.info(f"Duplicate report: {output_dir / 'duplicates.json'}")
+
+    results = {
         'processed_videos': len(video_files),
         'video_files': [str(vf) for vf in video_files],
-        'individual_results': individual_results,
-        'final_result': final_result
+        'video_hashes': video_hashes,
+        'successful_videos': successful_count,
+        'duplicates': [str(d['path']) for d in duplicates],
+        'skipped_videos': skipped,
+        'missing_videos': missing,
+        'rejected_videos': rejected,
+        'interrupted': interrupted,
+        'results_file': str(sink.path)
+    }
+
+    if interrupted and not aggregate_partial:
+        aggregate = False
+    elif successful_count == 0:
+        logger.warning("No successful videos to aggregate")
+        aggregate = False
+
+    # Aggregation covers the successful videos only and gets whatever time is left before the deadline
+    if aggregate and incremental:
+        results['final_result'] = await asyncio.wait_for(
+            aggregate_incremental(sink.latest(video_hashes), output_dir, crew_instance, share=share),
+            deadline.remaining()
+        )
+    elif aggregate:
+        results['final_result'] = await asyncio.wait_for(
+            aggregate_summaries(sink.latest(video_hashes), output_dir, crew_instance, polish=polish, share=share,
+                                project_drafts=project_drafts),
+            deadline.remaining()
+        )
+
+    return results
+
+
+async def score_projects(projects: List[dict], references: List[dict],
+                         crew_instance: HackReporterCrew | None = None) -> None:
+    """
+    Score projects for engagement with project_scoring_task, setting each project's score.
+
+    Args:
+        projects: Projects to score (parsed summaries)
+        references: Already-ranked projects with scores, for calibration (may be empty)
+        crew_instance: Crew to score with (created if omitted)
+    """
+    scoring_inputs = {
+        'reference_projects': '\n'.join(
+            f"- {p['name']} (score {p['score']:.0f}): {p['description']}" for p in references
+        ) or 'None yet - this is the first batch of projects.',
+        'new_projects': '\n'.join(
+            f"[{i}] {p['name']}: {p['description']} {p['tagline']}" for i, p in enumerate(projects)
+        )
     }
+
+    crew_instance = crew_instance or HackReporterCrew()
+    scoring_result = await crew_instance.scoring_crew().kickoff_async(inputs=scoring_inputs)
+
+    scores = {}
+    if scoring_result.pydantic is not None:
+        scores = {s.index: s.score for s in scoring_result.pydantic.scores}
+    for i, project in enumerate(projects):
+        # Unscored projects go to the end rather than being dropped
+        project['score'] = scores.get(i, 0.0)
+
+
+async def polish_projects(projects: List[dict], crew_instance: HackReporterCrew | None = None) -> List[dict]:
+    """
+    Let the LLM rewrite project descriptions, keeping only rewrites that fit their tweet.
+
+    Names, taglines and handles are never changed, and the thread is still laid
+    out by thread_renderer.
+
+    Returns:
+        The projects with polished descriptions where the rewrite was usable
+    """
+    limits = [
+        TWEET_MAX_LENGTH - weighted_length(render_project_tweet(i, {**p, 'description': ''})) - 1
+        for i, p in enumerate(projects, 1)
+    ]
+    polish_inputs = {
+        'projects': '\n'.join(
+            f"[{i}] {p['name']}: {p['description']} (max {limit} characters)"
+            for i, (p, limit) in enumerate(zip(projects, limits))
+        )
+    }
+
+    crew_instance = crew_instance or HackReporterCrew()
+    result = await crew_instance.polish_crew().kickoff_async(inputs=polish_inputs)
+    if result.pydantic is None:
+        return projects
+
+    polished = {d.index: d.description.strip() for d in result.pydantic.descriptions}
+    return [
+        {**p, 'description': polished[i]}
+        if polished.get(i) and weighted_length(polished[i]) <= limits[i] else p
+        for i, p in enumerate(projects)
+    ]
+
+
+def publish_thread(projects: List[dict], output_dir: Path, draft_id: str | None = None, share: bool = False) -> dict:
+    """
+    Render the thread, save it to tweet_thread.md and create its Typefully draft.
+
+    Args:
+        projects: Projects in ranked order
+        output_dir: Directory for tweet_thread.md
+        draft_id: Existing Typefully draft the new one replaces (Typefully's API can't
+            edit drafts, so a new draft is always created)
+        share: Ask Typefully for a shareable link to the draft
+
+    Returns:
+        The Typefully result, plus the thread content
+    """
+    thread = render_thread(projects)
+    problems = validate_thread(thread)
+    if problems:
+        # The renderer trims and splits tweets, so this only happens with unusual input
+        logger.warning(f"⚠️  {len(problems)} tweet(s) over {TWEET_MAX_LENGTH} characters: "
+                       f"{', '.join(str(p['index']) for p in problems)}")
+
+    with open(output_dir / 'tweet_thread.md', 'w') as f:
+        f.write(thread)
+
+    typefully = TypefullyTool()
+    if draft_id:
+        draft = typefully.replace_draft(draft_id, content=thread, share=share)
+    else:
+        draft = typefully._run(content=thread, share=share)
+    return {**draft, 'thread': thread}
+
+
+async def publish_project_drafts(projects: List[dict], output_dir: Path, share: bool = False) -> List[dict]:
+    """
+    Create one Typefully draft per project, e.g. to quote-tweet the thread project by project.
+
+    The drafts are created concurrently and listed in output_dir/project_drafts.json.
+
+    Returns:
+        The draft manifest, one entry per project keyed by project name
+    """
+    drafts = [{'key': project['name'], 'content': render_project_draft(project), 'share': share}
+              for project in projects]
+    return await TypefullyBatchPublisher().publish(drafts, manifest_file=str(output_dir / 'project_drafts.json'))
+
+
+async def aggregate_summaries(records: dict, output_dir: Path = Path('output'),
+                              crew_instance: HackReporterCrew | None = None, polish: bool = False,
+                              share: bool = False, project_drafts: bool = False) -> dict:
+    """
+    Rank the successfully processed videos and publish the tweet thread.
+
+    The summaries are parsed and laid out in Python; an LLM only scores the
+    projects for the ranking and, optionally, polishes the description copy.
+    The ranking and the draft are saved to output/ranking.json, so a later
+    --incremental run only scores projects added after this one.
+
+    Args:
+        records: Result records keyed by video hash, as returned by JsonlResultSink.latest
+        output_dir: Directory for all_summaries.json, ranking.json and tweet_thread.md
+        crew_instance: Crew to score and polish with (created if omitted)
+        polish: Let the LLM rewrite project descriptions before rendering
+        share: Ask Typefully for a shareable link to the draft
+        project_drafts: Also create a separate Typefully draft for every project
+
+    Returns:
+        Dictionary with the ranked projects, the thread and the Typefully draft(s)
+    """
+    crew_instance = crew_instance or HackReporterCrew()
+
+    # Ordered by filename rather than completion order
+    successful = sorted(((video_hash, record) for video_hash, record in records.items()
+                         if record.get('status') == 'success'), key=lambda item: item[1]['video_filename'])
+    summaries = [record['summary'] for _, record in successful]
+
+    # Save all summaries for aggregation
+    with open(output_dir / 'all_summaries.json', 'w') as f:
+        json.dump(summaries, f, indent=2)
+
+    logger.info("Aggregating results and creating final tweet thread...")
+
+    projects = [{**parse_summary(record['summary']), 'video_hash': video_hash} for video_hash, record in successful]
+    logger.debug(f"Projects being ranked: {len(projects)}")
+    for i, project in enumerate(projects, 1):
+        logger.debug(f"  {i}. {project['name']}: {project['description']}")
+
+    await score_projects(projects, [], crew_instance)
+    ranked = insert_ranked([], projects)
+    if polish:
+        ranked = await polish_projects(ranked, crew_instance)
+
+    # Typefully's HTTP calls block, so they run off the event loop
+    draft = await asyncio.to_thread(publish_thread, ranked, output_dir, share=share)
+    if draft.get('success'):
+        logger.info(f"Typefully draft: {draft.get('share_url') or draft.get('draft_id')}")
+    else:
+        logger.error(f"❌ Typefully draft failed: {draft.get('error')}")
+
+    ranking_file = output_dir / 'ranking.json'
+    save_ranking(ranking_file, published_state(ranked, draft))
+    logger.info(f"Ranking of {len(ranked)} project(s) saved to {ranking_file}")
+
+    results = {'projects': ranked, 'thread': draft['thread'], 'draft': draft}
+    if project_drafts:
+        results['project_drafts'] = await publish_project_drafts(ranked, output_dir, share=share)
+    return results
+
+
+async def aggregate_incremental(records: dict, output_dir: Path = Path('output'),
+                                crew_instance: HackReporterCrew | None = None, share: bool = False) -> dict:
+    """
+    Add newly processed projects to the existing ranking and thread.
+
+    Only projects missing from output/ranking.json are scored (against a fixed-size
+    sample of already-ranked projects for calibration), so the cost scales with the
+    number of new projects. The thread is re-rendered from the ranking and published
+    as a new Typefully draft replacing the previous one (Typefully's API can't edit
+    drafts).
+
+    Args:
+        records: Result records keyed by video hash, as returned by JsonlResultSink.latest
+        output_dir: Directory holding ranking.json and tweet_thread.md
+        crew_instance: Crew to score with (created if omitted)
+        share: Ask Typefully for a shareable link to the draft
+
+    Returns:
+        The updated ranking state
+    """
+    ranking_file = output_dir / 'ranking.json'
+    state = load_ranking(ranking_file)
+    known = {project['video_hash'] for project in state['projects']}
+
+    new_projects = []
+    for video_hash, record in sorted(records.items(), key=lambda item: item[1]['video_filename']):
+        if video_hash in known or record.get('status') != 'success':
+            continue
+        new_projects.append({**parse_summary(record['summary']), 'video_hash': video_hash})
+
+    if not new_projects:
+        logger.info("No new projects to add to the ranking")
+        return state
+
+    logger.info(f"Scoring {len(new_projects)} new project(s) against {len(state['projects'])} ranked project(s)...")
+
+    await score_projects(new_projects, reference_projects(state['projects']), crew_instance)
+    state['projects'] = insert_ranked(state['projects'], new_projects)
+
+    draft = await asyncio.to_thread(publish_thread, state['projects'], output_dir, state.get('draft_id'), share=share)
+    state = published_state(state['projects'], draft, state)
+
+    save_ranking(ranking_file, state)
+    logger.info(f"Ranking updated: {len(state['projects'])} project(s), saved to {ranking_file}")
+
+    return state
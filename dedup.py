@@ -0,0 +1,160 @@
+"""
+Duplicate video detection before upload.
+
+Videos are grouped in three passes, from cheapest to most expensive:
+1. Same file reached twice (e.g. `*.mp4` and `*.MP4` globs on a case-insensitive mount)
+2. Identical content: files of equal size are compared by SHA-256
+3. Optional perceptual fingerprint for re-encoded copies of the same demo
+
+Only the canonical file of each group is processed; the rest are reported and
+linked to the canonical video's hash, which is its key in the result sink.
+"""
+import os
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from optimize_videos import get_video_info
+from result_sink import hash_file
+
+# Frames sampled per video for the perceptual fingerprint
+FINGERPRINT_SAMPLES = 8
+
+
+def video_fingerprint(video_path: Path, samples: int = FINGERPRINT_SAMPLES) -> Optional[Dict]:
+    """
+    Compute a perceptual fingerprint (one 64-bit difference hash per sampled frame).
+
+    Frames are taken at the same relative positions in every video, so re-encoded
+    or rescaled copies of a video produce nearly identical hashes.
+
+    Args:
+        video_path: Path to the video file
+        samples: Number of frames to sample
+
+    Returns:
+        Dictionary with duration and frame hashes, or None if ffmpeg can't decode the video
+    """
+    _, duration = get_video_info(video_path)
+    if duration <= 0:
+        return None
+
+    frame_hashes = []
+    for i in range(samples):
+        timestamp = duration * (i + 0.5) / samples
+        cmd = [
+            'ffmpeg', '-v', 'error',
+            '-ss', f'{timestamp:.2f}', '-i', str(video_path),
+            '-frames:v', '1',
+            '-vf', 'scale=9:8,format=gray',  # 9x8 grayscale pixels -> 8x8 horizontal gradients
+            '-f', 'rawvideo', '-'
+        ]
+        try:
+            pixels = subprocess.run(cmd, capture_output=True, timeout=60).stdout
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if len(pixels) != 72:
+            return None
+
+        bits = 0
+        for row in range(8):
+            for col in range(8):
+                bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+        frame_hashes.append(bits)
+
+    return {'duration': duration, 'frames': frame_hashes}
+
+
+def fingerprint_distance(a: Dict, b: Dict) -> Optional[float]:
+    """
+    Average Hamming distance (0-64) between two fingerprints' frame hashes.
+
+    Returns None when the durations differ by more than 2%, i.e. the videos can't be copies.
+    """
+    if abs(a['duration'] - b['duration']) > 0.02 * max(a['duration'], b['duration']):
+        return None
+    distances = [bin(x ^ y).count('1') for x, y in zip(a['frames'], b['frames'])]
+    return sum(distances) / len(distances)
+
+
+def find_duplicates(video_files: List[Path], fingerprint: bool = False, max_distance: float = 6.0) -> Dict:
+    """
+    Group video files by content and keep one canonical file per group.
+
+    Args:
+        video_files: Candidate video files
+        fingerprint: Also detect re-encoded copies with a perceptual fingerprint (needs ffmpeg)
+        max_distance: Maximum average Hamming distance for two fingerprints to match
+
+    Returns:
+        Dictionary with:
+        - unique: canonical video files, in input order
+        - hashes: content hash per canonical file path (only for files that were hashed)
+        - duplicates: one entry per skipped file with path, canonical and match
+    """
+    # 1. The same file listed twice (identical device and inode)
+    by_inode = {}
+    duplicates = []
+    for path in video_files:
+        stat = os.stat(path)
+        key = (stat.st_dev, stat.st_ino)
+        if key in by_inode:
+            if str(by_inode[key]) == str(path):
+                # The exact same path listed twice, nothing to report
+                continue
+            duplicates.append({'path': path, 'canonical': by_inode[key], 'match': 'same_file'})
+        else:
+            by_inode[key] = path
+    candidates = list(by_inode.values())
+
+    # 2. Identical content. Only files sharing a size can be identical, so most files are never hashed.
+    by_size = defaultdict(list)
+    for path in candidates:
+        by_size[os.path.getsize(path)].append(path)
+
+    hashes = {}
+    skipped = set()
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+        by_hash = {}
+        for path in same_size:
+            content_hash = hash_file(str(path))
+            if content_hash in by_hash:
+                duplicates.append({'path': path, 'canonical': by_hash[content_hash], 'match': 'content'})
+                skipped.add(path)
+            else:
+                by_hash[content_hash] = path
+                hashes[str(path)] = content_hash
+    unique = [path for path in candidates if path not in skipped]
+
+    # 3. Re-encoded copies. The largest file of a group is kept as the best-quality source.
+    if fingerprint:
+        fingerprints = {path: video_fingerprint(path) for path in unique}
+        ordered = sorted(
+            (path for path in unique if fingerprints[path]),
+            key=lambda p: os.path.getsize(p),
+            reverse=True
+        )
+        canonical_files = []
+        for path in ordered:
+            for canonical in canonical_files:
+                distance = fingerprint_distance(fingerprints[path], fingerprints[canonical])
+                if distance is not None and distance <= max_distance:
+                    duplicates.append({'path': path, 'canonical': canonical, 'match': 'fingerprint'})
+                    skipped.add(path)
+                    break
+            else:
+                canonical_files.append(path)
+        unique = [path for path in unique if path not in skipped]
+
+    # Link every duplicate to the file that is actually processed
+    canonical_of = {d['path']: d['canonical'] for d in duplicates}
+    for duplicate in duplicates:
+        canonical = duplicate['canonical']
+        while canonical in canonical_of:
+            canonical = canonical_of[canonical]
+        duplicate['canonical'] = canonical
+
+    return {'unique': unique, 'hashes': hashes, 'duplicates': duplicates}
@@ -0,0 +1,153 @@
+"""
+Shared video discovery for the CLI, the crew and the video optimizer.
+
+A directory (optionally its whole tree) is walked once with os.scandir. Each
+file is stat'ed at most once, and filtered by extension, include/exclude glob
+patterns and, optionally, by sniffing its container type from the first bytes.
+"""
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# MIME types accepted by the Gemini File API, by file extension
+VIDEO_MIME_TYPES = {
+    '.mp4': 'video/mp4',
+    '.mpeg': 'video/mpeg',
+    '.mpg': 'video/mpg',
+    '.mov': 'video/mov',
+    '.avi': 'video/avi',
+    '.flv': 'video/x-flv',
+    '.webm': 'video/webm',
+    '.wmv': 'video/wmv',
+    '.3gpp': 'video/3gpp'
+}
+
+VIDEO_EXTENSIONS = sorted(set(VIDEO_MIME_TYPES) | {'.mkv', '.m4v', '.3gp'})
+
+# Skip hidden files by default, including the ._name AppleDouble files macOS leaves on NAS shares
+DEFAULT_EXCLUDE = ['.*']
+
+# Bytes read from the start of a file to sniff its container
+SNIFF_BYTES = 64
+
+
+def mime_type_for(video_path: str) -> str:
+    """Determine MIME type from file extension."""
+    return VIDEO_MIME_TYPES.get(Path(video_path).suffix.lower(), 'video/mp4')
+
+
+def sniff_mime_type(video_path: str) -> Optional[str]:
+    """
+    Identify a video container from its magic bytes.
+
+    Args:
+        video_path: Path to the file
+
+    Returns:
+        The MIME type of the container, or None if it isn't a recognized video container
+    """
+    try:
+        with open(video_path, 'rb') as f:
+            header = f.read(SNIFF_BYTES)
+    except OSError:
+        return None
+
+    if len(header) >= 12 and header[4:8] == b'ftyp':
+        brand = header[8:12]
+        if brand == b'qt  ':
+            return 'video/mov'
+        if brand.startswith(b'3g'):
+            return 'video/3gpp'
+        return 'video/mp4'
+    if header.startswith(b'\x1a\x45\xdf\xa3'):
+        # EBML: WebM is a Matroska profile with its own doctype
+        return 'video/webm' if b'webm' in header else 'video/x-matroska'
+    if header[:4] == b'RIFF' and header[8:12] == b'AVI ':
+        return 'video/avi'
+    if header.startswith(b'FLV'):
+        return 'video/x-flv'
+    if header.startswith(b'\x30\x26\xb2\x75\x8e\x66\xcf\x11'):
+        return 'video/wmv'
+    if header.startswith(b'\x00\x00\x01\xba') or header.startswith(b'\x00\x00\x01\xb3'):
+        return 'video/mpeg'
+    return None
+
+
+def _matches(relative_path: str, patterns: List[str]) -> bool:
+    name = relative_path.rsplit('/', 1)[-1]
+    return any(fnmatch(relative_path, p) or fnmatch(name, p) for p in patterns)
+
+
+def describe_video(path: Path, stat: Optional[os.stat_result] = None, mime_type: Optional[str] = None) -> Dict:
+    """Build a discovery entry for a single file."""
+    stat = stat or os.stat(path)
+    return {
+        'path': Path(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'mime_type': mime_type or mime_type_for(str(path))
+    }
+
+
+def discover_videos(
+    directory: str,
+    recursive: bool = False,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    sniff: bool = False
+) -> List[Dict]:
+    """
+    Find video files in a directory with a single scandir walk.
+
+    Args:
+        directory: Directory to search
+        recursive: Also search subdirectories (symlinked directories are not followed)
+        include: Glob patterns a file's name or relative path must match (all files if omitted)
+        exclude: Glob patterns for files and directories to skip (hidden files if omitted)
+        sniff: Identify videos by their container bytes as well as by extension. Files with
+            a video container but no video extension are included, and the sniffed MIME
+            type wins over the extension.
+
+    Returns:
+        Entries with path, size, mtime and mime_type, sorted by path
+    """
+    root = Path(directory)
+    exclude = DEFAULT_EXCLUDE if exclude is None else exclude
+    videos = []
+    pending = [root]
+
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                relative = Path(entry.path).relative_to(root).as_posix()
+                if exclude and _matches(relative, exclude):
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(Path(entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
+                if include and not _matches(relative, include):
+                    continue
+
+                has_video_extension = Path(entry.name).suffix.lower() in VIDEO_EXTENSIONS
+                mime_type = None
+                if sniff:
+                    mime_type = sniff_mime_type(entry.path)
+                    if mime_type is None and not has_video_extension:
+                        continue
+                elif not has_video_extension:
+                    continue
+
+                videos.append(describe_video(Path(entry.path), entry.stat(), mime_type))
+
+    return sorted(videos, key=lambda v: str(v['path']))
@@ -0,0 +1,302 @@
+"""
+Coordinator/worker mode for spreading a large backlog over several machines.
+
+The coordinator finds, preflights and deduplicates the videos, enqueues one job per video in
+a shared JobQueue, waits for the workers to finish them and then aggregates the
+results as a normal run would. Workers lease jobs, run the individual crew on
+each video and acknowledge the job with its result record, extending their lease
+while a video is being processed.
+
+Videos are referenced by absolute path, so the coordinator and every worker must
+see the video directory (and the queue file) at the same path on shared storage.
+"""
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from crew import (HackReporterCrew, NOT_PROVIDED, aggregate_incremental, aggregate_summaries, preflight_inputs,
+                  process_video, write_run_report)
+from dedup import find_duplicates
+from discovery import describe_video
+from history_store import ProjectHistory
+from job_queue import LEASED, PENDING, JobQueue, default_worker_id
+from logging_config import get_logger
+from result_sink import JsonlResultSink, hash_file
+from sampling import remember_duration
+from scheduler import Deadline, min_timeout
+from tools.gemini_file_manager import close_file_manager, open_file_manager
+from tools.gemini_prompt_cache import close_prompt_cache, open_prompt_cache
+
+logger = get_logger(__name__)
+
+
+async def coordinate(directory: str, queue_path: str, video_files: List[Path],
+                     attendee_list: Optional[str] = None, project_gallery_url: Optional[str] = None,
+                     fingerprint: bool = False, incremental: bool = False, aggregate: bool = True,
+                     deadline: Optional[Deadline] = None, aggregation_reserve: float = 300.0,
+                     aggregate_partial: bool = True, preflight: bool = True, polish: bool = False,
+                     event: Optional[str] = None, share: bool = False, project_drafts: bool = False,
+                     visibility_timeout: float = 1800,
+                     poll_interval: float = 10.0) -> Dict:
+    """
+    Enqueue every video, wait for the workers and aggregate the results.
+
+    Args:
+        directory: Directory the videos were found in
+        queue_path: Shared SQLite queue file
+        video_files: Videos to process
+        attendee_list: Path to attendee list file (optional)
+        project_gallery_url: URL of hackathon project gallery to scrape (optional)
+        fingerprint: Also treat re-encoded copies as duplicates
+        incremental: Aggregate incrementally into output/ranking.json
+        aggregate: Whether to run the aggregator once the jobs are finished
+        deadline: Global deadline; when it's near, whatever has finished is aggregated
+        aggregation_reserve: Seconds before the deadline kept free for aggregation
+        aggregate_partial: On Ctrl+C, still aggregate the jobs finished so far.
+            Videos without a successful result are always listed in output/run_report.json.
+        preflight: Probe every video with ffprobe before enqueueing it, rejecting unusable
+            files and remuxing repairable ones next to the queue file
+        polish: Let the LLM polish project descriptions in the aggregated thread
+        event: Event name the projects are recorded under in the project history
+            (defaults to the directory name)
+        share: Ask Typefully for a shareable link to the thread's draft
+        project_drafts: Also create a Typefully draft for every project (not with incremental)
+        visibility_timeout: Seconds a worker's lease lasts unless extended
+        poll_interval: Seconds between queue status checks
+
+    Returns:
+        Dictionary with processing results
+    """
+    deadline = deadline or Deadline()
+    if not video_files:
+        return {"error": f"No video files found in {directory}"}
+
+    output_dir = Path('output')
+    output_dir.mkdir(exist_ok=True)
+
+    videos = [describe_video(Path(path)) for path in video_files]
+    video_files = [video['path'] for video in videos]
+    sizes = {str(video['path']): video['size'] for video in videos}
+
+    # Unusable videos are rejected here rather than failing on every worker they're leased to
+    rejected = []
+    durations = {}
+    if preflight:
+        # Repaired copies must be readable by the workers, so they go next to the shared queue file
+        video_files, durations, rejected = await preflight_inputs(
+            video_files, sizes, output_dir, repair_dir=Path(queue_path).resolve().parent / 'preflight'
+        )
+        if not video_files:
+            return {"error": f"No usable video files in {directory} (see {output_dir / 'preflight.json'})"}
+
+    dedup_result = await asyncio.to_thread(find_duplicates, video_files, fingerprint)
+    for duplicate in dedup_result['duplicates']:
+        logger.info(f"♻️  Skipping duplicate {duplicate['path'].name} "
+                    f"({duplicate['match']} match of {duplicate['canonical'].name})")
+
+    jobs = []
+    for video_file in dedup_result['unique']:
+        video_hash = dedup_result['hashes'].get(str(video_file)) or await asyncio.to_thread(hash_file, str(video_file))
+        jobs.append({
+            'video_path': str(video_file.resolve()),
+            'video_filename': video_file.name,
+            'video_hash': video_hash,
+            'attendee_list': attendee_list or NOT_PROVIDED,
+            'project_gallery_url': project_gallery_url or NOT_PROVIDED,
+            'size_bytes': sizes[str(video_file)],
+            'duration': durations.get(str(video_file))
+        })
+    video_hashes = [job['video_hash'] for job in jobs]
+
+    queue = JobQueue(queue_path, visibility_timeout=visibility_timeout)
+    added = queue.enqueue(jobs)
+    logger.info(f"📥 Enqueued {added} new job(s) in {queue.path} ({len(jobs) - added} already queued)")
+    logger.info(f"   Start workers with: python test_cli.py {directory} --worker {queue.path}")
+
+    interrupted = False
+    deadline_reached = False
+    last_counts = None
+    try:
+        while True:
+            queue.reap_expired()
+            counts = queue.counts()
+            if counts != last_counts:
+                logger.info(f"   Queue: {counts['done']} done, {counts['leased']} in progress, "
+                            f"{counts['pending']} pending, {counts['failed']} failed")
+                last_counts = counts
+            if queue.finished():
+                break
+            remaining = deadline.remaining()
+            if remaining is not None and remaining <= aggregation_reserve:
+                logger.warning("⏱️  Deadline near, aggregating the jobs finished so far")
+                deadline_reached = True
+                break
+            await asyncio.sleep(poll_interval)
+    except asyncio.CancelledError:
+        interrupted = True
+        logger.warning("⚠️  Coordinator interrupted, aggregating the jobs finished so far")
+
+    # Collect the workers' records into the local sink so aggregation works as usual
+    sink = JsonlResultSink(output_dir / 'results.jsonl')
+    wanted = set(video_hashes)
+    records = [record for record in queue.results() if record['video_hash'] in wanted]
+    for record in records:
+        sink.write(record)
+    successful = [record for record in records if record['status'] == 'success']
+    history = ProjectHistory()
+    for record in successful:
+        history.add(record, event or Path(directory).resolve().name)
+    logger.info(f"Processed {len(successful)}/{len(jobs)} videos successfully across all workers")
+
+    # Jobs without a result were still queued or in progress when the coordinator stopped
+    statuses = {record['video_path']: record['status'] for record in records}
+    job_statuses = queue.statuses()
+    for job in jobs:
+        if job['video_path'] not in statuses and not interrupted:
+            status = job_statuses.get(job['video_hash'])
+            if status == PENDING:
+                statuses[job['video_path']] = 'not_started'
+            elif status == LEASED and deadline_reached:
+                statuses[job['video_path']] = 'timeout'
+    missing = write_run_report(output_dir, [job['video_path'] for job in jobs], statuses, interrupted, rejected)
+
+    results = {
+        'processed_videos': len(jobs),
+        'video_files': [job['video_path'] for job in jobs],
+        'video_hashes': video_hashes,
+        'successful_videos': len(successful),
+        'duplicates': [str(d['path']) for d in dedup_result['duplicates']],
+        'rejected_videos': rejected,
+        'missing_videos': missing,
+        'interrupted': interrupted,
+        'results_file': str(sink.path)
+    }
+
+    if interrupted and not aggregate_partial:
+        aggregate = False
+    elif not successful:
+        logger.warning("No successful videos to aggregate")
+        aggregate = False
+
+    # Aggregation covers the successful videos only and gets whatever time is left before the deadline
+    if aggregate:
+        crew_instance = HackReporterCrew()
+        if incremental:
+            aggregation = aggregate_incremental(sink.latest(video_hashes), output_dir, crew_instance, share=share)
+        else:
+            aggregation = aggregate_summaries(sink.latest(video_hashes), output_dir, crew_instance,
+                                              polish=polish, share=share, project_drafts=project_drafts)
+        results['final_result'] = await asyncio.wait_for(aggregation, deadline.remaining())
+
+    return results
+
+
+async def run_worker(queue_path: str, worker_id: Optional[str] = None, max_concurrency: int = 1,
+                     video_timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                     context_cache: bool = False, visibility_timeout: float = 1800,
+                     poll_interval: float = 10.0, idle_timeout: float = 600.0) -> Dict:
+    """
+    Lease and process jobs until the queue is finished.
+
+    Args:
+        queue_path: Shared SQLite queue file
+        worker_id: Name of this worker in the queue (hostname and pid if omitted)
+        max_concurrency: Number of videos this worker processes at once
+        video_timeout: Seconds each video's crew may run before it is given up (optional)
+        deadline: Stop leasing jobs once it has passed; each video's timeout is also capped
+            by the time left (optional)
+        context_cache: Store the analysis instructions shared by every video in a Gemini
+            context cache for the lifetime of the worker
+        visibility_timeout: Seconds a lease lasts; leases are extended while a video is processed
+        poll_interval: Seconds to wait when no job is available
+        idle_timeout: Exit after this long without finding a job, even if other workers
+            still hold jobs
+
+    Returns:
+        Dictionary with the number of jobs this worker acknowledged and failed
+    """
+    worker_id = worker_id or default_worker_id()
+    deadline = deadline or Deadline()
+    queue = JobQueue(queue_path, visibility_timeout=visibility_timeout)
+    crew_instance = HackReporterCrew()
+    base_crews = {}
+
+    output_dir = Path('output')
+    output_dir.mkdir(exist_ok=True)
+    sink = JsonlResultSink(output_dir / 'results.jsonl')
+    stats = {'worker_id': worker_id, 'acknowledged': 0, 'failed': 0}
+
+    logger.info(f"👷 Worker {worker_id} processing jobs from {queue.path} ({max_concurrency} at a time)")
+
+    async def keep_lease(key: str) -> None:
+        while True:
+            await asyncio.sleep(visibility_timeout / 3)
+            if not await asyncio.to_thread(queue.extend, key, worker_id):
+                logger.warning(f"⚠️  Lost the lease on job {key[:8]}; another worker may pick it up")
+                return
+
+    async def slot() -> None:
+        idle_since = time.monotonic()
+        while not deadline.expired():
+            job = await asyncio.to_thread(queue.lease, worker_id)
+            if job is None:
+                counts = await asyncio.to_thread(queue.counts)
+                if sum(counts.values()) and await asyncio.to_thread(queue.finished):
+                    return
+                if time.monotonic() - idle_since > idle_timeout:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+
+            video_input = job['payload']
+            logger.info(f"🎬 {video_input['video_filename']} (attempt {job['attempts']})")
+            if video_input.get('duration'):
+                # Probed by the coordinator's preflight, so sampling doesn't probe the file again
+                remember_duration(video_input['video_path'], video_input['duration'])
+
+            # One base crew per distinct attendee list/gallery URL, copied per video
+            crew_key = (video_input['attendee_list'], video_input['project_gallery_url'])
+            if crew_key not in base_crews:
+                base_crews[crew_key] = crew_instance.individual_crew(video_input)
+
+            heartbeat = asyncio.create_task(keep_lease(job['key']))
+            try:
+                record = await process_video(base_crews[crew_key].copy(), video_input, sink, output_dir,
+                                             timeout=min_timeout(video_timeout, deadline.remaining()))
+            finally:
+                heartbeat.cancel()
+
+            if record['status'] == 'success':
+                acknowledged = await asyncio.to_thread(queue.ack, job['key'], worker_id, record)
+                stats['acknowledged'] += acknowledged
+                if acknowledged:
+                    logger.info(f"✅ Completed {video_input['video_filename']}",
+                                extra={'video': video_input['video_path'], 'status': 'success', 'worker': worker_id})
+                else:
+                    logger.warning(f"⚠️  Completed {video_input['video_filename']} after losing its lease",
+                                   extra={'video': video_input['video_path'], 'status': 'success', 'worker': worker_id})
+            else:
+                await asyncio.to_thread(queue.fail, job['key'], worker_id, record['error'])
+                stats['failed'] += 1
+                logger.error(f"❌ ERROR processing {video_input['video_filename']}: {record['error']}",
+                             extra={'video': video_input['video_path'], 'status': record['status'], 'worker': worker_id})
+            idle_since = time.monotonic()
+
+    if context_cache:
+        open_prompt_cache(deadline.remaining() or 3600)
+    # Uploads are kept within the storage quota and deleted when the worker stops
+    open_file_manager()
+    try:
+        await asyncio.gather(*(slot() for _ in range(max_concurrency)))
+        if deadline.expired():
+            logger.warning(f"⏱️  Deadline reached, worker {worker_id} stopped leasing jobs")
+    except asyncio.CancelledError:
+        # Leases of unfinished jobs expire and the jobs are picked up by other workers
+        logger.warning(f"⚠️  Worker {worker_id} stopped")
+    finally:
+        close_file_manager()
+        if context_cache:
+            close_prompt_cache()
+
+    return stats
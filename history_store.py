@@ -0,0 +1,240 @@
+"""
+Persistent, searchable history of every project analyzed across events.
+
+Each successful analysis is stored in a local SQLite database with its project
+name, description, tagline, team members, handles, video hash, event and
+fidelity ('full', or 'triage' for videos summarized from the triage pass only).
+A full-text
+index (FTS5) over the text fields makes past events searchable instantly, and
+lookups by video hash let a run reuse the analysis of a demo video that was
+already processed at an earlier event.
+"""
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ranking import parse_summary
+
+DEFAULT_HISTORY_DB = 'output/history.db'
+
+# Name parse_summary gives a summary without one, and how failed summaries start
+UNKNOWN_PROJECT = 'Unknown Project'
+ERROR_PREFIX = 'Error processing'
+
+# Fidelity of an analysis by the individual crew; triage-only results are 'triage'
+FULL = 'full'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    video_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    tagline TEXT,
+    team TEXT,
+    handles TEXT,
+    summary TEXT NOT NULL,
+    video_filename TEXT,
+    analyzed_at REAL NOT NULL,
+    fidelity TEXT NOT NULL DEFAULT 'full',
+    UNIQUE (video_hash, event)
+);
+CREATE INDEX IF NOT EXISTS projects_video_hash ON projects (video_hash);
+"""
+
+# External-content FTS index kept in sync with the projects table by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+    name, description, tagline, team, handles, event,
+    content='projects', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS projects_ai AFTER INSERT ON projects BEGIN
+    INSERT INTO projects_fts (rowid, name, description, tagline, team, handles, event)
+    VALUES (new.id, new.name, new.description, new.tagline, new.team, new.handles, new.event);
+END;
+CREATE TRIGGER IF NOT EXISTS projects_ad AFTER DELETE ON projects BEGIN
+    INSERT INTO projects_fts (projects_fts, rowid, name, description, tagline, team, handles, event)
+    VALUES ('delete', old.id, old.name, old.description, old.tagline, old.team, old.handles, old.event);
+END;
+CREATE TRIGGER IF NOT EXISTS projects_au AFTER UPDATE ON projects BEGIN
+    INSERT INTO projects_fts (projects_fts, rowid, name, description, tagline, team, handles, event)
+    VALUES ('delete', old.id, old.name, old.description, old.tagline, old.team, old.handles, old.event);
+    INSERT INTO projects_fts (rowid, name, description, tagline, team, handles, event)
+    VALUES (new.id, new.name, new.description, new.tagline, new.team, new.handles, new.event);
+END;
+"""
+
+
+def is_analysis(summary: Optional[str]) -> bool:
+    """Whether a summary describes a project, rather than being empty or an error message."""
+    if not summary or not summary.strip() or summary.startswith(ERROR_PREFIX):
+        return False
+    return parse_summary(summary)['name'] != UNKNOWN_PROJECT
+
+
+def history_path() -> Path:
+    """Location of the history database, configurable with HACKREPORTER_HISTORY_DB."""
+    return Path(os.getenv('HACKREPORTER_HISTORY_DB', DEFAULT_HISTORY_DB))
+
+
+class ProjectHistory:
+    """SQLite store of analyzed projects with full-text search."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (HACKREPORTER_HISTORY_DB or output/history.db if omitted)
+        """
+        self.path = Path(path) if path else history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(projects)")}
+            if 'fidelity' not in columns:
+                # Databases written by earlier versions only hold full analyses
+                conn.execute(f"ALTER TABLE projects ADD COLUMN fidelity TEXT NOT NULL DEFAULT '{FULL}'")
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to substring matching
+                self.full_text = False
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Dict:
+        entry = dict(row)
+        entry['handles'] = entry['handles'].split() if entry.get('handles') else []
+        return entry
+
+    def add(self, record: Dict, event: str, team: Optional[str] = None) -> bool:
+        """
+        Store (or replace) the analysis of a video for an event.
+
+        Failed records and summaries without a project aren't stored, so they can't
+        be reused by a later run. A triage-only record doesn't replace a full analysis
+        of the same video for the same event.
+
+        Args:
+            record: Successful result record with video_hash, video_filename, summary and,
+                optionally, team (the team members found by the video analysis) and fidelity
+            event: Name of the event the video was shown at
+            team: Team members, comma-separated (the record's team if omitted)
+
+        Returns:
+            Whether the record was stored
+        """
+        if record.get('status', 'success') != 'success' or not is_analysis(record.get('summary')):
+            return False
+        project = parse_summary(record['summary'])
+        handles = [h for h in project['handles'] if h.lower() != '@unknown']
+        team = team or ', '.join(record.get('team') or []) or None
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO projects (video_hash, event, name, description, tagline, team, handles, summary, "
+                    "video_filename, analyzed_at, fidelity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (video_hash, event) DO UPDATE SET name = excluded.name, "
+                    "description = excluded.description, tagline = excluded.tagline, team = excluded.team, "
+                    "handles = excluded.handles, summary = excluded.summary, "
+                    "video_filename = excluded.video_filename, analyzed_at = excluded.analyzed_at, "
+                    "fidelity = excluded.fidelity "
+                    f"WHERE excluded.fidelity = '{FULL}' OR projects.fidelity != '{FULL}'",
+                    (record['video_hash'], event, project['name'], project['description'], project['tagline'],
+                     team, ' '.join(handles), record['summary'], record.get('video_filename'),
+                     record.get('completed_at', time.time()), record.get('fidelity', FULL))
+                )
+        finally:
+            conn.close()
+        return True
+
+    def lookup(self, video_hash: str, full_only: bool = False) -> Optional[Dict]:
+        """
+        The most recent reusable analysis of a video, from any event, or None.
+
+        A full analysis is preferred over a more recent triage-only one.
+
+        Args:
+            video_hash: Hash of the video file
+            full_only: Ignore triage-only results
+        """
+        conn = self._connect()
+        try:
+            # Databases written by earlier versions may hold failed analyses
+            row = conn.execute(
+                "SELECT * FROM projects WHERE video_hash = ? AND name != ? AND summary NOT LIKE ? "
+                + (f"AND fidelity = '{FULL}' " if full_only else "")
+                + f"ORDER BY fidelity = '{FULL}' DESC, analyzed_at DESC LIMIT 1",
+                (video_hash, UNKNOWN_PROJECT, f"{ERROR_PREFIX}%")
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._entry(row) if row else None
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Search past projects by name, description, tagline, team, handles or event.
+
+        Args:
+            query: FTS5 query, e.g. 'json' or 'agent* AND voice' (invalid syntax is searched as plain words)
+            limit: Maximum number of results
+
+        Returns:
+            Matching projects, best match first
+        """
+        conn = self._connect()
+        try:
+            if self.full_text:
+                try:
+                    rows = self._search_fts(conn, query, limit)
+                except sqlite3.OperationalError:
+                    # Not valid FTS5 syntax (e.g. stray punctuation): search for the words instead
+                    words = ' '.join(f'"{w}"*' for w in query.replace('"', ' ').split())
+                    rows = self._search_fts(conn, words, limit) if words else []
+            else:
+                pattern = f"%{query}%"
+                rows = conn.execute(
+                    "SELECT * FROM projects WHERE name LIKE ? OR description LIKE ? OR tagline LIKE ? "
+                    "OR team LIKE ? OR handles LIKE ? OR event LIKE ? ORDER BY analyzed_at DESC LIMIT ?",
+                    (pattern,) * 6 + (limit,)
+                ).fetchall()
+        finally:
+            conn.close()
+        return [self._entry(row) for row in rows]
+
+    @staticmethod
+    def _search_fts(conn: sqlite3.Connection, query: str, limit: int) -> List[sqlite3.Row]:
+        return conn.execute(
+            "SELECT projects.* FROM projects_fts JOIN projects ON projects.id = projects_fts.rowid "
+            "WHERE projects_fts MATCH ? ORDER BY bm25(projects_fts, 10.0, 2.0, 2.0, 1.0, 5.0, 1.0) LIMIT ?",
+            (query, limit)
+        ).fetchall()
+
+    def events(self) -> List[Dict]:
+        """Every event in the history with its number of projects."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT event, COUNT(*) AS projects, MAX(analyzed_at) AS last_analyzed FROM projects "
+                "GROUP BY event ORDER BY last_analyzed DESC"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+
+def format_entry(entry: Dict) -> str:
+    """One-line description of a history entry for the CLI."""
+    handles = f" {' '.join(entry['handles'])}" if entry['handles'] else ""
+    return f"{entry['name']} ({entry['event']}): {entry['description']}{handles}"
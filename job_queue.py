@@ -0,0 +1,237 @@
+"""
+Shared job queue for spreading video processing over several machines.
+
+The queue is a single SQLite file on shared storage. A coordinator enqueues one
+job per video; workers lease jobs, process them and acknowledge them with their
+result record. A lease expires after the visibility timeout unless the worker
+extends it, so jobs held by a crashed worker become available again. Jobs that
+fail repeatedly are marked failed after max_attempts leases.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def default_worker_id() -> str:
+    """A worker id that is unique across machines and processes."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    """Lease-based job queue stored in a SQLite file."""
+
+    def __init__(self, path: str, visibility_timeout: float = 1800, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite file, on storage shared by the coordinator and all workers
+            visibility_timeout: Seconds a lease lasts unless extended
+            max_attempts: Leases per job before it is marked failed
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        conn = self._connect()
+        try:
+            conn.execute(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: every write below runs in an explicit BEGIN IMMEDIATE transaction
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, jobs: Iterable[Dict], key: str = 'video_hash') -> int:
+        """
+        Add jobs, skipping any whose key is already queued (so re-running the coordinator is safe).
+
+        Args:
+            jobs: Job payloads (JSON-serializable)
+            key: Payload field that identifies a job
+
+        Returns:
+            Number of jobs added
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            added = 0
+            for job in jobs:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (job_key, payload, enqueued_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (job[key], json.dumps(job), now, now)
+                )
+                added += cursor.rowcount
+            conn.execute("COMMIT")
+            return added
+        finally:
+            conn.close()
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        """
+        Lease the oldest available job: pending, or leased by a worker whose lease has expired.
+
+        Returns:
+            Dictionary with key, payload and attempts, or None if no job is available
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._fail_exhausted(conn, now)
+            row = conn.execute(
+                "SELECT job_key, payload, attempts FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY enqueued_at, job_key LIMIT 1",
+                (PENDING, LEASED, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "updated_at = ? WHERE job_key = ?",
+                (LEASED, worker_id, now + self.visibility_timeout, now, row['job_key'])
+            )
+            conn.execute("COMMIT")
+            return {'key': row['job_key'], 'payload': json.loads(row['payload']), 'attempts': row['attempts'] + 1}
+        finally:
+            conn.close()
+
+    def _fail_exhausted(self, conn: sqlite3.Connection, now: float) -> int:
+        """Mark jobs failed whose lease expired after their last allowed attempt."""
+        return conn.execute(
+            "UPDATE jobs SET status = ?, error = COALESCE(error, 'Lease expired'), updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, now, LEASED, now, self.max_attempts)
+        ).rowcount
+
+    def reap_expired(self) -> int:
+        """
+        Mark jobs failed whose workers held their last allowed lease until it expired.
+
+        Workers do this as they lease jobs; the coordinator calls it too, so a run
+        still finishes when every worker has crashed.
+
+        Returns:
+            Number of jobs marked failed
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            failed = self._fail_exhausted(conn, time.time())
+            conn.execute("COMMIT")
+            return failed
+        finally:
+            conn.close()
+
+    def _update_leased(self, key: str, worker_id: str, sql: str, params: tuple) -> bool:
+        """Apply an update to a job only while the worker still holds its lease."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                f"{sql} WHERE job_key = ? AND status = ? AND lease_owner = ?",
+                params + (key, LEASED, worker_id)
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def extend(self, key: str, worker_id: str) -> bool:
+        """Extend a lease by the visibility timeout. Returns False if the lease was lost."""
+        now = time.time()
+        return self._update_leased(key, worker_id, "UPDATE jobs SET lease_expires = ?, updated_at = ?",
+                                   (now + self.visibility_timeout, now))
+
+    def ack(self, key: str, worker_id: str, result: Dict) -> bool:
+        """Mark a leased job done with its result. Returns False if the lease was lost."""
+        return self._update_leased(key, worker_id, "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ?",
+                                   (DONE, json.dumps(result), time.time()))
+
+    def fail(self, key: str, worker_id: str, error: str) -> bool:
+        """
+        Release a leased job after an error: it is retried, or marked failed after max_attempts.
+        Returns False if the lease was lost.
+        """
+        return self._update_leased(
+            key, worker_id,
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ?",
+            (self.max_attempts, FAILED, PENDING, error, time.time())
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def statuses(self) -> Dict[str, str]:
+        """Status of every job, by job key."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT job_key, status FROM jobs").fetchall()
+        finally:
+            conn.close()
+        return {row['job_key']: row['status'] for row in rows}
+
+    def finished(self) -> bool:
+        """Whether every job is done or failed."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def results(self) -> List[Dict]:
+        """Result records of all done jobs, plus an error record for each failed job."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT payload, status, result, error FROM jobs ORDER BY job_key").fetchall()
+        finally:
+            conn.close()
+
+        records = []
+        for row in rows:
+            if row['status'] == DONE:
+                records.append(json.loads(row['result']))
+            elif row['status'] == FAILED:
+                payload = json.loads(row['payload'])
+                records.append({
+                    'video_hash': payload['video_hash'],
+                    'video_filename': payload['video_filename'],
+                    'video_path': payload['video_path'],
+                    'status': 'error',
+                    'error': row['error'],
+                    'summary': f"Error processing {payload['video_filename']}: {row['error']}"
+                })
+        return records
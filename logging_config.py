@@ -0,0 +1,116 @@
+"""
+Logging for HackReporter: one configured logger, as text or JSON lines.
+
+Every module logs through a child of the `hackreporter` logger (see get_logger),
+so a single call to configure_logging sets the level and format for the crews,
+the scheduler modes and the tools alike.
+
+Text output looks like the plain console messages HackReporter always printed.
+JSON-lines output has one object per line with time, level, logger and message,
+plus any structured fields passed with `extra=` (video, status, elapsed, ...),
+for log collectors in large runs. Quiet mode only shows warnings and errors and
+turns off the verbose step-by-step output of the CrewAI agents.
+
+Settings are also stored in the environment, so worker processes spawned by the
+process pool log the same way.
+"""
+import json
+import logging
+import os
+import sys
+from typing import Optional, Tuple
+
+LOGGER_NAME = 'hackreporter'
+
+LOG_FORMATS = ('text', 'json')
+
+# Attributes every LogRecord has; anything else on a record came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as a single JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a module, under the shared `hackreporter` logger.
+
+    The shared logger is configured from the environment on first use, so modules
+    used without the CLI still log to the console.
+
+    Args:
+        name: Module name, usually __name__
+    """
+    if not logging.getLogger(LOGGER_NAME).handlers:
+        level, log_format, _ = _resolve(None, None, None)
+        _install_handler(level, log_format)
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def agents_verbose() -> bool:
+    """Whether CrewAI agents and crews print their verbose output (off in quiet mode)."""
+    return os.getenv('HACKREPORTER_VERBOSE', 'true').lower() != 'false'
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      quiet: Optional[bool] = None) -> logging.Logger:
+    """
+    Configure the `hackreporter` logger. Safe to call more than once.
+
+    Args:
+        level: Log level name (HACKREPORTER_LOG_LEVEL, else INFO, or WARNING in quiet mode)
+        log_format: 'text' or 'json' (HACKREPORTER_LOG_FORMAT, else text)
+        quiet: Only log warnings and errors, and turn off verbose agent output
+            (HACKREPORTER_QUIET if omitted)
+
+    Returns:
+        The configured logger
+    """
+    level, log_format, quiet = _resolve(level, log_format, quiet)
+
+    os.environ['HACKREPORTER_LOG_LEVEL'] = level
+    os.environ['HACKREPORTER_LOG_FORMAT'] = log_format
+    os.environ['HACKREPORTER_QUIET'] = 'true' if quiet else 'false'
+    if quiet:
+        os.environ['HACKREPORTER_VERBOSE'] = 'false'
+
+    return _install_handler(level, log_format)
+
+
+def _resolve(level: Optional[str], log_format: Optional[str], quiet: Optional[bool]) -> Tuple[str, str, bool]:
+    # An explicit --quiet overrides a level inherited from the environment
+    if quiet:
+        level = level or 'WARNING'
+    elif quiet is None:
+        quiet = os.getenv('HACKREPORTER_QUIET', 'false').lower() == 'true'
+    level = (level or os.getenv('HACKREPORTER_LOG_LEVEL') or ('WARNING' if quiet else 'INFO')).upper()
+    log_format = log_format or os.getenv('HACKREPORTER_LOG_FORMAT', 'text')
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', expected one of {', '.join(LOG_FORMATS)}")
+    return level, log_format, quiet
+
+
+def _install_handler(level: str, log_format: str) -> logging.Logger:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonLinesFormatter() if log_format == 'json' else logging.Formatter('%(message)s'))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -10,6 +10,8 @@ import subprocess
 from pathlib import Path
 import shutil
 
+from discovery import discover_videos
+
 
 def check_ffmpeg():
     """Check if ffmpeg is installed."""
@@ -121,10 +123,7 @@ def optimize_videos_directory(input_dir, output_dir=None, target_size_mb=50):
     output_path.mkdir(exist_ok=True)
 
     # Find all video files
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.MOV', '.MP4']
-    video_files = []
-    for ext in video_extensions:
-        video_files.extend(input_path.glob(f'*{ext}'))
+    video_files = [video['path'] for video in discover_videos(str(input_path))]
 
     if not video_files:
         print(f"❌ No video files found in {input_dir}")
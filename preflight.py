@@ -0,0 +1,226 @@
+"""
+Preflight checks that catch unusable videos before any upload or API spend.
+
+Every file is probed with ffprobe, concurrently under a semaphore, for its
+duration, streams, codecs and bitrate. Empty, unreadable and audio-only files
+are rejected. Files Gemini can't use as they are, but whose streams are fine
+(a container without a duration index, or a container the File API doesn't
+accept such as .mkv), are repaired by remuxing them into an MP4 without
+re-encoding. The probed duration is recorded for sampling, so the analysis
+doesn't probe the file again.
+"""
+import asyncio
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from discovery import VIDEO_MIME_TYPES
+from logging_config import get_logger
+from sampling import remember_duration
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+
+PROBE_TIMEOUT = 60
+REMUX_TIMEOUT = 600
+
+# Shorter videos have nothing to analyze
+MIN_DURATION = 1.0
+
+
+async def _run(cmd: List[str], timeout: float) -> Tuple[int, bytes]:
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout
+
+
+async def probe_video(video_path: Path) -> Optional[Dict]:
+    """
+    Run ffprobe on a video.
+
+    Returns:
+        ffprobe's format and streams, or None if the file can't be read
+    """
+    try:
+        returncode, stdout = await _run(
+            ['ffprobe', '-v', 'error', '-show_format', '-show_streams', '-of', 'json', str(video_path)],
+            PROBE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return None
+    if returncode != 0:
+        return None
+    try:
+        return json.loads(stdout)
+    except ValueError:
+        return None
+
+
+def _number(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def _frame_rate(rate: Optional[str]) -> Optional[float]:
+    # ffprobe reports frame rates as fractions, e.g. "30000/1001"
+    if not rate or '/' not in rate:
+        return _number(rate)
+    numerator, denominator = rate.split('/', 1)
+    numerator, denominator = _number(numerator), _number(denominator)
+    return round(numerator / denominator, 3) if numerator and denominator else None
+
+
+def parse_probe(probe: Dict) -> Dict:
+    """
+    Extract the metadata the pipeline uses from ffprobe output.
+
+    Returns:
+        Dictionary with duration (seconds, None if unknown), bit_rate, format,
+        video_codec, width, height, fps, audio_codec, has_video and has_audio
+    """
+    fmt = probe.get('format', {})
+    streams = probe.get('streams', [])
+    # Cover art in audio files shows up as a video stream
+    video = next((s for s in streams if s.get('codec_type') == 'video'
+                  and not s.get('disposition', {}).get('attached_pic')), None)
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+
+    bit_rate = _number(fmt.get('bit_rate'))
+    return {
+        'duration': _number(fmt.get('duration')) or _number((video or {}).get('duration')),
+        'bit_rate': int(bit_rate) if bit_rate else None,
+        'format': fmt.get('format_name'),
+        'video_codec': (video or {}).get('codec_name'),
+        'width': (video or {}).get('width'),
+        'height': (video or {}).get('height'),
+        'fps': _frame_rate((video or {}).get('avg_frame_rate')),
+        'audio_codec': (audio or {}).get('codec_name'),
+        'has_video': video is not None,
+        'has_audio': audio is not None,
+    }
+
+
+def assess(video_path: Path, size: int, metadata: Optional[Dict]) -> Tuple[str, Optional[str]]:
+    """
+    Decide whether a probed video can be analyzed.
+
+    Returns:
+        (status, reason): status is 'ok', 'repair' (remuxing should fix it) or 'rejected'
+    """
+    if size == 0:
+        return 'rejected', 'empty file'
+    if metadata is None:
+        return 'rejected', 'unreadable or corrupt (ffprobe failed)'
+    if not metadata['has_video'] and not metadata['has_audio']:
+        return 'rejected', 'no streams (corrupt)'
+    if not metadata['has_video']:
+        return 'rejected', 'no video stream (audio only)'
+    if metadata['duration'] is None:
+        return 'repair', 'no duration in the container'
+    if metadata['duration'] < MIN_DURATION:
+        return 'rejected', f"too short ({metadata['duration']:.1f}s)"
+    if Path(video_path).suffix.lower() not in VIDEO_MIME_TYPES:
+        return 'repair', f"{Path(video_path).suffix or 'unknown'} container not accepted by Gemini"
+    return 'ok', None
+
+
+async def remux_video(video_path: Path, output_path: Path) -> bool:
+    """Copy a video's first video and audio streams into a fresh MP4 container, without re-encoding."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        returncode, _ = await _run([
+            'ffmpeg', '-v', 'error', '-y', '-i', str(video_path),
+            '-map', '0:v:0', '-map', '0:a:0?', '-c', 'copy', '-movflags', '+faststart', str(output_path)
+        ], REMUX_TIMEOUT)
+    except (asyncio.TimeoutError, FileNotFoundError):
+        return False
+    return returncode == 0
+
+
+async def preflight_videos(
+    video_files: List[Path],
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    repair: bool = True,
+    repair_dir: Path = Path('output/preflight'),
+    probe: Callable[[Path], Awaitable[Optional[Dict]]] = probe_video
+) -> List[Dict]:
+    """
+    Probe every video concurrently and reject or repair unusable ones.
+
+    Args:
+        video_files: Videos to check
+        max_concurrency: Maximum number of ffprobe/ffmpeg processes at once
+        repair: Remux repairable videos into repair_dir (otherwise they are reported as 'repairable')
+        repair_dir: Directory for remuxed videos
+        probe: Coroutine returning ffprobe output for a path (probe_video)
+
+    Returns:
+        One entry per video, in input order, with path, video_path (the file to process,
+        which is the remuxed copy for repaired videos), status ('ok', 'repaired',
+        'repairable', 'rejected' or 'unchecked'), reason, size and metadata
+    """
+    if probe is probe_video and shutil.which('ffprobe') is None:
+        logger.warning("⚠️  ffprobe not found, skipping the preflight check (only empty files are rejected)")
+        probe = None
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def check(video_path: Path) -> Dict:
+        video_path = Path(video_path)
+        try:
+            size = video_path.stat().st_size
+        except OSError as e:
+            # Deleted or moved since discovery, or not readable
+            return {'path': video_path, 'video_path': video_path, 'size': None, 'metadata': None,
+                    'status': 'rejected', 'reason': f"can't read file ({e.strerror or e})"}
+        entry = {'path': video_path, 'video_path': video_path, 'size': size, 'metadata': None, 'reason': None}
+        if probe is None:
+            entry['status'], entry['reason'] = ('rejected', 'empty file') if size == 0 else ('unchecked', None)
+            return entry
+
+        async with semaphore:
+            raw = await probe(video_path) if size else None
+            metadata = parse_probe(raw) if raw else None
+            status, reason = assess(video_path, size, metadata)
+
+            if status == 'repair' and not repair:
+                status = 'repairable'
+            elif status == 'repair':
+                # Named after the original, plus a hash of its path in case two videos share a name
+                path_hash = hashlib.sha1(str(video_path.resolve()).encode()).hexdigest()[:8]
+                repaired = Path(repair_dir) / f"{video_path.stem}_{path_hash}.mp4"
+                raw = await probe(repaired) if await remux_video(video_path, repaired) else None
+                metadata = parse_probe(raw) if raw else None
+                if metadata and assess(repaired, repaired.stat().st_size, metadata)[0] == 'ok':
+                    status = 'repaired'
+                    entry.update(video_path=repaired, size=repaired.stat().st_size)
+                else:
+                    status, reason = 'rejected', f"{reason}, and remuxing didn't fix it"
+
+        entry.update(status=status, reason=reason, metadata=metadata)
+        if status in ('ok', 'repaired'):
+            remember_duration(str(entry['video_path']), metadata['duration'])
+        return entry
+
+    return list(await asyncio.gather(*(check(video_path) for video_path in video_files)))
+
+
+def preflight_summary(entries: List[Dict]) -> str:
+    """One-line count of preflight outcomes, e.g. '12 ok, 1 repaired, 2 rejected'."""
+    counts = {}
+    for entry in entries:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    return ', '.join(f"{count} {status}" for status, count in counts.items())
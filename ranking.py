@@ -0,0 +1,142 @@
+"""
+Persistent project ranking used for incremental aggregation.
+
+The ranked list lives in output/ranking.json together with the Typefully draft
+it was published to. When new projects arrive only they are scored, then they
+are inserted into the existing order instead of re-ranking every project.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Twitter/X handles, but not the domain part of an email address
+HANDLE_PATTERN = re.compile(r'(?<![\w@.])@[A-Za-z0-9_]{1,15}\b')
+
+
+def parse_summary(summary: str) -> Dict:
+    """
+    Split a per-video summary into its fields.
+
+    Summaries follow the video_analysis_task format: project name, description,
+    tagline and Twitter handles on separate (non-empty) lines.
+
+    Args:
+        summary: Summary text produced by the individual crew
+
+    Returns:
+        Dictionary with name, description, tagline and handles
+    """
+    lines = [line.strip() for line in summary.strip().splitlines() if line.strip()]
+    handles = []
+    while lines and lines[-1].startswith('@'):
+        handles = lines.pop().split() + handles
+
+    return {
+        'name': lines[0] if lines else 'Unknown Project',
+        'description': lines[1] if len(lines) > 1 else '',
+        'tagline': ' '.join(lines[2:]),
+        'handles': handles,
+    }
+
+
+def format_summary(name: str, description: str, tagline: str, handles: List[str]) -> str:
+    """Format project fields like the output of video_analysis_task."""
+    return f"{name}\n\n{description}\n\n{tagline}\n{' '.join(handles) or '@unknown'}"
+
+
+def merge_team_handles(analysis: str, team_report: Optional[str] = None) -> str:
+    """
+    Build a video's summary from its analysis, adding the handles found by team research.
+
+    The individual crew's final output is the team research report when a project
+    gallery is given, so the summary is taken from the video analysis instead and
+    only the handles are taken from the report.
+
+    Args:
+        analysis: Output of video_analysis_task
+        team_report: Output of team_research_task (optional)
+
+    Returns:
+        Summary in the video_analysis_task format
+    """
+    if not team_report:
+        return analysis
+    fields = parse_summary(analysis)
+    handles = [handle for handle in fields['handles'] if handle.lower() != '@unknown']
+    for handle in HANDLE_PATTERN.findall(team_report):
+        if handle.lower() != '@unknown' and handle.lower() not in {h.lower() for h in handles}:
+            handles.append(handle)
+    return format_summary(fields['name'], fields['description'], fields['tagline'], handles)
+
+
+def load_ranking(path: Path) -> Dict:
+    """Load the ranking state, or an empty one if none exists yet."""
+    if not path.exists():
+        return {'projects': [], 'draft_id': None}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_ranking(path: Path, state: Dict) -> None:
+    """Save the ranking state."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def published_state(projects: List[Dict], draft: Dict, previous: Optional[Dict] = None) -> Dict:
+    """
+    Ranking state after publishing a thread of the ranked projects.
+
+    The draft ID and share URL are taken from the Typefully result when it
+    succeeded; otherwise those of the previous state are kept.
+
+    Args:
+        projects: Projects in ranked order, each with its video_hash
+        draft: Result of the Typefully tool
+        previous: Ranking state before this aggregation (optional)
+    """
+    previous = previous or {}
+    state = {'projects': projects, 'draft_id': previous.get('draft_id'), 'share_url': previous.get('share_url')}
+    if draft.get('success'):
+        state['draft_id'] = draft.get('draft_id')
+        state['share_url'] = draft.get('share_url')
+    return state
+
+
+def insert_ranked(ranked: List[Dict], new_projects: List[Dict]) -> List[Dict]:
+    """
+    Insert scored projects into a list already ordered by descending score.
+
+    Projects with equal scores keep their existing order, so earlier projects
+    never move down because of a tie with a newcomer.
+
+    Args:
+        ranked: Existing ranked projects, each with a 'score'
+        new_projects: Newly scored projects, each with a 'score'
+
+    Returns:
+        A new ranked list containing all projects
+    """
+    result = list(ranked)
+    for project in new_projects:
+        index = len(result)
+        for i, existing in enumerate(result):
+            if project['score'] > existing['score']:
+                index = i
+                break
+        result.insert(index, project)
+    return result
+
+
+def reference_projects(ranked: List[Dict], limit: int = 5) -> List[Dict]:
+    """
+    Pick a fixed-size, evenly spread sample of ranked projects for score calibration.
+
+    Keeps the scoring prompt the same size no matter how many projects are ranked.
+    """
+    if len(ranked) <= limit:
+        return list(ranked)
+    step = (len(ranked) - 1) / (limit - 1)
+    return [ranked[round(i * step)] for i in range(limit)]
@@ -0,0 +1,84 @@
+"""
+Append-only JSONL sink for per-video results.
+
+Each processed video is written as one JSON line as soon as its crew finishes,
+keyed by the video's content hash and filename, so results survive crashes and
+can be followed with `tail -f output/results.jsonl` during a run.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 of a file without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class JsonlResultSink:
+    """Durable, append-only store of per-video result records."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: Dict) -> None:
+        """
+        Append a record and fsync it to disk before returning.
+
+        Args:
+            record: Result record, must contain video_hash and video_filename
+        """
+        record = {**record, 'completed_at': record.get('completed_at', time.time())}
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self) -> Iterator[Dict]:
+        """Stream records from disk one line at a time."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted run
+                    continue
+
+    def latest(self, video_hashes: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Get the most recent record per video hash.
+
+        Args:
+            video_hashes: Only return records for these hashes (all if omitted)
+
+        Returns:
+            Dictionary mapping video hash to its latest record
+        """
+        wanted = set(video_hashes) if video_hashes is not None else None
+        latest = {}
+        for record in self.records():
+            if wanted is None or record.get('video_hash') in wanted:
+                latest[record['video_hash']] = record
+        return latest
+
+    def summaries(self, video_hashes: Optional[Iterable[str]] = None, status: Optional[str] = None) -> List[str]:
+        """
+        Get the latest summary per video, ordered by filename for stable output.
+
+        Args:
+            video_hashes: Only return summaries for these hashes (all if omitted)
+            status: Only return summaries whose latest record has this status (e.g. 'success')
+        """
+        records = [r for r in self.latest(video_hashes).values() if status is None or r.get('status') == status]
+        return [r['summary'] for r in sorted(records, key=lambda r: r['video_filename'])]
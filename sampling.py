@@ -0,0 +1,102 @@
+"""
+Per-video frame sampling that keeps Gemini video analysis under a token budget.
+
+Gemini tokenizes video at a fixed cost per sampled frame plus a fixed cost per
+second of audio, so the tokens a video uses depend only on its duration and the
+sampling rate. The video's duration is probed with ffprobe, then the highest fps
+that stays under the budget is picked. If even the lowest useful fps is over the
+budget, the analysis is clipped to the opening of the video instead, where
+hackathon demos present the project.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from optimize_videos import get_video_info
+
+# Gemini token costs at default media resolution
+TOKENS_PER_FRAME = 258
+AUDIO_TOKENS_PER_SECOND = 32
+
+DEFAULT_TOKEN_BUDGET = 150_000
+MAX_FPS = 1.0
+MIN_FPS = 0.1
+
+# Durations already probed (e.g. by preflight), so they aren't probed again per analysis
+_known_durations: Dict[str, float] = {}
+
+
+def token_budget() -> int:
+    """Per-video token budget, configurable with GEMINI_VIDEO_TOKEN_BUDGET."""
+    return int(os.getenv("GEMINI_VIDEO_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def estimate_tokens(duration: float, fps: float) -> int:
+    """Estimated prompt tokens for a video segment of the given length."""
+    return int(duration * (fps * TOKENS_PER_FRAME + AUDIO_TOKENS_PER_SECOND))
+
+
+def segment_length(duration: float, start_offset: Optional[float] = None, end_offset: Optional[float] = None) -> float:
+    """Seconds of a video between start_offset and end_offset (its start and end if omitted)."""
+    end = duration if end_offset is None else min(end_offset, duration)
+    return max(end - min(start_offset or 0, duration), 0)
+
+
+def choose_sampling(
+    duration: float,
+    budget: Optional[int] = None,
+    max_fps: float = MAX_FPS,
+    min_fps: float = MIN_FPS,
+    start_offset: Optional[float] = None,
+    end_offset: Optional[float] = None
+) -> Dict:
+    """
+    Pick a sampling rate (and clip, if needed) for a video of the given duration.
+
+    Only the segment between start_offset and end_offset is analyzed, so the
+    sampling is chosen for its length, and a clip starts where the segment does.
+
+    Args:
+        duration: Video duration in seconds (0 if unknown)
+        budget: Maximum tokens for the video (GEMINI_VIDEO_TOKEN_BUDGET if omitted)
+        max_fps: Highest fps to use, even for short videos
+        min_fps: Lowest fps to use before clipping instead
+        start_offset: Start of the analyzed segment in seconds (the start of the video if omitted)
+        end_offset: End of the analyzed segment in seconds (the end of the video if omitted)
+
+    Returns:
+        Dictionary with fps, end_offset (seconds, None for the whole video),
+        policy ('default', 'fps' or 'clip'), duration, estimated_tokens and budget
+    """
+    budget = budget or token_budget()
+
+    if duration <= 0:
+        # Duration unknown (e.g. ffprobe missing): fall back to Gemini's default sampling
+        return {'fps': max_fps, 'end_offset': end_offset, 'policy': 'default', 'duration': duration,
+                'estimated_tokens': None, 'budget': budget}
+
+    segment = segment_length(duration, start_offset, end_offset)
+    fps = (budget / segment - AUDIO_TOKENS_PER_SECOND) / TOKENS_PER_FRAME if segment else max_fps
+    if fps >= min_fps:
+        fps = min(int(fps * 100) / 100, max_fps)  # Round down to stay under the budget
+        return {'fps': fps, 'end_offset': end_offset, 'policy': 'fps', 'duration': duration,
+                'estimated_tokens': estimate_tokens(segment, fps), 'budget': budget}
+
+    # Too long even at min_fps: analyze only as much of the segment's opening as fits
+    clip = int(budget / (min_fps * TOKENS_PER_FRAME + AUDIO_TOKENS_PER_SECOND))
+    return {'fps': min_fps, 'end_offset': min(start_offset or 0, duration) + clip, 'policy': 'clip',
+            'duration': duration, 'estimated_tokens': estimate_tokens(clip, min_fps), 'budget': budget}
+
+
+def remember_duration(video_path: str, duration: float) -> None:
+    """Record a video's probed duration for sampling_for_video."""
+    _known_durations[str(Path(video_path).resolve())] = duration
+
+
+def sampling_for_video(video_path: str, budget: Optional[int] = None, start_offset: Optional[float] = None,
+                       end_offset: Optional[float] = None) -> Dict:
+    """Probe a video's duration with ffprobe (unless already known) and choose the sampling of a segment of it."""
+    duration = _known_durations.get(str(Path(video_path).resolve()))
+    if duration is None:
+        _, duration = get_video_info(video_path)
+    return choose_sampling(duration, budget, start_offset=start_offset, end_offset=end_offset)
@@ -0,0 +1,208 @@
+"""
+Deadline-aware scheduling of per-video jobs.
+
+Jobs run with bounded concurrency under an optional global deadline. Once the
+time left is less than a job is expected to take, no new jobs are started and
+the remaining time goes to finishing the jobs already in flight.
+
+Given a cost estimate per job, the longest jobs are started first, so one large
+video that happens to be discovered last doesn't stretch the run long after the
+short ones have finished.
+"""
+import asyncio
+import statistics
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Assumed before any run has been timed: upload at about 10MB/s, and a second of
+# processing per second of video
+DEFAULT_SECONDS_PER_MB = 0.1
+DEFAULT_SECONDS_PER_VIDEO_SECOND = 1.0
+
+# Used to guess the duration of a video that wasn't probed from its size
+DEFAULT_BIT_RATE = 2_500_000
+
+
+class Deadline:
+    """A point in time by which a run must finish."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        Args:
+            seconds: Time budget from now, or None for no deadline
+        """
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None if there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+class CostModel:
+    """Estimates how long a video takes to process from its size and duration."""
+
+    def __init__(self, seconds_per_mb: float = DEFAULT_SECONDS_PER_MB,
+                 seconds_per_video_second: float = DEFAULT_SECONDS_PER_VIDEO_SECOND):
+        self.seconds_per_mb = seconds_per_mb
+        self.seconds_per_video_second = seconds_per_video_second
+
+    @classmethod
+    def from_history(cls, records: Iterable[Dict], min_samples: int = 3) -> "CostModel":
+        """
+        Fit the processing rate to the results of earlier runs.
+
+        Args:
+            records: Result records; successful ones with elapsed, size_bytes and duration are used
+            min_samples: Fewer usable records than this keep the default rates
+
+        Returns:
+            Cost model with the median seconds of processing per second of video
+        """
+        model = cls()
+        rates = []
+        for record in records:
+            if record.get('status') != 'success' or not all(
+                    record.get(key) for key in ('elapsed', 'size_bytes', 'duration')):
+                continue
+            upload = model.seconds_per_mb * record['size_bytes'] / (1024 * 1024)
+            rates.append(max(record['elapsed'] - upload, 0.0) / record['duration'])
+        if len(rates) >= min_samples:
+            model.seconds_per_video_second = statistics.median(rates)
+        return model
+
+    def estimate(self, size_bytes: int, duration: Optional[float] = None) -> float:
+        """Expected seconds to upload and analyze a video (duration guessed from the size if unknown)."""
+        if duration is None:
+            duration = size_bytes * 8 / DEFAULT_BIT_RATE
+        return self.seconds_per_mb * size_bytes / (1024 * 1024) + self.seconds_per_video_second * duration
+
+
+def min_timeout(*timeouts: Optional[float]) -> Optional[float]:
+    """The tightest of several optional timeouts (None means unlimited)."""
+    limits = [t for t in timeouts if t is not None]
+    return min(limits) if limits else None
+
+
+async def run_started(executor: Optional[Executor], fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a blocking function in an executor, with the timeout counted from when it starts.
+
+    A call queued behind busy threads (e.g. crews still winding down after timing out)
+    doesn't use up its time while it waits. Cancelling a call that hasn't started
+    removes it from the queue.
+
+    Args:
+        executor: Thread pool to run fn in (the loop's default executor if None)
+        fn: Function to run, without arguments
+        timeout: Seconds fn may run once started (None for no limit)
+
+    Raises:
+        asyncio.TimeoutError: fn didn't finish within the timeout (its thread keeps running)
+    """
+    loop = asyncio.get_running_loop()
+    started = asyncio.Event()
+
+    def run():
+        loop.call_soon_threadsafe(started.set)
+        return fn()
+
+    future = loop.run_in_executor(executor, run)
+    try:
+        await started.wait()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    return await asyncio.wait_for(future, timeout)
+
+
+async def schedule(
+    jobs: List[Any],
+    run_job: Callable[[Any, Optional[float]], Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+    reserve: float = 0.0,
+    cooldown: float = 0.0,
+    cost: Optional[Callable[[Any], float]] = None
+) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Run jobs concurrently and yield (job, result) pairs as they complete.
+
+    Jobs are started in list order, or longest first when a cost is given. A job
+    is only started while the time left before the deadline (minus the reserve)
+    exceeds its expected duration: the average duration of the jobs completed so
+    far, or with a cost, its estimate scaled by how long completed jobs actually
+    took compared to theirs. Jobs that are never started are yielded last with a
+    result of None.
+
+    Args:
+        jobs: Jobs to run, in start order
+        run_job: Coroutine function taking a job and the seconds it may use (None if unlimited)
+        max_concurrency: Maximum number of jobs in flight (unbounded if omitted)
+        deadline: Global deadline for all jobs
+        reserve: Seconds to keep free before the deadline, e.g. for aggregation
+        cooldown: Seconds to wait after a job completes before starting another
+        cost: Estimated seconds a job takes; jobs are started in decreasing order of cost (optional)
+
+    Yields:
+        (job, result) for every job
+    """
+    deadline = deadline or Deadline()
+    limit = max_concurrency or max(len(jobs), 1)
+    queue = sorted(jobs, key=cost, reverse=True) if cost else list(jobs)
+    running = {}
+    durations = []
+    estimates = []
+    skipped = []
+
+    try:
+        while queue or running:
+            while queue and len(running) < limit:
+                remaining = deadline.remaining()
+                budget = None if remaining is None else remaining - reserve
+                if not durations:
+                    expected = 0.0
+                elif cost and sum(estimates) > 0:
+                    expected = cost(queue[0]) * sum(durations) / sum(estimates)
+                else:
+                    expected = sum(durations) / len(durations)
+                if budget is not None and budget <= expected:
+                    if cost:
+                        # Longest first: a shorter job further down may still fit
+                        skipped.append(queue.pop(0))
+                        continue
+                    # Not enough time to finish another job: let in-flight jobs use what's left
+                    skipped.extend(queue)
+                    queue.clear()
+                    break
+
+                job = queue.pop(0)
+                task = asyncio.create_task(run_job(job, budget))
+                running[task] = (job, time.monotonic(), cost(job) if cost else 0.0)
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                job, started, estimate = running.pop(task)
+                durations.append(time.monotonic() - started)
+                estimates.append(estimate)
+                yield job, task.result()
+
+            if cooldown and queue:
+                await asyncio.sleep(cooldown)
+    finally:
+        # Cancelled or closed early: don't leave orphaned jobs running
+        for task in running:
+            task.cancel()
+
+    for job in skipped:
+        yield job, None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Test script to verify batch mode against a local stand-in of the Gemini Files and Batches endpoints
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from batch_mode import GeminiBatchRunner, process_batch
+from result_sink import JsonlResultSink
+from scheduler import Deadline
+from tools.gemini_file_manager import close_file_manager, open_file_manager
+
+
+class FakeFiles:
+    def __init__(self):
+        self.uploaded = {}
+        self.deleted = []
+
+    def upload(self, file):
+        if 'broken' in str(file):
+            raise OSError("upload rejected")
+        name = f"files/{len(self.uploaded)}"
+        self.uploaded[name] = file
+        return SimpleNamespace(name=name)
+
+    def get(self, name):
+        return SimpleNamespace(name=name, uri=f"fake://{name}", mime_type='video/mp4',
+                               state=SimpleNamespace(name='ACTIVE'))
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+    def list(self):
+        return []
+
+
+class FakeBatches:
+    """Finishes a job after a couple of polls, answering every request with the project name from its file."""
+
+    def __init__(self, files, polls_until_done=2, fail_index=None):
+        self.files = files
+        self.polls_until_done = polls_until_done
+        self.fail_index = fail_index
+        self.jobs = {}
+        self.cancelled = []
+
+    def create(self, model, src, config=None):
+        self.jobs['batches/1'] = {'requests': src, 'polls': 0}
+        return SimpleNamespace(name='batches/1', state=SimpleNamespace(name='JOB_STATE_PENDING'))
+
+    def get(self, name):
+        job = self.jobs[name]
+        job['polls'] += 1
+        if job['polls'] < self.polls_until_done:
+            return SimpleNamespace(name=name, state=SimpleNamespace(name='JOB_STATE_RUNNING'))
+
+        responses = []
+        for i, request in enumerate(job['requests']):
+            uri = request['contents'][0]['parts'][0]['file_data']['file_uri']
+            video = Path(self.files.uploaded[uri.removeprefix('fake://')])
+            if i == self.fail_index:
+                responses.append(SimpleNamespace(response=None, error=SimpleNamespace(message="quota exceeded")))
+            else:
+                text = f"{video.stem.title()}\n\nDoes things\n\nDev tools\n@unknown\n"
+                responses.append(SimpleNamespace(response=SimpleNamespace(text=text), error=None))
+        return SimpleNamespace(name=name, state=SimpleNamespace(name='JOB_STATE_SUCCEEDED'),
+                               dest=SimpleNamespace(inlined_responses=responses))
+
+    def cancel(self, name):
+        self.cancelled.append(name)
+
+
+def make_client(**kwargs):
+    files = FakeFiles()
+    return SimpleNamespace(files=files, batches=FakeBatches(files, **kwargs))
+
+
+def run_batch(names, client, deadline=None, size=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        video_inputs = []
+        for name in names:
+            path = tmp / name
+            path.write_bytes(b'\x00' * size if size else name.encode() * 100)
+            video_inputs.append({'video_path': str(path), 'video_filename': name, 'video_hash': None})
+
+        sink = JsonlResultSink(tmp / 'results.jsonl')
+        runner = GeminiBatchRunner(client=client, poll_interval=0.01)
+
+        async def collect():
+            return [record async for _, record in process_batch(video_inputs, sink, tmp, runner=runner,
+                                                                     deadline=deadline)]
+
+        records = asyncio.run(collect())
+        return records, sink.latest()
+
+
+def test_batch_results_map_back_to_videos():
+    """Test that each batch response ends up in the sink under its own video"""
+    client = make_client(fail_index=1)
+    records, latest = run_batch(['papertrail.mp4', 'jaiqu.mp4', 'broken.mp4'], client)
+
+    by_file = {r['video_filename']: r for r in records}
+    assert by_file['papertrail.mp4']['status'] == 'success'
+    assert by_file['papertrail.mp4']['summary'].startswith('Papertrail\n')
+    assert by_file['jaiqu.mp4']['status'] == 'error' and 'quota exceeded' in by_file['jaiqu.mp4']['error']
+    assert by_file['broken.mp4']['status'] == 'error' and 'Upload failed' in by_file['broken.mp4']['error']
+    assert len(client.batches.jobs['batches/1']['requests']) == 2
+    assert len(latest) == 3
+    assert sorted(client.files.deleted) == sorted(client.files.uploaded), "uploads deleted after the job"
+    print("✅ SUCCESS: batch responses mapped back to their videos")
+
+
+def test_batch_cancelled_at_deadline():
+    """Test that an unfinished job is cancelled at the deadline and its videos recorded as timeouts"""
+    client = make_client(polls_until_done=1000)
+    records, _ = run_batch(['papertrail.mp4', 'jaiqu.mp4'], client, deadline=Deadline(0.05))
+
+    assert client.batches.cancelled == ['batches/1']
+    assert [r['status'] for r in records] == ['timeout', 'timeout']
+    assert sorted(client.files.deleted) == sorted(client.files.uploaded), "uploads deleted after cancelling"
+    print("✅ SUCCESS: unfinished batch job cancelled at the deadline")
+
+
+def test_batch_uploads_use_the_file_manager():
+    """Test that batch uploads are admitted within the quota without waiting, and cleaned up with the run"""
+    client = make_client()
+    manager = open_file_manager(quota_bytes=2500, high_water_mark=1.0, admission_timeout=60)
+    try:
+        records, _ = run_batch(['a.mp4', 'b.mp4', 'c.mp4'], client, size=1000)
+
+        statuses = sorted(r['status'] for r in records)
+        assert statuses == ['error', 'success', 'success'], statuses
+        assert 'storage quota' in next(r['error'] for r in records if r['status'] == 'error')
+        assert client.files.deleted == [], "released to the manager, which keeps them for the run"
+        assert manager.usage() == 2000
+    finally:
+        close_file_manager()
+    assert len(client.files.deleted) == 2
+    print("✅ SUCCESS: batch uploads managed within the quota")
+
+
+if __name__ == "__main__":
+    test_batch_results_map_back_to_videos()
+    test_batch_cancelled_at_deadline()
+    test_batch_uploads_use_the_file_manager()
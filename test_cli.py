@@ -5,22 +5,29 @@ CLI tool for testing HackReporter video processing
 import argparse
 import sys
 from pathlib import Path
-from crew import process_videos
 import os
-from dotenv import load_dotenv
-import agentops
-import weave
-import asyncio
 
-# Load environment variables
-load_dotenv()
+# Heavy modules (crewai, google-genai, agentops, ...) are imported only once a
+# processing run actually starts, so listing and preflight stay fast.
+# Check with: python -X importtime test_cli.py --list <directory>
 
-# Initialize AgentOps with auto_start_session=False
-AGENTOPS_API_KEY = os.getenv("AGENTOPS_API_KEY", "YOUR_API_KEY")
-agentops.init(api_key=AGENTOPS_API_KEY,
-              auto_start_session=False,
-              tags=["hackathon", "video-processing", "cli"])
-# weave.init('HackReporter')
+
+def load_environment():
+    """Load environment variables from the .env file."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def init_telemetry():
+    """Initialize AgentOps with auto_start_session=False and return the module."""
+    import agentops
+
+    AGENTOPS_API_KEY = os.getenv("AGENTOPS_API_KEY", "YOUR_API_KEY")
+    agentops.init(api_key=AGENTOPS_API_KEY,
+                  auto_start_session=False,
+                  tags=["hackathon", "video-processing", "cli"])
+    # import weave; weave.init('HackReporter')
+    return agentops
 
 
 def main():
@@ -35,12 +42,125 @@ def main():
     parser.add_argument('--list', '-l',
                         action='store_true',
                         help='List videos in directory without processing')
+    parser.add_argument('--preflight', '-p',
+                        action='store_true',
+                        help='Check the environment and probe every video with ffprobe without processing')
+    parser.add_argument('--no-preflight',
+                        action='store_true',
+                        help="Don't probe the videos with ffprobe before processing (corrupt files fail later)")
     parser.add_argument('--url', '-u',
                         help='URL of hackathon project gallery (e.g., devpost) to scrape for team information',
                         default=None)
+    parser.add_argument('--watch', '-w',
+                        action='store_true',
+                        help='Keep watching the directory and process new videos as they arrive')
+    parser.add_argument('--incremental', '-i',
+                        action='store_true',
+                        help='Score only new projects, insert them into the existing ranking and publish a new Typefully draft')
+    parser.add_argument('--fingerprint',
+                        action='store_true',
+                        help='Also skip re-encoded copies of the same video (perceptual fingerprint, needs ffmpeg)')
+    parser.add_argument('--recursive', '-r',
+                        action='store_true',
+                        help='Also look for videos in subdirectories')
+    parser.add_argument('--include',
+                        action='append',
+                        default=None,
+                        help='Only process files matching this glob pattern (repeatable)')
+    parser.add_argument('--exclude',
+                        action='append',
+                        default=None,
+                        help='Skip files or directories matching this glob pattern (repeatable, default: hidden files)')
+    parser.add_argument('--sniff',
+                        action='store_true',
+                        help='Detect videos by their container bytes, not just by file extension')
+    parser.add_argument('--timeout',
+                        type=float,
+                        default=3600,
+                        help='Deadline for the whole run, or watch session, in seconds (default: 3600)')
+    parser.add_argument('--video-timeout',
+                        type=float,
+                        default=None,
+                        help='Maximum seconds to spend on a single video (default: no limit)')
+    parser.add_argument('--concurrency', '-c',
+                        type=int,
+                        default=None,
+                        help='Maximum number of videos processed at once (default: CPUs + 4, at most 32)')
+    parser.add_argument('--in-order',
+                        action='store_true',
+                        help='Start videos in discovery order instead of longest first')
+    parser.add_argument('--no-partial',
+                        action='store_true',
+                        help="On Ctrl+C, don't aggregate the videos completed so far")
+    parser.add_argument('--tiered', '-t',
+                        action='store_true',
+                        help='Triage every video with a cheap pass and fully analyze only the most promising')
+    parser.add_argument('--deep-top-k',
+                        type=int,
+                        default=10,
+                        help='With --tiered, number of top videos that get the full analysis (default: 10)')
+    parser.add_argument('--cache-prompt',
+                        action='store_true',
+                        help='Cache the shared analysis instructions in Gemini for the duration of the run')
+    parser.add_argument('--batch',
+                        action='store_true',
+                        help='Analyze all videos in one Gemini batch job (cheapest, but can take hours)')
+    parser.add_argument('--processes',
+                        action='store_true',
+                        help="Run each video's crew in a worker process (pool size: --concurrency, default one per CPU)")
+    parser.add_argument('--coordinator',
+                        metavar='QUEUE',
+                        help='Enqueue the videos in a shared SQLite queue file for workers, then aggregate')
+    parser.add_argument('--worker',
+                        metavar='QUEUE',
+                        help='Process jobs from a shared SQLite queue file until it is finished')
+    parser.add_argument('--polish',
+                        action='store_true',
+                        help='Let the LLM polish project descriptions before the thread is rendered')
+    parser.add_argument('--share',
+                        action='store_true',
+                        help='Ask Typefully for a shareable link to the thread draft')
+    parser.add_argument('--project-drafts',
+                        action='store_true',
+                        help='Also create a separate Typefully draft for every project (not with --incremental)')
+    parser.add_argument('--search',
+                        metavar='QUERY',
+                        help='Search projects from past events in the project history and exit')
+    parser.add_argument('--event',
+                        help='Event name for the project history (default: the directory name)')
+    parser.add_argument('--reuse-history',
+                        action='store_true',
+                        help='Reuse past analyses of videos already in the project history')
+    parser.add_argument('--settle',
+                        type=float,
+                        default=10.0,
+                        help='Seconds a file must stop growing before watch mode processes it (default: 10)')
+    parser.add_argument('--quiet', '-q',
+                        action='store_true',
+                        help='Production mode: only log warnings and errors, and turn off verbose agent output')
+    parser.add_argument('--log-format',
+                        choices=['text', 'json'],
+                        default=None,
+                        help='Log as plain text or as JSON lines (default: text, or HACKREPORTER_LOG_FORMAT)')
+    parser.add_argument('--log-level',
+                        default=None,
+                        help='Log level, e.g. DEBUG for per-video details (default: INFO, WARNING with --quiet)')
 
     args = parser.parse_args()
 
+    from logging_config import configure_logging
+    configure_logging(level=args.log_level, log_format=args.log_format, quiet=args.quiet or None)
+
+    if args.search:
+        from history_store import ProjectHistory, format_entry
+
+        history = ProjectHistory()
+        matches = history.search(args.search)
+        print(f"🔍 {len(matches)} project(s) matching '{args.search}' in {history.path}:")
+        for entry in matches:
+            print(f"   - {format_entry(entry)}")
+        return
+
     # Validate directory
     video_dir = Path(args.directory)
     if not video_dir.exists():
@@ -51,26 +171,52 @@ def main():
         print(f"❌ Error: '{args.directory}' is not a directory")
         sys.exit(1)
 
+    if args.worker:
+        # Workers take their videos from the queue, not from the directory listing
+        load_environment()
+        import asyncio
+        from distributed import run_worker
+        from scheduler import Deadline
+
+        agentops = init_telemetry()
+        stats = asyncio.run(run_worker(
+            args.worker,
+            max_concurrency=args.concurrency or 1,
+            video_timeout=args.video_timeout,
+            deadline=Deadline(args.timeout),
+            context_cache=args.cache_prompt
+        ))
+        print(f"\n📊 Worker {stats['worker_id']}: {stats['acknowledged']} job(s) done, {stats['failed']} failed")
+        agentops.end_all_sessions()
+        return
+
     # Find video files
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
-    video_files = []
-    for ext in video_extensions:
-        video_files.extend(video_dir.glob(f'*{ext}'))
-        video_files.extend(video_dir.glob(f'*{ext.upper()}'))
+    from discovery import discover_videos
+    videos = discover_videos(
+        str(video_dir),
+        recursive=args.recursive,
+        include=args.include,
+        exclude=args.exclude,
+        sniff=args.sniff
+    )
+    video_files = [video['path'] for video in videos]
 
-    if not video_files:
+    if not video_files and not args.watch:
         print(f"❌ No video files found in '{args.directory}'")
         sys.exit(1)
 
-    print(f"📹 Found {len(video_files)} video(s) in '{args.directory}':")
-    for vf in sorted(video_files):
-        size_mb = vf.stat().st_size / (1024 * 1024)
-        print(f"   - {vf.name} ({size_mb:.1f}MB)")
+    print(f"📹 Found {len(video_files)} video(s) in '{args.directory}'" + ("" if args.quiet and not args.list else ":"))
+    if args.list or not args.quiet:
+        for video in videos:
+            size_mb = video['size'] / (1024 * 1024)
+            print(f"   - {video['path'].relative_to(video_dir)} ({size_mb:.1f}MB)")
 
     if args.list:
         # Just list files and exit
         return
 
+    load_environment()
+
     # Check for required environment variables
     required_vars = ['GOOGLE_API_KEY', 'OPENAI_API_KEY']
     missing_vars = [var for var in required_vars if not os.getenv(var)]
@@ -79,6 +225,20 @@ def main():
         print(f"\n⚠️  Warning: Missing environment variables: {', '.join(missing_vars)}")
         print("Make sure to set these in your .env file")
 
+    if args.preflight:
+        # Probe the videos the way a run would, without remuxing anything
+        import asyncio
+        from preflight import preflight_summary, preflight_videos
+
+        checked = asyncio.run(preflight_videos(video_files, repair=False))
+        for entry in checked:
+            if entry['status'] != 'ok':
+                print(f"  {entry['status']:>10}  {entry['path'].name}" +
+                      (f" ({entry['reason']})" if entry['reason'] else ""))
+        print(f"\n🩺 Preflight: {preflight_summary(checked)}")
+        rejected = any(entry['status'] == 'rejected' for entry in checked)
+        sys.exit(1 if missing_vars or rejected else 0)
+
     # Prompt to continue
     print(f"\n🚀 Ready to process {len(video_files)} video(s)")
 
@@ -86,6 +246,45 @@ def main():
     print("Starting HackReporter crew...")
     print("="*50 + "\n")
 
+    import asyncio
+
+    agentops = init_telemetry()
+
+    if args.watch:
+        from watcher import watch_videos
+
+        from scheduler import Deadline
+
+        # Runs until Ctrl+C or the deadline, then aggregates everything processed while
+        # watching. Every batch is processed with the same options as a one-off run.
+        results = asyncio.run(watch_videos(
+            directory=str(video_dir),
+            attendee_list=args.attendees,
+            project_gallery_url=args.url,
+            settle_seconds=args.settle,
+            incremental=args.incremental,
+            deadline=Deadline(args.timeout),
+            polish=args.polish,
+            share=args.share,
+            project_drafts=args.project_drafts,
+            fingerprint=args.fingerprint,
+            max_concurrency=args.concurrency,
+            video_timeout=args.video_timeout,
+            aggregate_partial=not args.no_partial,
+            tiered=args.tiered,
+            deep_top_k=args.deep_top_k,
+            context_cache=args.cache_prompt,
+            batch=args.batch,
+            processes=args.processes,
+            event=args.event,
+            reuse_history=args.reuse_history,
+            preflight=not args.no_preflight,
+            longest_first=not args.in_order
+        ))
+        print(f"\n📊 Processed {results['processed_videos']} videos while watching")
+        agentops.end_all_sessions()
+        return
+
     # Start AgentOps trace
     tracer = None
     try:
@@ -94,29 +293,64 @@ def main():
             tags=["cli", "video-processing", str(video_dir)]
         )
 
-        # Process videos with a timeout
-        import signal
+        # The run has a global deadline; each video can also have its own timeout
+        from scheduler import Deadline
 
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Crew execution timed out after 1 hour")
+        if args.coordinator:
+            # Workers on other machines process the videos; deadline, partial results
+            # and errors are handled like a local run's
+            from distributed import coordinate
 
-        # Set a 15-minute timeout
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(3600)  # 1 hour
+            results = asyncio.run(coordinate(
+                str(video_dir),
+                args.coordinator,
+                video_files=video_files,
+                attendee_list=args.attendees,
+                project_gallery_url=args.url,
+                fingerprint=args.fingerprint,
+                incremental=args.incremental,
+                deadline=Deadline(args.timeout),
+                aggregate_partial=not args.no_partial,
+                preflight=not args.no_preflight,
+                polish=args.polish,
+                share=args.share,
+                project_drafts=args.project_drafts,
+                event=args.event
+            ))
+        else:
+            from crew import process_videos
 
-        try:
             results = asyncio.run(process_videos(
                 directory=str(video_dir),
+                video_files=video_files,
                 attendee_list=args.attendees,
-                project_gallery_url=args.url
+                project_gallery_url=args.url,
+                incremental=args.incremental,
+                fingerprint=args.fingerprint,
+                max_concurrency=args.concurrency,
+                video_timeout=args.video_timeout,
+                deadline=Deadline(args.timeout),
+                aggregate_partial=not args.no_partial,
+                tiered=args.tiered,
+                deep_top_k=args.deep_top_k,
+                context_cache=args.cache_prompt,
+                batch=args.batch,
+                processes=args.processes,
+                event=args.event,
+                reuse_history=args.reuse_history,
+                polish=args.polish,
+                share=args.share,
+                project_drafts=args.project_drafts,
+                preflight=not args.no_preflight,
+                longest_first=not args.in_order
             ))
-        finally:
-            # Cancel the alarm
-            signal.alarm(0)
 
         # Display results
         print("\n" + "="*50)
-        print("✅ Processing Complete!")
+        if results.get('interrupted'):
+            print("⚠️  Processing Interrupted - partial results saved")
+        else:
+            print("✅ Processing Complete!")
         print("="*50 + "\n")
 
         if "error" in results:
@@ -125,6 +359,12 @@ def main():
                 agentops.end_trace(tracer, end_state="Fail")
         else:
             print(f"📊 Processed {results['processed_videos']} videos")
+            if results.get('skipped_videos'):
+                print(f"⏭️  {len(results['skipped_videos'])} video(s) not started before the deadline")
+            if results.get('rejected_videos'):
+                print(f"🚫 {len(results['rejected_videos'])} unusable video(s) rejected, see output/preflight.json")
+            if results.get('missing_videos'):
+                print(f"⚠️  {len(results['missing_videos'])} video(s) missing, see output/run_report.json")
             print(f"\n📝 Output saved to: output/tweet_thread.md")
 
             # Show a preview of the output if it exists
@@ -140,18 +380,18 @@ def main():
                 print(preview)
 
             if tracer:
-                agentops.end_trace(tracer, end_state="Success")
+                agentops.end_trace(tracer, end_state="Cancelled" if results.get('interrupted') else "Success")
 
     except KeyboardInterrupt:
+        # Only reached on a second Ctrl+C, e.g. while the partial results are being aggregated
         print("\n\n⚠️  Processing interrupted by user")
+        print("Completed videos are saved in output/results.jsonl")
         if tracer:
             agentops.end_trace(tracer, end_state="Cancelled")
         sys.exit(1)
-    except TimeoutError as e:
-        print(f"\n⏱️  {str(e)}")
-        print("The crew is taking too long. This often happens when:")
-        print("- The agent is not iterating through all videos properly")
-        print("- There's an issue with context passing between tasks")
+    except TimeoutError:
+        print(f"\n⏱️  Run deadline of {args.timeout:.0f}s reached")
+        print("Aggregation did not finish before the deadline. Try a larger --timeout.")
         if tracer:
             agentops.end_trace(tracer, end_state="Timeout")
         sys.exit(1)
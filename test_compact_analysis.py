@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Test script to verify compact structured analyses: the agent gets a few fields, the transcript goes to disk
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from tools.compact_analysis import COMPACT_PROMPT, COMPACT_SCHEMA, cached_instructions, format_compact, load_team_members
+from tools.gemini_prompt_cache import MIN_CACHE_TOKENS, PromptCache, estimate_text_tokens
+
+RESPONSE = {
+    'name': 'PaperTrail',
+    'description': 'Turns receipts into expense reports automatically.',
+    'tagline': 'Expenses on autopilot',
+    'team_members': ['Ada Lovelace', 'Alan Turing'],
+    'highlights': ['OCR on crumpled receipts', 'one-click export'],
+    'transcript': '[00:00] Hi, we built PaperTrail. ' * 200,
+}
+
+
+def test_compact_output_references_the_transcript():
+    """Test that the agent sees the pipeline's fields plus a path, and the transcript is saved in full"""
+    with tempfile.TemporaryDirectory() as tmp:
+        analysis_dir = Path(tmp) / 'analyses'
+        output = format_compact(json.dumps(RESPONSE), '/videos/demo.mp4', transcript_dir=Path(tmp),
+                                analysis_dir=analysis_dir)
+        lines = output.splitlines()
+
+        assert lines[:3] == ['Project Name: PaperTrail',
+                             'Description: Turns receipts into expense reports automatically.',
+                             'Tagline: Expenses on autopilot']
+        assert 'Team Members: Ada Lovelace, Alan Turing' in lines
+        transcript_path = Path(lines[-1].split('Transcript: ', 1)[1])
+        assert transcript_path.parent == Path(tmp) and transcript_path.name.startswith('demo_')
+        assert transcript_path.read_text() == RESPONSE['transcript']
+        assert len(output) * 10 < len(json.dumps(RESPONSE)), "the agent's input shrinks by an order of magnitude"
+
+        # The team is kept for the project history, the transcript isn't duplicated
+        assert load_team_members('/videos/demo.mp4', analysis_dir=analysis_dir) == ['Ada Lovelace', 'Alan Turing']
+        assert load_team_members('/videos/demo.mp4', since=time.time() + 60, analysis_dir=analysis_dir) == []
+        assert load_team_members('/videos/other.mp4', analysis_dir=analysis_dir) == []
+        assert 'transcript' not in json.loads(next(analysis_dir.iterdir()).read_text())
+    print("✅ SUCCESS: compact analysis formatted and transcript saved")
+
+
+def test_unexpected_responses_pass_through():
+    """Test that a response that isn't the expected JSON is returned unchanged"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for text in ['Project Name: PaperTrail\nA free-form answer', '[]', '{"description": "no name"}']:
+            assert format_compact(text, 'demo.mp4', transcript_dir=Path(tmp), analysis_dir=Path(tmp)) == text
+        assert not list(Path(tmp).iterdir())
+    assert set(COMPACT_SCHEMA['required']) == {'name', 'description', 'tagline'}
+    print("✅ SUCCESS: unexpected responses passed through unchanged")
+
+
+def test_cached_instructions_clear_the_cache_minimum():
+    """Test that the compact instructions are large enough to cache and short ones are never sent to Gemini"""
+    instructions = cached_instructions(COMPACT_PROMPT)
+    assert instructions.startswith(COMPACT_PROMPT) and '"transcript"' in instructions
+    assert estimate_text_tokens(instructions) >= MIN_CACHE_TOKENS
+    assert cached_instructions('Describe this video.') == 'Describe this video.'
+
+    # A block below the minimum is sized locally and remembered: the client is never called
+    cache = PromptCache()
+    assert cache.lookup(None, 'gemini-2.0-flash', 'Describe this video.') is None
+    assert cache.lookup(None, 'gemini-2.0-flash', 'Describe this video.') is None
+    print("✅ SUCCESS: cached instructions clear the minimum, short prompts stay inline")
+
+
+if __name__ == "__main__":
+    test_compact_output_references_the_transcript()
+    test_unexpected_responses_pass_through()
+    test_cached_instructions_clear_the_cache_minimum()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Test script to verify duplicate detection: same file, identical content and fingerprint matching
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from dedup import find_duplicates, fingerprint_distance
+from result_sink import hash_file
+
+
+def make_video(tmp, name, content):
+    path = Path(tmp) / name
+    path.write_bytes(content)
+    return path
+
+
+def test_same_file_listed_twice():
+    """Test that hard links and symlinks are reported as the same file, and a repeated path is dropped silently"""
+    with tempfile.TemporaryDirectory() as tmp:
+        demo = make_video(tmp, 'demo.mp4', b'demo video')
+        hard_link = Path(tmp) / 'demo-link.mp4'
+        os.link(demo, hard_link)
+        symlink = Path(tmp) / 'demo-symlink.mp4'
+        symlink.symlink_to(demo)
+
+        result = find_duplicates([demo, demo, hard_link, symlink])
+
+        assert result['unique'] == [demo]
+        assert [(d['path'], d['canonical'], d['match']) for d in result['duplicates']] == [
+            (hard_link, demo, 'same_file'), (symlink, demo, 'same_file')
+        ]
+        assert result['hashes'] == {}, "a single remaining file is never hashed"
+    print("✅ SUCCESS: same file detected by device and inode")
+
+
+def test_identical_copies():
+    """Test that byte-identical copies are skipped and files of other sizes are never hashed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = make_video(tmp, 'a.mp4', b'x' * 100)
+        copy = make_video(tmp, 'b.mp4', b'x' * 100)
+        same_size = make_video(tmp, 'c.mp4', b'y' * 100)
+        other = make_video(tmp, 'd.mp4', b'z' * 50)
+
+        result = find_duplicates([first, copy, same_size, other])
+
+        assert result['unique'] == [first, same_size, other], "input order is kept"
+        assert [(d['path'], d['canonical'], d['match']) for d in result['duplicates']] == [(copy, first, 'content')]
+        assert result['hashes'] == {str(first): hash_file(str(first)), str(same_size): hash_file(str(same_size))}
+        assert str(other) not in result['hashes']
+    print("✅ SUCCESS: identical copies detected by content hash")
+
+
+def test_fingerprint_without_ffmpeg():
+    """Test that fingerprinting without ffmpeg keeps every video instead of failing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = [make_video(tmp, 'a.mp4', b'a' * 10), make_video(tmp, 'b.webm', b'b' * 20)]
+        path = os.environ.get('PATH', '')
+        os.environ['PATH'] = tmp
+        try:
+            result = find_duplicates(videos, fingerprint=True)
+        finally:
+            os.environ['PATH'] = path
+
+        assert result['unique'] == videos
+        assert result['duplicates'] == []
+    print("✅ SUCCESS: fingerprinting skipped without ffmpeg")
+
+
+def test_fingerprint_distance():
+    """Test that fingerprints only match for videos of about the same length"""
+    a = {'duration': 100.0, 'frames': [0b1111, 0, 2 ** 64 - 1]}
+    b = {'duration': 101.0, 'frames': [0b0111, 0, 2 ** 64 - 1]}
+    assert fingerprint_distance(a, b) == 1 / 3
+    assert fingerprint_distance(a, dict(b, duration=110.0)) is None
+    print("✅ SUCCESS: fingerprint distance computed")
+
+
+if __name__ == "__main__":
+    test_same_file_listed_twice()
+    test_identical_copies()
+    test_fingerprint_without_ffmpeg()
+    test_fingerprint_distance()
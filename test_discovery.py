@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Test script to verify video discovery: recursion, include/exclude patterns, hidden files and container sniffing
+"""
+import tempfile
+from pathlib import Path
+
+from discovery import discover_videos, mime_type_for, sniff_mime_type
+
+# Minimal headers of each container sniff_mime_type recognizes
+HEADERS = {
+    'mp4': b'\x00\x00\x00\x18ftypisom\x00\x00\x02\x00',
+    'mov': b'\x00\x00\x00\x14ftypqt  \x00\x00\x02\x00',
+    '3gp': b'\x00\x00\x00\x14ftyp3gp5\x00\x00\x02\x00',
+    'webm': b'\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01\x42\x82\x84webm',
+    'mkv': b'\x1a\x45\xdf\xa3\xa3\x42\x86\x81\x01\x42\x82\x88matroska',
+    'avi': b'RIFF\x00\x10\x00\x00AVI LIST',
+    'flv': b'FLV\x01\x05\x00\x00\x00\x09',
+    'wmv': b'\x30\x26\xb2\x75\x8e\x66\xcf\x11\xa6\xd9\x00\xaa\x00\x62\xce\x6c',
+    'mpeg': b'\x00\x00\x01\xba\x44\x00\x04\x00\x04\x01',
+}
+
+
+def make_tree(tmp, files):
+    for relative, content in files.items():
+        path = Path(tmp) / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def names(videos, tmp):
+    return [video['path'].relative_to(tmp).as_posix() for video in videos]
+
+
+def test_recursive_discovery():
+    """Test that subdirectories are only searched when asked, and results come sorted with their metadata"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, {'b.mp4': b'12345', 'a.MOV': b'1', 'notes.txt': b'', 'day2/c.webm': b'12', 'day2/x/d.mkv': b''})
+
+        assert names(discover_videos(tmp), tmp) == ['a.MOV', 'b.mp4']
+        videos = discover_videos(tmp, recursive=True)
+        assert names(videos, tmp) == ['a.MOV', 'b.mp4', 'day2/c.webm', 'day2/x/d.mkv']
+        assert videos[1]['size'] == 5 and videos[1]['mime_type'] == 'video/mp4'
+        assert videos[0]['mime_type'] == mime_type_for('a.MOV') == 'video/mov'
+    print("✅ SUCCESS: videos found in subdirectories")
+
+
+def test_include_and_exclude():
+    """Test that include and exclude patterns match file names and relative paths, and exclude whole directories"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, {'final.mp4': b'', 'draft.mp4': b'', 'team1/final.mov': b'', 'raw/final.mp4': b''})
+
+        assert names(discover_videos(tmp, recursive=True, include=['final.*']), tmp) == [
+            'final.mp4', 'raw/final.mp4', 'team1/final.mov'
+        ]
+        assert names(discover_videos(tmp, recursive=True, include=['team1/*']), tmp) == ['team1/final.mov']
+        assert names(discover_videos(tmp, recursive=True, exclude=['raw', 'draft*']), tmp) == [
+            'final.mp4', 'team1/final.mov'
+        ]
+    print("✅ SUCCESS: include and exclude patterns applied")
+
+
+def test_hidden_files():
+    """Test that hidden files and directories, such as macOS AppleDouble files, are skipped unless exclude is overridden"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, {'demo.mp4': b'', '._demo.mp4': b'', '.trash/old.mp4': b''})
+
+        assert names(discover_videos(tmp, recursive=True), tmp) == ['demo.mp4']
+        assert names(discover_videos(tmp, recursive=True, exclude=[]), tmp) == [
+            '._demo.mp4', '.trash/old.mp4', 'demo.mp4'
+        ]
+    print("✅ SUCCESS: hidden files skipped")
+
+
+def test_sniffing():
+    """Test that every supported container is recognized by its magic bytes"""
+    expected = {
+        'mp4': 'video/mp4', 'mov': 'video/mov', '3gp': 'video/3gpp', 'webm': 'video/webm',
+        'mkv': 'video/x-matroska', 'avi': 'video/avi', 'flv': 'video/x-flv', 'wmv': 'video/wmv',
+        'mpeg': 'video/mpeg',
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for container, header in HEADERS.items():
+            path = Path(tmp) / f"{container}.bin"
+            path.write_bytes(header)
+            assert sniff_mime_type(str(path)) == expected[container], container
+
+        make_tree(tmp, {'notes.txt': b'just text', 'renamed.mp4': HEADERS['webm']})
+        assert sniff_mime_type(str(Path(tmp) / 'notes.txt')) is None
+        assert sniff_mime_type(str(Path(tmp) / 'missing.mp4')) is None
+
+        # Files without a video extension are only found by sniffing, and the sniffed type wins
+        assert names(discover_videos(tmp), tmp) == ['renamed.mp4']
+        videos = {video['path'].name: video['mime_type'] for video in discover_videos(tmp, sniff=True)}
+        assert videos == {**{f"{c}.bin": expected[c] for c in HEADERS}, 'renamed.mp4': 'video/webm'}
+    print("✅ SUCCESS: containers identified by magic bytes")
+
+
+if __name__ == "__main__":
+    test_recursive_discovery()
+    test_include_and_exclude()
+    test_hidden_files()
+    test_sniffing()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Test script to verify the Gemini file manager: upload reuse, LRU eviction, quota admission and cleanup
+"""
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from tools.gemini_file_manager import FileQuotaError, GeminiFileManager, uploaded_video
+
+
+class FakeFiles:
+    """Stand-in for client.files that records uploads and deletions."""
+
+    def __init__(self, external=()):
+        self.uploaded = []
+        self.deleted = []
+        self.external = list(external)
+
+    def upload(self, file):
+        name = f"files/{Path(file).stem}-{len(self.uploaded)}"
+        self.uploaded.append(name)
+        return SimpleNamespace(name=name)
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+    def list(self):
+        return self.external
+
+
+def make_videos(tmp, sizes):
+    paths = {}
+    for name, size in sizes.items():
+        paths[name] = Path(tmp) / f"{name}.mp4"
+        paths[name].write_bytes(b'\x00' * size)
+    return {name: str(path) for name, path in paths.items()}
+
+
+def test_uploads_are_reused_and_cleaned_up():
+    """Test that a video acquired twice is uploaded once and deleted when the manager closes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = make_videos(tmp, {'demo': 1000})
+        client = SimpleNamespace(files=FakeFiles())
+        manager = GeminiFileManager(quota_bytes=10_000, high_water_mark=1.0)
+
+        first = manager.acquire(client, videos['demo'])
+        manager.release(first)
+        second = manager.acquire(client, videos['demo'])
+        manager.release(second)
+
+        assert first == second
+        assert client.files.uploaded == [first]
+        manager.close()
+        assert client.files.deleted == [first]
+    print("✅ SUCCESS: uploads reused within a run and deleted at the end")
+
+
+def test_least_recently_used_file_is_evicted():
+    """Test that an upload over the quota evicts the least recently used idle file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = make_videos(tmp, {'a': 400, 'b': 400, 'c': 400})
+        client = SimpleNamespace(files=FakeFiles(external=[SimpleNamespace(name='files/other', size_bytes=150)]))
+        manager = GeminiFileManager(quota_bytes=1000, high_water_mark=1.0)
+
+        a = manager.acquire(client, videos['a'])
+        b = manager.acquire(client, videos['b'])
+        manager.release(b)
+        manager.release(a)  # a is now the most recently used
+
+        c = manager.acquire(client, videos['c'])
+        assert client.files.deleted == [b], "files uploaded by others are never evicted"
+        assert manager.usage() == 400 + 400 + 150
+        manager.release(c)
+        assert manager.stats['evicted'] == 1
+
+        try:
+            manager.acquire(client, make_videos(tmp, {'huge': 2000})['huge'])
+        except FileQuotaError:
+            pass
+        else:
+            raise AssertionError("a video larger than the quota should be rejected")
+    print("✅ SUCCESS: least recently used file evicted to make room")
+
+
+def test_eviction_deletes_outside_the_lock():
+    """Test that the delete call of an eviction doesn't block other threads, while its space stays counted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = make_videos(tmp, {'a': 600, 'b': 600})
+        manager = GeminiFileManager(quota_bytes=1000, high_water_mark=1.0)
+        during_delete = []
+
+        class CheckedFiles(FakeFiles):
+            def delete(self, name):
+                def check():
+                    with manager._condition:
+                        during_delete.append(manager.usage())
+                checker = threading.Thread(target=check)
+                checker.start()
+                checker.join(timeout=2)
+                super().delete(name)
+
+        client = SimpleNamespace(files=CheckedFiles())
+        manager.release(manager.acquire(client, videos['a']))
+        manager.acquire(client, videos['b'])
+        assert during_delete == [600], "another thread got the lock and saw the file still counted"
+        assert manager.usage() == 600 and manager.stats['evicted'] == 1
+    print("✅ SUCCESS: evicted file deleted outside the lock")
+
+
+def test_admission_waits_for_space():
+    """Test that an upload waits while every file is in use instead of failing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = make_videos(tmp, {'a': 600, 'b': 600})
+        client = SimpleNamespace(files=FakeFiles())
+        manager = GeminiFileManager(quota_bytes=1000, high_water_mark=1.0, admission_timeout=5, poll_interval=0.05)
+
+        a = manager.acquire(client, videos['a'])
+        acquired = {}
+        waiter = threading.Thread(target=lambda: acquired.update(b=manager.acquire(client, videos['b'])))
+        waiter.start()
+
+        time.sleep(0.2)
+        assert 'b' not in acquired, "b was admitted while a was in use"
+        manager.release(a)
+        waiter.join(timeout=2)
+
+        assert acquired['b'] == client.files.uploaded[1]
+        assert client.files.deleted == [a]
+        assert manager.stats['waited'] > 0.1
+
+        impatient = GeminiFileManager(quota_bytes=1000, high_water_mark=1.0, admission_timeout=0.1,
+                                      poll_interval=0.05)
+        impatient.acquire(client, videos['a'])
+        try:
+            impatient.acquire(client, videos['b'])
+        except FileQuotaError:
+            pass
+        else:
+            raise AssertionError("admission should time out while the quota is full")
+    print("✅ SUCCESS: uploads wait for space in the quota")
+
+
+def test_unmanaged_upload_is_deleted_after_use():
+    """Test that without an open manager, the tool's upload is deleted after the analysis"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = make_videos(tmp, {'demo': 1000})
+        client = SimpleNamespace(files=FakeFiles())
+        with uploaded_video(client, videos['demo']) as name:
+            assert client.files.deleted == []
+        assert client.files.deleted == [name]
+    print("✅ SUCCESS: unmanaged uploads deleted after use")
+
+
+if __name__ == "__main__":
+    test_uploads_are_reused_and_cleaned_up()
+    test_least_recently_used_file_is_evicted()
+    test_eviction_deletes_outside_the_lock()
+    test_admission_waits_for_space()
+    test_unmanaged_upload_is_deleted_after_use()
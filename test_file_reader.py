@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Test script to verify ranged reads, truncation and JSON-path selection in FileReaderTool
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# The default cap is read when the tool is imported
+os.environ['FILE_READER_MAX_BYTES'] = '200'
+
+from tools.file_reader_tool import DEFAULT_MAX_BYTES, FileReaderTool, select_json  # noqa: E402
+
+PROJECTS = {'projects': [
+    {'name': 'Papertrail', 'summary': 'Audit logs for agents', 'handles': ['@alice']},
+    {'name': 'Jaiqu', 'summary': 'JSON transforms', 'handles': []},
+    {'name': 'Über', 'summary': 'Ünïcode names', 'handles': ['@bob']},
+]}
+
+
+def write_files(tmp):
+    lines = tmp / 'lines.txt'
+    lines.write_text(''.join(f"line {i:03d}\n" for i in range(1, 101)), encoding='utf-8')
+    projects = tmp / 'projects.json'
+    projects.write_text(json.dumps(PROJECTS), encoding='utf-8')
+    return lines, projects
+
+
+def test_byte_and_line_ranges():
+    """Test that byte and line ranges return exactly the requested part of a file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        lines, _ = write_files(Path(tmp))
+        tool = FileReaderTool()
+
+        assert tool._run(str(lines), start_line=3, end_line=5) == "line 003\nline 004\nline 005\n"
+        assert tool._run(str(lines), start_line=100) == "line 100\n"
+        # Every line is 9 bytes
+        assert tool._run(str(lines), start_byte=18, end_byte=27) == "line 003\n"
+        assert tool._run(str(lines), end_byte=4) == "line"
+
+        # A multi-byte character isn't split where the output is cut
+        accents = Path(tmp) / 'accents.txt'
+        accents.write_text('aé' * 10, encoding='utf-8')
+        assert tool._run(str(accents), max_bytes=5) == (
+            "aéa\n\n[... truncated: returned bytes 0-4 of 30. Continue with start_byte=4 ...]")
+    print("✅ SUCCESS: byte and line ranges read")
+
+
+def test_truncation_marker():
+    """Test that output over FILE_READER_MAX_BYTES ends with a marker saying how to continue"""
+    assert DEFAULT_MAX_BYTES == 200
+    with tempfile.TemporaryDirectory() as tmp:
+        lines, _ = write_files(Path(tmp))
+        tool = FileReaderTool()
+
+        whole = tool._run(str(lines))
+        assert whole.startswith("line 001\n")
+        assert whole.endswith("[... truncated: returned bytes 0-200 of 900. Continue with start_byte=200 ...]"), whole
+        rest = tool._run(str(lines), start_byte=200)
+        assert rest.startswith("ne 023\nline 024\n")
+
+        by_line = tool._run(str(lines), start_line=1)
+        assert by_line.endswith("[... truncated: returned lines 1-22 of a 900 byte file. Continue with start_line=23 ...]")
+
+        # An explicit max_bytes overrides the default
+        assert 'returned bytes 0-18 of 900' in tool._run(str(lines), max_bytes=18)
+    print("✅ SUCCESS: truncation marker points at the rest of the file")
+
+
+def test_json_path_selection():
+    """Test that json_path returns only the selected values, and truncates large selections"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _, projects = write_files(Path(tmp))
+        tool = FileReaderTool()
+
+        assert json.loads(tool._run(str(projects), json_path='$.projects[0].name')) == 'Papertrail'
+        assert json.loads(tool._run(str(projects), json_path='projects[*].name')) == ['Papertrail', 'Jaiqu', 'Über']
+        assert json.loads(tool._run(str(projects), json_path="$['projects'][-1].handles")) == ['@bob']
+        assert tool._run(str(projects), json_path='$.teams') == "No values found at '$.teams'"
+        assert tool._run(str(projects), json_path='$.projects{0}').startswith('Error reading file: Unsupported JSONPath')
+
+        truncated = tool._run(str(projects), json_path='$.projects')
+        assert "Select a narrower json_path, e.g. '$.projects[0]'" in truncated
+
+    assert select_json(PROJECTS, '$.projects[*].handles[0]') == ['@alice', '@bob']
+    print("✅ SUCCESS: JSON paths selected")
+
+
+if __name__ == "__main__":
+    test_byte_and_line_ranges()
+    test_truncation_marker()
+    test_json_path_selection()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Test script to verify which analyses the project history keeps and reuses
+"""
+import tempfile
+from pathlib import Path
+
+from history_store import ProjectHistory
+
+
+def make_record(video_hash, summary, status='success'):
+    return {'video_hash': video_hash, 'video_filename': f"{video_hash}.mp4", 'status': status, 'summary': summary}
+
+
+def test_team_comes_from_the_analysis():
+    """Test that the team is the names found by the analysis, and never a copy of the handles"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ProjectHistory(Path(tmp) / 'history.db')
+        record = dict(make_record('a1', "Papertrail\n\nAudit logs for agents\n\nDev tools\n@alice @bob"),
+                      team=['Alice Liddell', 'Bob Dylan'])
+        history.add(record, 'sf-2026')
+        history.add(make_record('a2', "Jaiqu\n\nJSON transforms\n\nData\n@carol"), 'sf-2026')
+
+        entry = history.lookup('a1')
+        assert entry['team'] == 'Alice Liddell, Bob Dylan', entry['team']
+        assert entry['handles'] == ['@alice', '@bob']
+        assert history.lookup('a2')['team'] is None
+        print("✅ SUCCESS: team stored from the analysis, separately from the handles")
+
+
+def test_triage_results_are_kept_with_their_fidelity():
+    """Test that triage-only results are stored and reused, but never in place of a full analysis"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ProjectHistory(Path(tmp) / 'history.db')
+        triage = dict(make_record('t1', "Jaiqu\n\nJSON transforms\n\nData\n@unknown"), fidelity='triage')
+        assert history.add(triage, 'sf-2025')
+        assert history.lookup('t1')['fidelity'] == 'triage'
+        assert history.lookup('t1', full_only=True) is None
+
+        # A full analysis replaces the triage result, and a later triage doesn't undo it
+        history.add(make_record('t1', "Jaiqu\n\nTransforms JSON with natural language\n\nData\n@lin"), 'sf-2025')
+        history.add(triage, 'sf-2025')
+        entry = history.lookup('t1', full_only=True)
+        assert entry['fidelity'] == 'full' and entry['description'] == 'Transforms JSON with natural language'
+
+        # Across events the full analysis is preferred over a newer triage result
+        history.add(triage, 'nyc-2026')
+        assert history.lookup('t1')['event'] == 'sf-2025'
+        print("✅ SUCCESS: triage results kept with their fidelity")
+
+
+def test_failed_analyses_are_not_reused():
+    """Test that failed and empty summaries are neither stored nor returned for reuse"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ProjectHistory(Path(tmp) / 'history.db')
+        assert not history.add(make_record('b1', "Error processing b1.mp4: Timed out", status='timeout'), 'sf-2026')
+        assert not history.add(make_record('b2', "   "), 'sf-2026')
+        assert not history.add(make_record('b3', "Error processing b3.mp4: quota exceeded"), 'sf-2026')
+        assert history.events() == []
+
+        # Rows written before failures were filtered out are skipped by lookup
+        conn = history._connect()
+        with conn:
+            conn.execute("INSERT INTO projects (video_hash, event, name, summary, analyzed_at) "
+                         "VALUES ('b1', 'old', 'Error processing b1.mp4: Timed out', "
+                         "'Error processing b1.mp4: Timed out', 1)")
+        conn.close()
+        assert history.lookup('b1') is None
+        print("✅ SUCCESS: failed analyses not reused")
+
+
+def test_reused_project_listed_under_new_event():
+    """Test that re-adding a reused analysis lists the project under the current event as well"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ProjectHistory(Path(tmp) / 'history.db')
+        history.add(make_record('c1', "Jaiqu\n\nJSON transforms\n\nData\n@unknown"), 'sf-2025', team='Ada, Lin')
+
+        known = history.lookup('c1')
+        record = dict(make_record('c1', known['summary']), reused_from=known['event'])
+        history.add(record, 'nyc-2026', team=known['team'])
+
+        events = {e['event']: e['projects'] for e in history.events()}
+        assert events == {'sf-2025': 1, 'nyc-2026': 1}, events
+        assert history.lookup('c1')['team'] == 'Ada, Lin'
+        print("✅ SUCCESS: reused project recorded under the current event")
+
+
+if __name__ == "__main__":
+    test_team_comes_from_the_analysis()
+    test_triage_results_are_kept_with_their_fidelity()
+    test_failed_analyses_are_not_reused()
+    test_reused_project_listed_under_new_event()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Test script to verify the shared job queue used by coordinator/worker mode
+"""
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from job_queue import JobQueue
+
+
+def make_jobs(count):
+    return [{'video_hash': f"hash{i}", 'video_filename': f"demo{i}.mp4", 'video_path': f"/videos/demo{i}.mp4"}
+            for i in range(count)]
+
+
+def test_lease_ack_and_reenqueue():
+    """Test that jobs are leased once, acknowledged with results, and not re-added by a second coordinator"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / 'queue.db')
+        assert queue.enqueue(make_jobs(2)) == 2
+        assert queue.enqueue(make_jobs(2)) == 0
+
+        first = queue.lease('worker-a')
+        second = queue.lease('worker-b')
+        assert {first['key'], second['key']} == {'hash0', 'hash1'}
+        assert queue.lease('worker-c') is None
+
+        assert queue.ack(first['key'], 'worker-a', {**first['payload'], 'status': 'success', 'summary': 'ok'})
+        assert not queue.ack(second['key'], 'worker-a', {'status': 'success'}), "acked someone else's lease"
+        assert not queue.finished()
+
+        assert queue.ack(second['key'], 'worker-b', {**second['payload'], 'status': 'success', 'summary': 'ok'})
+        assert queue.finished()
+        assert [r['summary'] for r in queue.results()] == ['ok', 'ok']
+    print("✅ SUCCESS: jobs leased once and acknowledged")
+
+
+def test_expired_lease_is_picked_up_again():
+    """Test that a crashed worker's job becomes visible again and fails after max_attempts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / 'queue.db', visibility_timeout=0.05, max_attempts=2)
+        queue.enqueue(make_jobs(1))
+
+        assert queue.lease('crashed')['attempts'] == 1
+        assert queue.lease('worker-b') is None
+        time.sleep(0.1)
+
+        retry = queue.lease('worker-b')
+        assert retry['attempts'] == 2
+        assert not queue.ack(retry['key'], 'crashed', {'status': 'success'}), "expired lease was still honored"
+
+        time.sleep(0.1)
+        assert queue.reap_expired() == 1
+        assert queue.finished()
+        assert queue.results()[0]['status'] == 'error'
+    print("✅ SUCCESS: expired leases are retried, then failed")
+
+
+def test_failed_jobs_are_retried():
+    """Test that fail() puts a job back until it runs out of attempts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / 'queue.db', max_attempts=2)
+        queue.enqueue(make_jobs(1))
+
+        job = queue.lease('worker-a')
+        assert queue.fail(job['key'], 'worker-a', 'quota exceeded')
+        assert queue.counts()['pending'] == 1
+
+        job = queue.lease('worker-a')
+        assert queue.fail(job['key'], 'worker-a', 'quota exceeded')
+        assert queue.counts()['failed'] == 1
+        assert queue.results()[0]['error'] == 'quota exceeded'
+    print("✅ SUCCESS: failed jobs retried up to max_attempts")
+
+
+def test_concurrent_workers_never_share_a_job():
+    """Test that workers leasing at the same time each get different jobs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'queue.db'
+        JobQueue(path).enqueue(make_jobs(40))
+
+        def drain(worker_id):
+            queue = JobQueue(path)
+            leased = []
+            while (job := queue.lease(worker_id)) is not None:
+                leased.append(job['key'])
+                queue.ack(job['key'], worker_id, {**job['payload'], 'status': 'success', 'summary': worker_id})
+            return leased
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leased = [key for keys in pool.map(drain, ['w1', 'w2', 'w3', 'w4']) for key in keys]
+
+        assert sorted(leased) == sorted(f"hash{i}" for i in range(40))
+        assert JobQueue(path).finished()
+    print("✅ SUCCESS: concurrent workers never share a job")
+
+
+def test_statuses_of_unfinished_jobs():
+    """Test that the coordinator can tell queued jobs from ones still in progress"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / 'queue.db')
+        queue.enqueue(make_jobs(3))
+        first = queue.lease('worker-a')
+        queue.ack(first['key'], 'worker-a', {**first['payload'], 'status': 'success', 'summary': 'ok'})
+        queue.lease('worker-a')
+
+        assert queue.statuses() == {'hash0': 'done', 'hash1': 'leased', 'hash2': 'pending'}
+    print("✅ SUCCESS: job statuses reported")
+
+
+if __name__ == "__main__":
+    test_lease_ack_and_reenqueue()
+    test_expired_lease_is_picked_up_again()
+    test_failed_jobs_are_retried()
+    test_concurrent_workers_never_share_a_job()
+    test_statuses_of_unfinished_jobs()
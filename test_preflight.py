@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Test script to verify the ffprobe preflight: metadata parsing, rejection of unusable files and duration reuse
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+
+from preflight import assess, parse_probe, preflight_summary, preflight_videos
+from sampling import choose_sampling, sampling_for_video
+
+PROBES = {
+    'demo.mp4': {
+        'format': {'format_name': 'mov,mp4,m4a,3gp,3g2,mj2', 'duration': '184.52', 'bit_rate': '2500000'},
+        'streams': [
+            {'codec_type': 'video', 'codec_name': 'h264', 'width': 1920, 'height': 1080,
+             'avg_frame_rate': '30000/1001'},
+            {'codec_type': 'audio', 'codec_name': 'aac'},
+        ],
+    },
+    'podcast.mp4': {
+        'format': {'format_name': 'mov,mp4,m4a,3gp,3g2,mj2', 'duration': '600.0'},
+        'streams': [
+            {'codec_type': 'audio', 'codec_name': 'aac'},
+            {'codec_type': 'video', 'codec_name': 'mjpeg', 'disposition': {'attached_pic': 1}},
+        ],
+    },
+    'stream.webm': {
+        'format': {'format_name': 'matroska,webm'},
+        'streams': [{'codec_type': 'video', 'codec_name': 'vp9', 'avg_frame_rate': '0/0'}],
+    },
+}
+
+
+async def fake_probe(video_path):
+    # Anything without a canned probe is treated as unreadable
+    return PROBES.get(Path(video_path).name)
+
+
+def test_parse_probe():
+    """Test that the metadata the pipeline uses is extracted from ffprobe output"""
+    metadata = parse_probe(PROBES['demo.mp4'])
+    assert metadata['duration'] == 184.52
+    assert metadata['bit_rate'] == 2500000
+    assert (metadata['video_codec'], metadata['audio_codec']) == ('h264', 'aac')
+    assert (metadata['width'], metadata['height'], metadata['fps']) == (1920, 1080, 29.97)
+
+    podcast = parse_probe(PROBES['podcast.mp4'])
+    assert not podcast['has_video'], "cover art is not a video stream"
+    assert parse_probe(PROBES['stream.webm'])['fps'] is None
+    print("✅ SUCCESS: ffprobe output parsed")
+
+
+def test_assess():
+    """Test which probed files are accepted, repaired or rejected"""
+    assert assess(Path('demo.mp4'), 1000, parse_probe(PROBES['demo.mp4'])) == ('ok', None)
+    assert assess(Path('demo.mp4'), 0, None) == ('rejected', 'empty file')
+    assert assess(Path('broken.mp4'), 1000, None)[0] == 'rejected'
+    assert assess(Path('podcast.mp4'), 1000, parse_probe(PROBES['podcast.mp4']))[1] == 'no video stream (audio only)'
+    assert assess(Path('stream.webm'), 1000, parse_probe(PROBES['stream.webm']))[0] == 'repair'
+    assert assess(Path('demo.mkv'), 1000, parse_probe(PROBES['demo.mp4']))[0] == 'repair'
+    print("✅ SUCCESS: unusable videos rejected or marked for repair")
+
+
+def test_preflight_videos():
+    """Test that every video is checked, in order, and probed durations are reused for sampling"""
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = []
+        for name, size in [('demo.mp4', 1000), ('empty.mp4', 0), ('broken.mp4', 1000),
+                           ('podcast.mp4', 1000), ('stream.webm', 1000)]:
+            videos.append(Path(tmp) / name)
+            videos[-1].write_bytes(b'\x00' * size)
+
+        checked = asyncio.run(preflight_videos(videos, max_concurrency=2, repair=False, probe=fake_probe))
+
+        assert [entry['path'] for entry in checked] == videos
+        assert [entry['status'] for entry in checked] == ['ok', 'rejected', 'rejected', 'rejected', 'repairable']
+        assert checked[0]['metadata']['duration'] == 184.52
+        assert preflight_summary(checked) == '1 ok, 3 rejected, 1 repairable'
+
+        # The probed duration decides the sampling without probing the file again
+        assert sampling_for_video(str(videos[0])) == choose_sampling(184.52)
+    print("✅ SUCCESS: videos preflighted concurrently")
+
+
+def test_missing_file_is_rejected():
+    """Test that a file removed since discovery is rejected instead of failing the whole preflight"""
+    with tempfile.TemporaryDirectory() as tmp:
+        demo = Path(tmp) / 'demo.mp4'
+        demo.write_bytes(b'\x00' * 1000)
+        gone = Path(tmp) / 'gone.mp4'
+
+        checked = asyncio.run(preflight_videos([gone, demo], repair=False, probe=fake_probe))
+        assert [entry['status'] for entry in checked] == ['rejected', 'ok']
+        assert checked[0]['reason'].startswith("can't read file"), checked[0]['reason']
+    print("✅ SUCCESS: unreadable file rejected")
+
+
+if __name__ == "__main__":
+    test_parse_probe()
+    test_assess()
+    test_preflight_videos()
+    test_missing_file_is_rejected()
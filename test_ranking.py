@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Test script to verify per-video summaries are built from the video analysis, not the team research report
+"""
+import tempfile
+from pathlib import Path
+
+from ranking import load_ranking, merge_team_handles, parse_summary, published_state, save_ranking
+
+ANALYSIS = "PaperTrail\n\nTurns receipts into expense reports.\n\nExpenses on autopilot\n@unknown"
+
+TEAM_REPORT = (
+    "Project name: PaperTrail\n"
+    "- Ada Lovelace, Twitter: @ada_codes, website https://ada.dev\n"
+    "- Alan Turing (alan@example.com), Twitter: @ALAN_T, @ada_codes\n"
+)
+
+
+def test_summary_fields_come_from_the_analysis():
+    """Test that the name, description and tagline survive team research, with its handles merged in"""
+    fields = parse_summary(merge_team_handles(ANALYSIS, TEAM_REPORT))
+    assert fields == {
+        'name': 'PaperTrail',
+        'description': 'Turns receipts into expense reports.',
+        'tagline': 'Expenses on autopilot',
+        'handles': ['@ada_codes', '@ALAN_T'],
+    }, fields
+    print("✅ SUCCESS: summary fields taken from the video analysis")
+
+
+def test_without_team_handles():
+    """Test that the analysis is kept as is without a report, and @unknown stays when nothing was found"""
+    assert merge_team_handles(ANALYSIS) == ANALYSIS
+    fields = parse_summary(merge_team_handles(ANALYSIS, "No team information available for PaperTrail"))
+    assert fields['name'] == 'PaperTrail' and fields['handles'] == ['@unknown']
+    print("✅ SUCCESS: summaries without team handles")
+
+
+def test_ranking_state_is_persisted():
+    """Test that the ranking and draft are saved after publishing, keeping the last draft when one fails"""
+    projects = [{**parse_summary(ANALYSIS), 'video_hash': 'h1', 'score': 80.0}]
+    with tempfile.TemporaryDirectory() as tmp:
+        ranking_file = Path(tmp) / 'ranking.json'
+        assert load_ranking(ranking_file) == {'projects': [], 'draft_id': None}
+
+        state = published_state(projects, {'success': True, 'draft_id': 'd1', 'share_url': 'https://t.ly/d1'})
+        save_ranking(ranking_file, state)
+        assert load_ranking(ranking_file) == {'projects': projects, 'draft_id': 'd1', 'share_url': 'https://t.ly/d1'}
+
+        more = projects + [{**parse_summary(ANALYSIS), 'video_hash': 'h2', 'score': 50.0}]
+        state = published_state(more, {'success': False, 'error': 'HTTP 500', 'draft_id': None}, state)
+        assert state['draft_id'] == 'd1' and state['share_url'] == 'https://t.ly/d1'
+        assert [p['video_hash'] for p in state['projects']] == ['h1', 'h2']
+
+        state = published_state(more, {'success': True, 'draft_id': 'd2', 'share_url': None}, state)
+        assert state['draft_id'] == 'd2' and state['share_url'] is None, "the old draft's link is dropped"
+    print("✅ SUCCESS: ranking state persisted with its draft")
+
+
+if __name__ == "__main__":
+    test_summary_fields_come_from_the_analysis()
+    test_without_team_handles()
+    test_ranking_state_is_persisted()
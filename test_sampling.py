@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Test script to verify that video sampling fits the analyzed segment into the token budget
+"""
+from sampling import choose_sampling, estimate_tokens
+
+BUDGET = 150_000
+
+
+def test_long_video_clipped_from_its_start():
+    """Test that a video too long for the budget is clipped to its opening"""
+    sampling = choose_sampling(3 * 3600, BUDGET)
+    assert sampling['policy'] == 'clip'
+    assert sampling['end_offset'] == 2595, sampling
+    assert sampling['estimated_tokens'] <= BUDGET
+    print("✅ SUCCESS: long video clipped from its start")
+
+
+def test_clip_starts_at_start_offset():
+    """Test that the clip of a long segment is measured from its start offset, not from 0"""
+    sampling = choose_sampling(3 * 3600, BUDGET, start_offset=3600)
+    assert sampling['policy'] == 'clip'
+    assert sampling['end_offset'] == 3600 + 2595, sampling
+    print("✅ SUCCESS: clip measured from the start offset")
+
+
+def test_short_segment_is_not_capped():
+    """Test that a segment that already fits the budget keeps its own end and gets a higher fps"""
+    sampling = choose_sampling(3 * 3600, BUDGET, start_offset=3600, end_offset=3900)
+    assert sampling['policy'] == 'fps'
+    assert sampling['end_offset'] == 3900
+    assert sampling['fps'] == 1.0
+    assert sampling['estimated_tokens'] == estimate_tokens(300, 1.0)
+
+    # Starting past the usual clip length no longer yields an end before the start
+    sampling = choose_sampling(3 * 3600, BUDGET, start_offset=9000)
+    assert sampling['end_offset'] is None and sampling['estimated_tokens'] == estimate_tokens(1800, sampling['fps'])
+    print("✅ SUCCESS: short segment kept whole")
+
+
+def test_whole_video_sampling_unchanged():
+    """Test that a video analyzed whole still gets the highest fps within the budget"""
+    sampling = choose_sampling(1800, BUDGET)
+    assert sampling['policy'] == 'fps' and sampling['end_offset'] is None
+    assert sampling['fps'] == 0.19, sampling
+    assert choose_sampling(0, BUDGET, end_offset=60)['end_offset'] == 60
+    print("✅ SUCCESS: whole-video sampling unchanged")
+
+
+if __name__ == "__main__":
+    test_long_video_clipped_from_its_start()
+    test_clip_starts_at_start_offset()
+    test_short_segment_is_not_capped()
+    test_whole_video_sampling_unchanged()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Test script to verify longest-job-first scheduling and the cost model behind it
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler import CostModel, Deadline, run_started, schedule
+
+
+def run(jobs, **kwargs):
+    started = []
+
+    async def run_job(job, budget):
+        started.append(job['name'])
+        await asyncio.sleep(job['seconds'])
+        return job['name']
+
+    async def collect():
+        return [(job['name'], result) async for job, result in schedule(jobs, run_job, **kwargs)]
+
+    return started, asyncio.run(collect())
+
+
+def test_longest_jobs_start_first():
+    """Test that with a cost, jobs start in decreasing order of cost and the batch finishes sooner"""
+    jobs = [{'name': 'short1', 'seconds': 0.05}, {'name': 'short2', 'seconds': 0.05},
+            {'name': 'short3', 'seconds': 0.05}, {'name': 'long', 'seconds': 0.15}]
+
+    started, _ = run(jobs, max_concurrency=2)
+    assert started == ['short1', 'short2', 'short3', 'long']
+
+    started, results = run(jobs, max_concurrency=2, cost=lambda job: job['seconds'])
+    assert started[0] == 'long'
+    assert sorted(name for name, result in results) == sorted(job['name'] for job in jobs)
+    print("✅ SUCCESS: longest jobs started first")
+
+
+def test_short_jobs_still_fit_before_the_deadline():
+    """Test that a job too long for the time left is skipped without skipping the shorter ones"""
+    jobs = [{'name': 'long', 'seconds': 0.2}, {'name': 'medium', 'seconds': 0.1},
+            {'name': 'short', 'seconds': 0.02}]
+    started, results = run(jobs, max_concurrency=1, deadline=Deadline(0.3), cost=lambda job: job['seconds'])
+
+    assert started == ['long', 'short'], started
+    assert results[-1] == ('medium', None), "skipped jobs are yielded last without a result"
+    print("✅ SUCCESS: shorter jobs fill the time before the deadline")
+
+
+def test_cost_model_learns_from_history():
+    """Test that the processing rate is fitted to earlier runs and the duration guessed from the size"""
+    mb = 1024 * 1024
+    default = CostModel()
+    assert default.estimate(100 * mb, 120) > default.estimate(10 * mb, 60)
+    assert default.estimate(100 * mb) > default.estimate(10 * mb), "duration guessed from the size"
+
+    records = [{'status': 'success', 'elapsed': 0.1 * size + 2 * duration, 'size_bytes': size * mb,
+                'duration': duration} for size, duration in [(10, 30), (50, 120), (200, 600)]]
+    records.append({'status': 'timeout', 'elapsed': 3600, 'size_bytes': mb, 'duration': 10})
+    records.append({'status': 'success', 'summary': 'reused, never timed'})
+    model = CostModel.from_history(records)
+    assert abs(model.seconds_per_video_second - 2.0) < 1e-9
+    assert CostModel.from_history(records[:2]).seconds_per_video_second == default.seconds_per_video_second
+    print("✅ SUCCESS: cost model fitted to earlier runs")
+
+
+def test_timeout_starts_when_the_call_starts():
+    """Test that a call queued behind a busy thread gets its full timeout once it runs"""
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def main():
+        busy = asyncio.ensure_future(run_started(executor, lambda: time.sleep(0.3)))
+        await asyncio.sleep(0.01)
+        # Queued for 0.3s, which is longer than its timeout, then runs for 0.05s
+        queued = await run_started(executor, lambda: time.sleep(0.05) or 'done', timeout=0.2)
+        await busy
+        try:
+            await run_started(executor, lambda: time.sleep(0.3), timeout=0.05)
+        except asyncio.TimeoutError:
+            return queued
+        raise AssertionError("a call running past its timeout should time out")
+
+    try:
+        assert asyncio.run(main()) == 'done'
+    finally:
+        executor.shutdown()
+    print("✅ SUCCESS: timeouts start when the call starts")
+
+
+if __name__ == "__main__":
+    test_longest_jobs_start_first()
+    test_short_jobs_still_fit_before_the_deadline()
+    test_cost_model_learns_from_history()
+    test_timeout_starts_when_the_call_starts()
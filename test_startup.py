@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Test script to verify that listing videos doesn't load the heavy processing stack
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Modules that must only be imported once a processing stage actually runs
+HEAVY_MODULES = ['crewai', 'crewai_tools', 'stagehand', 'agentops', 'weave', 'google.genai', 'openai']
+
+# Startup budget for `test_cli.py --list`, in seconds
+STARTUP_BUDGET = 1.0
+
+
+def test_list_startup_is_fast():
+    """Test that `test_cli.py --list` stays under the startup budget without heavy imports"""
+    cli = Path(__file__).parent / 'test_cli.py'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'demo.mp4').write_bytes(b'\x00' * 1024)
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', str(cli), '--list', tmp],
+            capture_output=True,
+            text=True
+        )
+        elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    # -X importtime writes one "import time: self | cumulative | module" line per import
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            imported.add(line.rsplit('|', 1)[1].strip())
+
+    loaded = [m for m in HEAVY_MODULES if m in imported]
+    print(f"--list took {elapsed:.2f}s, {len(imported)} modules imported")
+
+    assert not loaded, f"Heavy modules imported while listing: {loaded}"
+    assert elapsed < STARTUP_BUDGET, f"--list took {elapsed:.2f}s (budget {STARTUP_BUDGET}s)"
+    print("✅ SUCCESS: listing stays lightweight")
+
+
+if __name__ == "__main__":
+    test_list_startup_is_fast()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Test script to verify the deterministic thread renderer and tweet length rules
+"""
+from thread_renderer import (
+    TWEET_MAX_LENGTH,
+    TWEET_SEPARATOR,
+    render_project_draft,
+    render_project_tweets,
+    render_thread,
+    validate_thread,
+    weighted_length,
+)
+
+
+def test_weighted_length():
+    """Test Twitter's weighting of Latin text, CJK, URLs and emoji"""
+    assert weighted_length("Jaiqu") == 5
+    assert weighted_length("日本語") == 6
+    assert weighted_length("Try it at https://example.com/a/very/long/path?with=query") == 10 + 23
+    assert weighted_length("jaiqu.dev") == 23
+    assert weighted_length("🚀") == 2
+    assert weighted_length("👩‍💻") == 2, "ZWJ sequence counts as one emoji"
+    assert weighted_length("👍🏽") == 2, "skin tone modifier counts with its emoji"
+    assert weighted_length("🇺🇸") == 2, "flag pair counts as one emoji"
+    print("✅ SUCCESS: weighted lengths match Twitter's rules")
+
+
+def test_thread_layout():
+    """Test that the thread has the 3-part intro, numbered tweets and 4 blank lines between tweets"""
+    projects = [
+        {'name': 'Jaiqu', 'description': 'Natural language to JQ queries.', 'tagline': 'Dev tools',
+         'handles': ['@JaiquApp']},
+        {'name': 'PaperTrail', 'description': 'Receipts to ledger entries.', 'tagline': 'Fintech',
+         'handles': ['@unknown']},
+    ]
+    thread = render_thread(projects)
+    tweets = thread.split(TWEET_SEPARATOR)
+
+    assert len(tweets) == 3
+    assert tweets[0].count('\n\n') == 2
+    assert tweets[1] == "1/ Jaiqu\n\nNatural language to JQ queries.\n\nDev tools\n@JaiquApp"
+    assert tweets[2] == "2/ PaperTrail\n\nReceipts to ledger entries.\n\nFintech"
+    assert validate_thread(thread) == []
+
+    # A per-project draft is the same tweet without its position in the thread
+    assert render_project_draft(projects[0]) == "Jaiqu\n\nNatural language to JQ queries.\n\nDev tools\n@JaiquApp"
+    print("✅ SUCCESS: thread layout is deterministic")
+
+
+def test_long_tweets_are_trimmed_or_split():
+    """Test that over-long project tweets are trimmed, or split when trimming isn't enough"""
+    wordy = {'name': 'Jaiqu', 'description': 'An AI assistant ' * 40, 'tagline': 'Dev tools',
+             'handles': ['@JaiquApp']}
+    tweets = render_project_tweets(1, wordy)
+    assert len(tweets) == 1
+    assert tweets[0].endswith("…\n\nDev tools\n@JaiquApp")
+    assert weighted_length(tweets[0]) <= TWEET_MAX_LENGTH
+
+    crowded = {'name': 'Jaiqu', 'description': 'Natural language to JQ.', 'tagline': 'Dev tools',
+               'handles': [f"@teammember{i:02d}" for i in range(30)]}
+    tweets = render_project_tweets(1, crowded)
+    assert len(tweets) > 2
+    assert tweets[0] == "1/ Jaiqu\n\nNatural language to JQ."
+    assert all(weighted_length(t) <= TWEET_MAX_LENGTH for t in tweets)
+    assert ' '.join(tweets[1:]).count('@teammember') == 30, "no handle was dropped"
+    print("✅ SUCCESS: long tweets trimmed or split within the limit")
+
+
+def test_validate_thread_reports_long_tweets():
+    """Test that validation flags tweets over the limit"""
+    thread = TWEET_SEPARATOR.join(["Intro", "x" * 281, "🚀" * 140])
+    problems = validate_thread(thread)
+    assert [p['index'] for p in problems] == [1]
+    assert problems[0]['length'] == 281
+    print("✅ SUCCESS: validation flags over-long tweets")
+
+
+if __name__ == "__main__":
+    test_weighted_length()
+    test_thread_layout()
+    test_long_tweets_are_trimmed_or_split()
+    test_validate_thread_reports_long_tweets()
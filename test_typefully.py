@@ -3,6 +3,7 @@
 
 import os
 from dotenv import load_dotenv
+from tools import typefully_tool
 from tools.typefully_tool import TypefullyTool
 
 # Load environment variables
@@ -50,7 +51,78 @@ def test_typefully_draft():
     return result
 
 
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise typefully_tool.requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeTypefully:
+    """Stand-in for requests.post against the drafts endpoint, recording every request."""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.requests.append((url, json))
+        if self.status_code != 200:
+            return FakeResponse(self.status_code, {'message': 'Bad request'})
+        draft_id = len(self.requests)
+        return FakeResponse(200, {'id': draft_id, 'share_url': f"https://typefully.com/t/{draft_id}",
+                                  'content': json['content']})
+
+
+def with_fake_api(fake, run):
+    original_post, original_key = typefully_tool.requests.post, os.environ.get("TYPEFULLY_API_KEY")
+    typefully_tool.requests.post = fake.post
+    os.environ["TYPEFULLY_API_KEY"] = "test"
+    try:
+        return run()
+    finally:
+        typefully_tool.requests.post = original_post
+        if original_key is None:
+            del os.environ["TYPEFULLY_API_KEY"]
+        else:
+            os.environ["TYPEFULLY_API_KEY"] = original_key
+
+
+def test_replace_draft_creates_a_new_draft():
+    """Test that replacing a draft creates a new one through the documented endpoint and reports the old one"""
+    fake = FakeTypefully()
+    result = with_fake_api(fake, lambda: TypefullyTool().replace_draft("41", content="1/ Updated thread", share=True))
+
+    assert [url for url, _ in fake.requests] == ["https://api.typefully.com/v1/drafts/"]
+    assert fake.requests[0][1] == {"content": "1/ Updated thread", "threadify": True, "share": True}
+    assert result["success"] and result["draft_id"] == 1
+    assert result["replaced_draft_id"] == "41"
+    assert result["share_url"] == "https://typefully.com/t/1"
+    print("✅ SUCCESS: replacing a draft creates a new one")
+
+
+def test_failed_draft_reports_the_error():
+    """Test that an API error is returned instead of raised, without a new draft ID"""
+    fake = FakeTypefully(status_code=400)
+    result = with_fake_api(fake, lambda: TypefullyTool().replace_draft("41", content="1/ Updated thread"))
+
+    assert not result["success"] and result["draft_id"] is None
+    assert "Bad request" in result["error"]
+    assert result["replaced_draft_id"] == "41"
+    print("✅ SUCCESS: API errors reported")
+
+
 if __name__ == "__main__":
+    test_replace_draft_creates_a_new_draft()
+    test_failed_draft_reports_the_error()
+
     # Check for API key
     if not os.getenv("TYPEFULLY_API_KEY"):
         print("⚠️  TYPEFULLY_API_KEY not found in environment variables!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Test script to verify batch publishing of Typefully drafts against a local stub of the drafts endpoint
+"""
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from tools.typefully_batch import TypefullyBatchPublisher
+
+
+class StubDrafts(BaseHTTPRequestHandler):
+    """Answers POST /drafts/ like Typefully, slower for earlier drafts so they finish out of order."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    payloads = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.payloads.append(payload)
+            draft_id = len(cls.payloads)
+        time.sleep(0.2 if payload['content'].endswith('0') else 0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        if 'reject' in payload['content']:
+            self.send_response(400)
+            body = {'message': 'Bad request'}
+        else:
+            self.send_response(200)
+            body = {'id': draft_id, 'share_url': f"https://typefully.com/t/{draft_id}" if payload['share'] else None}
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubTool:
+    """Posts drafts to the stub endpoint with TypefullyTool's payload and result format."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def _run(self, content, schedule_date=None, auto_split=True, share=False):
+        payload = {'content': content, 'threadify': auto_split, 'share': share}
+        if schedule_date:
+            payload['schedule-date'] = schedule_date
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                data = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return {'success': False, 'error': f"HTTP error: {e.code}", 'draft_id': None}
+        return {'success': True, 'draft_id': data['id'], 'share_url': data['share_url'],
+                'scheduled_at': schedule_date, 'error': None}
+
+
+def publish_to_stub(drafts, max_concurrency, manifest_file=None):
+    StubDrafts.in_flight = StubDrafts.max_in_flight = 0
+    StubDrafts.payloads = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDrafts)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        tool = StubTool(f"http://127.0.0.1:{server.server_port}/drafts/")
+        publisher = TypefullyBatchPublisher(max_concurrency=max_concurrency, tool=tool)
+        return asyncio.run(publisher.publish(drafts, manifest_file=manifest_file))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency drafts are in flight, but they do overlap"""
+    drafts = [{'content': f"Thread {i}"} for i in range(8)]
+    manifest = publish_to_stub(drafts, max_concurrency=3)
+
+    assert all(entry['success'] for entry in manifest)
+    assert StubDrafts.max_in_flight == 3, StubDrafts.max_in_flight
+    print("✅ SUCCESS: draft requests bounded by max_concurrency")
+
+
+def test_manifest_in_input_order():
+    """Test that the manifest follows the input order even though drafts finish out of order"""
+    drafts = [{'key': 'ai-track', 'content': 'Thread 0'},
+              {'content': 'Thread 1', 'share': True},
+              {'key': 'Jaiqu', 'content': 'reject me'}]
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_file = Path(tmp) / 'manifests' / 'typefully_manifest.json'
+        manifest = publish_to_stub(drafts, max_concurrency=3, manifest_file=str(manifest_file))
+
+        assert [entry['key'] for entry in manifest] == ['ai-track', 'draft_2', 'Jaiqu']
+        assert [entry['success'] for entry in manifest] == [True, True, False]
+        assert manifest[2]['error'] == 'HTTP error: 400'
+        assert json.loads(manifest_file.read_text()) == manifest
+    print("✅ SUCCESS: manifest written in input order")
+
+
+def test_share_defaults_to_off():
+    """Test that drafts are only shared when asked to, like with TypefullyTool"""
+    manifest = publish_to_stub([{'content': 'Thread 1'}, {'content': 'Thread 2', 'share': True}], max_concurrency=1)
+
+    assert [payload['share'] for payload in StubDrafts.payloads] == [False, True]
+    assert manifest[0]['share_url'] is None and manifest[1]['share_url']
+    print("✅ SUCCESS: drafts not shared by default")
+
+
+if __name__ == "__main__":
+    test_concurrency_is_bounded()
+    test_manifest_in_input_order()
+    test_share_defaults_to_off()
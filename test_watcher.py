@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Test script to verify watch mode stops on an interrupted batch and still aggregates the session
+"""
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from result_sink import JsonlResultSink
+from scheduler import Deadline
+from watcher import watch_videos
+
+
+def test_interrupted_batch_stops_watching():
+    """Test that Ctrl+C during a batch ends watch mode after that batch, with the final aggregation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            videos = Path(tmp) / 'videos'
+            videos.mkdir()
+            (videos / 'demo.mp4').write_bytes(b'\x00' * 1000)
+            batches, aggregated = [], []
+
+            async def process(video_files, **kwargs):
+                # Like process_videos after catching Ctrl+C: completed videos are in the sink
+                batches.append(video_files)
+                JsonlResultSink('output/results.jsonl').write({
+                    'video_hash': 'h1', 'video_filename': 'demo.mp4', 'video_path': str(video_files[0]),
+                    'status': 'success', 'summary': 'PaperTrail\n\nReceipts to reports.\n\nExpenses\n@unknown'
+                })
+                return {'video_hashes': ['h1'], 'interrupted': True}
+
+            async def aggregate(records, output_dir, polish=False, share=False, project_drafts=False):
+                aggregated.append([record['summary'] for record in records.values()])
+                return 'thread'
+
+            results = asyncio.run(asyncio.wait_for(watch_videos(
+                str(videos), settle_seconds=0, poll_interval=0.01, process=process, aggregate=aggregate
+            ), timeout=5))
+        finally:
+            os.chdir(cwd)
+
+        assert len(batches) == 1
+        assert results['processed_videos'] == 1
+        assert results['final_result'] == 'thread'
+        assert aggregated and aggregated[0][0].startswith('PaperTrail')
+    print("✅ SUCCESS: interrupted batch stops watching and aggregates")
+
+
+def test_options_and_deadline_reach_every_batch():
+    """Test that batches get the session's deadline and options, and watching stops before the deadline"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            videos = Path(tmp) / 'videos'
+            videos.mkdir()
+            (videos / 'demo.mp4').write_bytes(b'\x00' * 1000)
+            calls, aggregated = [], []
+            deadline = Deadline(1.0)
+
+            async def process(video_files, **kwargs):
+                calls.append(kwargs)
+                return {'video_hashes': []}
+
+            async def aggregate(records, output_dir, polish=False, share=False, project_drafts=False):
+                aggregated.append(polish)
+
+            started = time.monotonic()
+            results = asyncio.run(asyncio.wait_for(watch_videos(
+                str(videos), settle_seconds=0, poll_interval=0.01, deadline=deadline, aggregation_reserve=0.5,
+                polish=True, process=process, aggregate=aggregate, video_timeout=30, tiered=True, preflight=False
+            ), timeout=5))
+        finally:
+            os.chdir(cwd)
+
+        assert len(calls) == 1
+        assert calls[0]['deadline'] is deadline and calls[0]['aggregation_reserve'] == 0.5
+        assert (calls[0]['video_timeout'], calls[0]['tiered'], calls[0]['preflight']) == (30, True, False)
+        assert time.monotonic() - started < 1.0, "watching continued past the aggregation reserve"
+        assert results['processed_videos'] == 0 and aggregated == []
+    print("✅ SUCCESS: batches processed with the session's options until the deadline")
+
+
+if __name__ == "__main__":
+    test_interrupted_batch_stops_watching()
+    test_options_and_deadline_reach_every_batch()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Test script to verify the worker pool stops timed-out jobs and times jobs from their dispatch
+"""
+import asyncio
+import math
+import os
+import signal
+import time
+
+from worker_pool import WorkerPool
+
+
+def test_timed_out_worker_is_replaced():
+    """Test that a job past its timeout is terminated and the next job runs in a fresh worker"""
+    pool = WorkerPool(max_workers=1)
+
+    async def main():
+        # Queued behind the job that times out, so it only gets a worker once that one is replaced
+        waiting = asyncio.ensure_future(pool.run(math.sqrt, 16, timeout=30))
+        try:
+            await pool.run(time.sleep, 30, timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("the job should have timed out")
+        return await waiting
+
+    started = time.monotonic()
+    try:
+        assert asyncio.run(main()) == 4.0
+    finally:
+        pool.shutdown()
+    assert pool.replaced == 1
+    assert time.monotonic() - started < 15, "the timed-out job kept its worker busy"
+    print("✅ SUCCESS: timed-out worker terminated and replaced")
+
+
+def test_timeout_starts_at_dispatch():
+    """Test that a job queued behind a busy worker keeps its full timeout, and errors are raised"""
+    pool = WorkerPool(max_workers=1)
+
+    async def main():
+        await pool.run(math.sqrt, 1)  # start the worker
+        busy = asyncio.ensure_future(pool.run(time.sleep, 1.0, timeout=30))
+        await asyncio.sleep(0.1)
+        queued = await pool.run(math.sqrt, 9, timeout=0.8)
+        await busy
+        try:
+            await pool.run(math.sqrt, -1)
+        except ValueError:
+            return queued
+        raise AssertionError("the job's exception should be raised")
+
+    try:
+        assert asyncio.run(main()) == 3.0
+    finally:
+        pool.shutdown()
+    assert pool.replaced == 0
+    print("✅ SUCCESS: timeouts start when a worker takes the job")
+
+
+def test_cancelled_job_terminates_a_worker_ignoring_ctrl_c():
+    """Test that a worker ignoring SIGINT keeps its job through Ctrl+C and is terminated when the job is cancelled"""
+    # Like the crew workers, which leave Ctrl+C to the parent
+    pool = WorkerPool(max_workers=1, initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+
+    async def main():
+        await pool.run(math.sqrt, 1)  # start the worker, so its initializer has run
+        job = asyncio.ensure_future(pool.run(time.sleep, 30))
+        await asyncio.sleep(0.2)
+        worker = next(iter(pool._workers))
+        os.kill(worker.process.pid, signal.SIGINT)
+        await asyncio.sleep(0.5)
+        assert worker.process.is_alive() and not job.done(), "Ctrl+C reached the worker"
+
+        job.cancel()
+        try:
+            await job
+        except asyncio.CancelledError:
+            pass
+        return worker
+
+    try:
+        worker = asyncio.run(main())
+    finally:
+        pool.shutdown()
+    assert not worker.process.is_alive()
+    assert pool.replaced == 1
+    print("✅ SUCCESS: interrupted job's worker terminated by the pool")
+
+
+if __name__ == "__main__":
+    test_timed_out_worker_is_replaced()
+    test_timeout_starts_at_dispatch()
+    test_cancelled_job_terminates_a_worker_ignoring_ctrl_c()
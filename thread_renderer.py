@@ -0,0 +1,211 @@
+"""
+Render the hackathon tweet thread from ranked project records.
+
+Produces the same layout the final_tweet_composition_task asks the LLM for:
+a 3-part introduction followed by one numbered tweet per project, with tweets
+separated by exactly 4 blank lines so Typefully's threadify splits them.
+
+Every tweet is checked against Twitter's weighted length rules: most Latin
+characters count 1, other characters (CJK, most symbols) count 2, every URL
+counts 23 and every emoji sequence counts 2, for at most 280. A project tweet
+that is too long has its description trimmed, and is split into a follow-up
+tweet if its name, tagline and handles alone don't fit.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+THREAD_INTRO = [
+    "Join us as we unveil the groundbreaking projects from our latest hackathon! 🚀",
+    "Innovation meets practical solutions in these exciting demonstrations.",
+    "Discover the tools and ideas shaping tomorrow (🧵):",
+]
+
+# 4 blank lines between tweets
+TWEET_SEPARATOR = "\n" * 5
+
+TWEET_MAX_LENGTH = 280
+
+# Every URL is shortened to a t.co link of this length
+URL_LENGTH = 23
+
+# Code point ranges that count 1; everything else counts 2 (twitter-text v3 configuration)
+LIGHT_RANGES = [(0, 4351), (8192, 8205), (8208, 8223), (8242, 8247)]
+
+URL_PATTERN = re.compile(
+    r'https?://\S+'
+    r'|\b(?:[a-z0-9-]+\.)+(?:com|org|net|io|ai|dev|app|co|xyz|me|gg|so|sh|tech)\b(?:/\S*)?',
+    re.IGNORECASE
+)
+
+# An emoji with its modifiers: variation selectors, skin tones, keycaps, flag pairs and ZWJ sequences
+_EMOJI = '(?:[\U0001F1E6-\U0001F1FF]{2}|[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF])'
+_MODIFIERS = '[\uFE0E\uFE0F\U0001F3FB-\U0001F3FF]*'
+EMOJI_PATTERN = re.compile(
+    f'{_EMOJI}{_MODIFIERS}\u20E3?(?:\u200D{_EMOJI}{_MODIFIERS})*'
+    '|[0-9#*]\uFE0F?\u20E3'
+)
+
+ELLIPSIS = "\u2026"
+
+
+def _text_length(text: str) -> int:
+    length = 0
+    position = 0
+    for match in EMOJI_PATTERN.finditer(text):
+        length += _char_length(text[position:match.start()]) + 2
+        position = match.end()
+    return length + _char_length(text[position:])
+
+
+def _char_length(text: str) -> int:
+    return sum(1 if any(low <= ord(c) <= high for low, high in LIGHT_RANGES) else 2 for c in text)
+
+
+def weighted_length(text: str) -> int:
+    """
+    Length of a tweet as Twitter counts it.
+
+    Args:
+        text: Tweet text
+
+    Returns:
+        Weighted length, to compare against TWEET_MAX_LENGTH
+    """
+    text = unicodedata.normalize('NFC', text)
+    length = 0
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        length += _text_length(text[position:match.start()]) + URL_LENGTH
+        position = match.end()
+    return length + _text_length(text[position:])
+
+
+def truncate(text: str, max_length: int) -> str:
+    """
+    Shorten text at a word boundary, with an ellipsis, to a weighted length of at most max_length.
+
+    Returns an empty string if not even one word fits.
+    """
+    if weighted_length(text) <= max_length:
+        return text
+    words = text.split()
+    while words:
+        words.pop()
+        candidate = ' '.join(words).rstrip(',;:.-') + ELLIPSIS
+        if words and weighted_length(candidate) <= max_length:
+            return candidate
+    return ""
+
+
+def _title(number: Optional[int], name: str) -> str:
+    return f"{number}/ {name}" if number is not None else name
+
+
+def render_project_tweet(number: Optional[int], project: Dict) -> str:
+    """
+    Render a single numbered project tweet, without length checks.
+
+    Args:
+        number: Position of the project in the thread (1-based), or None for a standalone tweet
+        project: Project record with name, description, tagline and handles
+
+    Returns:
+        The tweet text
+    """
+    lines = [_title(number, project['name']), "", project.get('description', '')]
+
+    tagline = project.get('tagline', '')
+    handles = [h for h in project.get('handles', []) if h and h != '@unknown']
+    if tagline or handles:
+        lines.append("")
+    if tagline:
+        lines.append(tagline)
+    if handles:
+        lines.append(' '.join(handles))
+
+    return '\n'.join(lines).strip()
+
+
+def render_project_tweets(number: Optional[int], project: Dict) -> List[str]:
+    """
+    Render a project as one tweet, or several if it can't fit in one.
+
+    The description is trimmed first, since the name, tagline and handles carry
+    the credit. If those alone are still too long, the tagline and handles move
+    to follow-up tweets.
+
+    Returns:
+        Tweets that each fit within TWEET_MAX_LENGTH
+    """
+    tweet = render_project_tweet(number, project)
+    if weighted_length(tweet) <= TWEET_MAX_LENGTH:
+        return [tweet]
+
+    without_description = render_project_tweet(number, {**project, 'description': ''})
+    room = TWEET_MAX_LENGTH - weighted_length(without_description) - 1  # the description's own line
+    if room > 0:
+        description = truncate(project.get('description', ''), room)
+        if description:
+            return [render_project_tweet(number, {**project, 'description': description})]
+
+    # Split: name and description first, then the tagline and handles
+    name = truncate(_title(number, project['name']), TWEET_MAX_LENGTH)
+    head = name
+    description = truncate(project.get('description', ''), TWEET_MAX_LENGTH - weighted_length(name) - 2)
+    if description:
+        head += f"\n\n{description}"
+    tweets = [head]
+
+    tagline = truncate(project.get('tagline', ''), TWEET_MAX_LENGTH)
+    current = tagline
+    for handle in [h for h in project.get('handles', []) if h and h != '@unknown']:
+        separator = '\n' if current == tagline and current else ' '
+        if current and weighted_length(current + separator + handle) > TWEET_MAX_LENGTH:
+            tweets.append(current)
+            current = handle
+        else:
+            current = f"{current}{separator}{handle}" if current else handle
+    if current:
+        tweets.append(current)
+    return tweets
+
+
+def render_thread(projects: List[Dict]) -> str:
+    """
+    Render the full thread for projects that are already in ranked order.
+
+    Args:
+        projects: Ranked project records
+
+    Returns:
+        Thread content ready for TypefullyTool
+    """
+    intro = '\n\n'.join(THREAD_INTRO)
+    tweets = [tweet for i, project in enumerate(projects, 1) for tweet in render_project_tweets(i, project)]
+    return TWEET_SEPARATOR.join([intro] + tweets)
+
+
+def render_project_draft(project: Dict) -> str:
+    """
+    Render a project on its own, unnumbered, e.g. for a per-project draft to quote-tweet.
+
+    Returns:
+        Draft content ready for TypefullyTool (several tweets if the project doesn't fit in one)
+    """
+    return TWEET_SEPARATOR.join(render_project_tweets(None, project))
+
+
+def validate_thread(thread: str) -> List[Dict]:
+    """
+    Check every tweet of a thread against the length limit.
+
+    Returns:
+        One entry (index, length, text) per tweet that is too long; empty if the thread is valid
+    """
+    tweets = [t.strip() for t in re.split(r'\n{5,}', thread) if t.strip()]
+    return [
+        {'index': i, 'length': weighted_length(tweet), 'text': tweet}
+        for i, tweet in enumerate(tweets)
+        if weighted_length(tweet) > TWEET_MAX_LENGTH
+    ]
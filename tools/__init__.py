@@ -1,6 +1,20 @@
-from .gemini_video_tool import GeminiVideoTool
-from .twitter_tool import TwitterSearchTool
-from .typefully_tool import TypefullyTool
-from .file_reader_tool import FileReaderTool
+import importlib
 
-__all__ = ['GeminiVideoTool', 'TwitterSearchTool', 'TypefullyTool', 'FileReaderTool']
+# Tools are loaded on first access so importing one tool doesn't pull in the
+# client libraries (google-genai, openai, ...) of all the others.
+_TOOL_MODULES = {
+    'GeminiVideoTool': '.gemini_video_tool',
+    'TwitterSearchTool': '.twitter_tool',
+    'TypefullyTool': '.typefully_tool',
+    'TypefullyBatchPublisher': '.typefully_batch',
+    'FileReaderTool': '.file_reader_tool',
+}
+
+__all__ = list(_TOOL_MODULES)
+
+
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        module = importlib.import_module(_TOOL_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,213 @@
+"""
+Compact, structured video analyses for the agents.
+
+The default analysis asks Gemini for nine free-form sections and a timestamped
+transcription, and the whole response lands in the agent's context even though
+only the project name, description and tagline make it into the summary. In
+compact mode Gemini answers in JSON against COMPACT_SCHEMA instead. The agent
+gets just the fields the pipeline uses, and the transcript is written to
+output/transcripts/ for reference. The other fields are kept in output/analyses/,
+so the pipeline can store the team members in the project history.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRANSCRIPT_DIR = Path('output/transcripts')
+ANALYSIS_DIR = Path('output/analyses')
+
+COMPACT_PROMPT = (
+    "Analyze this hackathon project demo video. Fill in:\n"
+    "- name: the project name as presented\n"
+    "- description: one sentence describing what the project does\n"
+    "- tagline: a short catchy tagline or category\n"
+    "- team_members: names of the team members mentioned or shown (empty if none)\n"
+    "- highlights: up to three of the most impressive features or technical achievements, a few words each\n"
+    "- transcript: the transcribed audio, with [MM:SS] timestamps for salient events"
+)
+
+# OpenAPI-style schema accepted as GenerateContentConfig.response_schema
+COMPACT_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'name': {'type': 'STRING'},
+        'description': {'type': 'STRING'},
+        'tagline': {'type': 'STRING'},
+        'team_members': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'highlights': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'transcript': {'type': 'STRING'},
+    },
+    'required': ['name', 'description', 'tagline'],
+    'property_ordering': ['name', 'description', 'tagline', 'team_members', 'highlights', 'transcript'],
+}
+
+
+# Detailed guidance that is only sent as part of the cached instructions. Gemini
+# caches contexts from about a thousand tokens up, which COMPACT_PROMPT alone is
+# far from; with the guide and the schema the shared instructions clear that
+# minimum and are paid for once per run instead of once per video.
+COMPACT_GUIDE = """\
+How to fill in each field:
+
+name
+- Use the name the team gives the project on screen or out loud, with its original spelling and capitalization.
+- If the name appears in a title slide, a logo, a browser tab or a terminal prompt, prefer that written form over what you hear.
+- If the video never names the project, describe it in two or three words (for example "Receipt scanner") rather than inventing a brand name.
+- Do not include version numbers, emojis or the hackathon's name unless they are part of the project name itself.
+
+description
+- One sentence, at most about 25 words, saying what the project does and for whom.
+- Describe the working product that is demonstrated, not the team's ambitions or roadmap.
+- Mention the main technology only if it is central to what the project does (for example "uses on-device speech recognition").
+- Avoid marketing language such as "revolutionary", "game-changing" or "next-generation".
+- Write in the present tense and the third person ("Turns receipts into expense reports"), never "we" or "our".
+
+tagline
+- A short catchy line or category of at most eight words, suitable for a social media post.
+- If the team shows or says a tagline, use theirs; otherwise write one that matches the description.
+- Do not repeat the project name in the tagline.
+
+team_members
+- Full names of the people who built the project, as they are shown or introduced in the video.
+- Include people who present the project and people the presenters credit as teammates.
+- Do not include judges, mentors, sponsors, organizers, or people who only appear in the audience.
+- Social media handles, usernames and e-mail addresses are not names; leave them out unless no name is given at all.
+- Use an empty list when nobody is named. Never guess names from faces or voices.
+
+highlights
+- Up to three items, each a few words, naming the most impressive features or technical achievements that are actually demonstrated.
+- Prefer concrete, visible results ("live translation in under a second", "works offline on a phone") over generic claims ("great UX", "scalable").
+- Each highlight should stand on its own; do not repeat the description.
+- Leave the list empty rather than padding it with weak items.
+
+transcript
+- The complete spoken audio in the original language, in order, with [MM:SS] timestamps at the start of each new speaker turn, each slide or screen change, and at least every thirty seconds.
+- Mark who is speaking when it is clear from the video (for example "[01:05] Presenter:").
+- Add short bracketed notes for important visual moments that have no speech, such as "[02:10] (demo: the app scans a receipt and fills in the form)".
+- Do not summarize, correct or translate the speech. Write "[inaudible]" for parts that cannot be understood.
+- If the video has no speech, describe the key visual moments with timestamps instead.
+
+General rules
+- Base every field only on what is shown or said in the video segment you are given. Do not use outside knowledge about the team or the project.
+- If a field cannot be determined from the video, use an empty string (or an empty list) rather than guessing.
+- Keep names, product names and technical terms exactly as they are written or pronounced; do not expand or translate acronyms.
+- When the video shows slides with text, read them: project names, team member names and key numbers are often only written there.
+- When several projects appear (for example a recording of several demos), describe the one that takes up most of the video.
+- Timestamps are relative to the start of the video, even when you are given only a segment of it.
+- Answer with a single JSON object that matches the response schema below, with no surrounding text or code fences.
+
+Example of a good answer for a three-minute demo (transcript shortened):
+{
+  "name": "PaperTrail",
+  "description": "Turns photos of paper receipts into categorized expense reports that can be exported to accounting tools.",
+  "tagline": "Expenses on autopilot",
+  "team_members": ["Ada Lovelace", "Alan Turing"],
+  "highlights": ["reads crumpled receipts", "categorizes expenses automatically", "one-click export"],
+  "transcript": "[00:00] Ada: Hi, we built PaperTrail. [00:12] (slide: the problem with expense reports) [00:30] Ada: Every month our finance team ... [01:05] Alan: Let me show you the app. [01:10] (demo: a phone photographs a crumpled receipt) ..."
+}
+Notice that the description says what the product does rather than how the team feels about it, the tagline does not repeat the name, and the highlights are things the demo actually shows.
+"""
+
+
+def cached_instructions(prompt: str) -> str:
+    """
+    The instructions to store in the context cache for a compact analysis prompt.
+
+    COMPACT_PROMPT is extended with COMPACT_GUIDE and the response schema, so the
+    shared context is large enough for Gemini to cache. Other prompts are cached as they are.
+    """
+    if prompt != COMPACT_PROMPT:
+        return prompt
+    return f"{COMPACT_PROMPT}\n\n{COMPACT_GUIDE}\nResponse schema:\n{json.dumps(COMPACT_SCHEMA, indent=2)}"
+
+def parse_compact(text: str) -> Optional[Dict]:
+    """Parse a compact analysis response, or return None if it isn't the expected JSON object."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get('name'):
+        return None
+    return data
+
+
+def _video_file(video_path: str, directory: Path, suffix: str) -> Path:
+    # Named after the video plus a hash of its path, in case two videos share a name
+    path_hash = hashlib.sha1(str(Path(video_path).resolve()).encode()).hexdigest()[:8]
+    return Path(directory) / f"{Path(video_path).stem}_{path_hash}{suffix}"
+
+
+def save_transcript(video_path: str, transcript: str, transcript_dir: Path = TRANSCRIPT_DIR) -> Path:
+    """Write a video's transcript to disk, named after the video plus a hash of its path."""
+    transcript_path = _video_file(video_path, transcript_dir, '.txt')
+    transcript_path.parent.mkdir(parents=True, exist_ok=True)
+    transcript_path.write_text(transcript, encoding='utf-8')
+    return transcript_path
+
+
+def save_analysis(video_path: str, data: Dict, analysis_dir: Path = ANALYSIS_DIR) -> Path:
+    """Write a video's compact analysis fields, without the transcript, to disk."""
+    analysis_path = _video_file(video_path, analysis_dir, '.json')
+    analysis_path.parent.mkdir(parents=True, exist_ok=True)
+    fields = {key: value for key, value in data.items() if key != 'transcript'}
+    analysis_path.write_text(json.dumps(fields, indent=2), encoding='utf-8')
+    return analysis_path
+
+
+def load_team_members(video_path: str, since: Optional[float] = None, analysis_dir: Path = ANALYSIS_DIR) -> List[str]:
+    """
+    The team members found by a video's latest compact analysis.
+
+    Args:
+        video_path: Analyzed video
+        since: Ignore an analysis saved before this time (time.time()), e.g. one from an earlier run
+        analysis_dir: Directory the analyses were saved to
+
+    Returns:
+        The names, or an empty list if there is no (recent enough) analysis or it names nobody
+    """
+    analysis_path = _video_file(video_path, analysis_dir, '.json')
+    try:
+        if since is not None and analysis_path.stat().st_mtime < since:
+            return []
+        data = json.loads(analysis_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return []
+    members = data.get('team_members') if isinstance(data, dict) else None
+    if not isinstance(members, list):
+        return []
+    return [str(member).strip() for member in members if str(member).strip()]
+
+
+def format_compact(text: str, video_path: str, transcript_dir: Path = TRANSCRIPT_DIR,
+                   analysis_dir: Path = ANALYSIS_DIR) -> str:
+    """
+    Turn a compact analysis response into the short text the agent sees.
+
+    The transcript is saved to transcript_dir and only referenced by path, and the
+    other fields to analysis_dir. A response that isn't valid JSON is returned unchanged.
+    """
+    data = parse_compact(text)
+    if data is None:
+        logger.warning("Compact analysis didn't return the expected JSON, passing it on as is",
+                       extra={'video': video_path})
+        return text
+
+    save_analysis(video_path, data, analysis_dir)
+    lines = [
+        f"Project Name: {str(data['name']).strip()}",
+        f"Description: {str(data.get('description', '')).strip()}",
+        f"Tagline: {str(data.get('tagline', '')).strip()}",
+    ]
+    if data.get('team_members'):
+        lines.append(f"Team Members: {', '.join(data['team_members'])}")
+    if data.get('highlights'):
+        lines.append(f"Highlights: {'; '.join(data['highlights'])}")
+    if data.get('transcript'):
+        lines.append(f"Transcript: {save_transcript(video_path, data['transcript'], transcript_dir)}")
+    return '\n'.join(lines)
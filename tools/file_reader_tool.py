@@ -1,34 +1,127 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Any, List, Optional, Type
 from pydantic import BaseModel, Field
+import codecs
 import json
+import os
+import re
 from pathlib import Path
 
+# Most bytes returned by one call, so a large file can't flood the agent's context
+DEFAULT_MAX_BYTES = int(os.getenv("FILE_READER_MAX_BYTES", "20000"))
+
+# JSON has to be parsed whole for a path selection; larger files must be read by range
+MAX_JSON_PARSE_BYTES = 50 * 1024 * 1024
+
+_JSON_PATH_TOKEN = re.compile(r"\.\*|\[\*\]|\.([A-Za-z_][\w-]*)|\[(-?\d+)\]|\[['\"](.+?)['\"]\]")
+
+
+def select_json(data: Any, json_path: str) -> List[Any]:
+    """
+    Select values from parsed JSON with a JSONPath subset.
+
+    Supports `$` (optional), `.key`, `['key']`, `[index]` (negative too) and the
+    `*` / `[*]` wildcard, e.g. `$.projects[0].name` or `[*].summary`.
+
+    Returns:
+        Every matching value (empty if nothing matches)
+    """
+    path = json_path.strip()
+    if path.startswith('$'):
+        path = path[1:]
+    if path and path[0] not in '.[':
+        path = '.' + path
+
+    matches = [data]
+    position = 0
+    while position < len(path):
+        token = _JSON_PATH_TOKEN.match(path, position)
+        if token is None:
+            raise ValueError(f"Unsupported JSONPath syntax at '{path[position:]}'")
+        position = token.end()
+        key, index, quoted = token.group(1), token.group(2), token.group(3)
+
+        selected = []
+        for value in matches:
+            if token.group(0) in ('.*', '[*]'):
+                if isinstance(value, dict):
+                    selected.extend(value.values())
+                elif isinstance(value, list):
+                    selected.extend(value)
+            elif index is not None:
+                if isinstance(value, list) and -len(value) <= int(index) < len(value):
+                    selected.append(value[int(index)])
+            elif isinstance(value, dict) and (key or quoted) in value:
+                selected.append(value[key or quoted])
+        matches = selected
+    return matches
+
 
 class FileReaderToolInput(BaseModel):
     """Input schema for FileReaderTool."""
     file_path: str = Field(
         description="Path to the file to read"
     )
+    start_line: Optional[int] = Field(
+        default=None,
+        description="First line to read, 1-based (optional)"
+    )
+    end_line: Optional[int] = Field(
+        default=None,
+        description="Last line to read, inclusive (optional)"
+    )
+    start_byte: Optional[int] = Field(
+        default=None,
+        description="Byte offset to start reading at (optional)"
+    )
+    end_byte: Optional[int] = Field(
+        default=None,
+        description="Byte offset to stop reading at, exclusive (optional)"
+    )
+    json_path: Optional[str] = Field(
+        default=None,
+        description="For JSON files, return only the values at this path, e.g. '$.projects[0].name' or '[*].summary'"
+    )
+    max_bytes: Optional[int] = Field(
+        default=None,
+        description=f"Maximum bytes to return (default: {DEFAULT_MAX_BYTES}); longer output ends with a truncation marker"
+    )
 
 
 class FileReaderTool(BaseTool):
     name: str = "file_reader"
     description: str = (
         "Read the contents of a file. "
-        "Useful for reading JSON files, text files, or any other file content."
+        "Useful for reading JSON files, text files, or any other file content. "
+        "Large files are truncated with a marker saying how to read more: use start_line/end_line "
+        "or start_byte/end_byte to read part of a file, and json_path to select part of a JSON file."
     )
     args_schema: Type[BaseModel] = FileReaderToolInput
 
-    def _run(self, file_path: str) -> str:
+    def _run(
+        self,
+        file_path: str,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        start_byte: Optional[int] = None,
+        end_byte: Optional[int] = None,
+        json_path: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> str:
         """
-        Read the contents of a file.
+        Read a file, or part of it, without loading more than needed.
 
         Args:
             file_path: Path to the file to read
+            start_line: First line to read (1-based)
+            end_line: Last line to read (inclusive)
+            start_byte: Byte offset to start at
+            end_byte: Byte offset to stop at (exclusive)
+            json_path: JSONPath selection for JSON files
+            max_bytes: Maximum bytes to return
 
         Returns:
-            The contents of the file as a string
+            The requested contents as a string, with a truncation marker if capped
         """
         try:
             path = Path(file_path)
@@ -39,20 +132,94 @@ class FileReaderTool(BaseTool):
             if not path.is_file():
                 return f"Error: '{file_path}' is not a file"
 
-            # Read the file content
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            max_bytes = max_bytes or DEFAULT_MAX_BYTES
+            size = path.stat().st_size
 
-            # If it's a JSON file, try to pretty print it
-            if path.suffix.lower() == '.json':
+            if json_path:
+                return self._read_json_path(path, json_path, size, max_bytes)
+            if start_line is not None or end_line is not None:
+                return self._read_lines(path, start_line or 1, end_line, size, max_bytes)
+            if start_byte is not None or end_byte is not None:
+                return self._read_bytes(path, start_byte or 0, end_byte, size, max_bytes)
+
+            # Small JSON files are pretty printed as before
+            if path.suffix.lower() == '.json' and size <= max_bytes:
+                content = path.read_text(encoding='utf-8')
                 try:
-                    data = json.loads(content)
-                    return json.dumps(data, indent=2)
+                    pretty = json.dumps(json.loads(content), indent=2)
+                    if len(pretty.encode('utf-8')) <= max_bytes:
+                        return pretty
                 except json.JSONDecodeError:
                     # If JSON parsing fails, return raw content
                     pass
+                return content
 
-            return content
+            return self._read_bytes(path, 0, None, size, max_bytes)
 
         except Exception as e:
             return f"Error reading file: {str(e)}"
+
+    @staticmethod
+    def _read_bytes(path: Path, start: int, end: Optional[int], size: int, max_bytes: int) -> str:
+        end = size if end is None else min(end, size)
+        length = max(0, end - start)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(min(length, max_bytes))
+
+        # Don't split a multi-byte character at the cut; the next read starts at its first byte
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        text = decoder.decode(chunk, final=len(chunk) == length)
+        consumed = len(chunk) - len(decoder.getstate()[0])
+
+        if consumed < length:
+            text += (f"\n\n[... truncated: returned bytes {start}-{start + consumed} of {size}. "
+                     f"Continue with start_byte={start + consumed} ...]")
+        return text
+
+    @staticmethod
+    def _read_lines(path: Path, start: int, end: Optional[int], size: int, max_bytes: int) -> str:
+        lines = []
+        used = 0
+        offset = 0
+        with open(path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if number < start:
+                    offset += len(line)
+                    continue
+                if end is not None and number > end:
+                    break
+                if used + len(line) > max_bytes:
+                    if lines:
+                        lines.append(f"\n[... truncated: returned lines {start}-{number - 1} of a {size} byte file. "
+                                     f"Continue with start_line={number} ...]")
+                    else:
+                        # A single line over the cap: return its start and point at the rest by byte offset
+                        lines.append(line[:max_bytes].decode('utf-8', errors='ignore'))
+                        lines.append(f"\n\n[... truncated: line {number} is {len(line)} bytes. "
+                                     f"Continue with start_byte={offset + max_bytes} ...]")
+                    break
+                lines.append(line.decode('utf-8', errors='replace'))
+                used += len(line)
+                offset += len(line)
+        return ''.join(lines)
+
+    @staticmethod
+    def _read_json_path(path: Path, json_path: str, size: int, max_bytes: int) -> str:
+        if size > MAX_JSON_PARSE_BYTES:
+            return (f"Error: '{path}' is too large ({size} bytes) to select from with json_path; "
+                    f"read it with start_line/end_line instead")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        matches = select_json(data, json_path)
+        if not matches:
+            return f"No values found at '{json_path}'"
+        result = json.dumps(matches[0] if len(matches) == 1 else matches, indent=2, ensure_ascii=False)
+
+        encoded = result.encode('utf-8')
+        if len(encoded) <= max_bytes:
+            return result
+        return (encoded[:max_bytes].decode('utf-8', errors='ignore') +
+                f"\n\n[... truncated: selection is {len(encoded)} bytes. Select a narrower json_path, "
+                f"e.g. '{json_path}[0]' ...]")
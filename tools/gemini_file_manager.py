@@ -0,0 +1,271 @@
+"""
+Lifecycle and quota management for videos uploaded to the Gemini File API.
+
+Uploads count against the project's File API storage quota until they are
+deleted or expire after 48 hours. While a run's file manager is open,
+GeminiVideoTool gets its uploads from the manager instead of uploading directly:
+
+- a video already uploaded during the run (e.g. by the triage pass) is reused;
+- an upload that would take storage over the quota's high-water mark first
+  evicts the least recently used files no analysis is using, and otherwise
+  waits for space instead of failing;
+- every file the run uploaded is deleted when the run ends.
+
+Files in the project that the manager didn't upload (other processes, earlier
+runs) are counted towards the quota but never deleted. Without an open manager,
+the tool deletes its upload as soon as the analysis is done.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from logging_config import get_logger
+from .resumable_upload import upload_video
+
+logger = get_logger(__name__)
+
+# File API storage per project
+DEFAULT_QUOTA_BYTES = int(float(os.getenv("GEMINI_FILE_QUOTA_GB", "20")) * 1024 ** 3)
+
+# Fraction of the quota the manager fills before it evicts or waits
+HIGH_WATER_MARK = 0.9
+
+# Uploaded files are deleted by Gemini after this long
+FILE_TTL_SECONDS = 48 * 3600
+
+_active_manager: Optional["GeminiFileManager"] = None
+
+
+class FileQuotaError(RuntimeError):
+    """No room for an upload within the file storage quota."""
+
+
+def delete_file(client, name: str) -> bool:
+    """Delete an uploaded file, logging instead of raising on failure."""
+    try:
+        client.files.delete(name=name)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not delete uploaded file {name} (it expires on its own): {e}")
+        return False
+
+
+class GeminiFileManager:
+    """Tracks the files a run uploads, with LRU eviction under a storage quota."""
+
+    def __init__(self, quota_bytes: int = DEFAULT_QUOTA_BYTES, high_water_mark: float = HIGH_WATER_MARK,
+                 admission_timeout: float = 1800, poll_interval: float = 10.0):
+        """
+        Args:
+            quota_bytes: File API storage quota of the project
+            high_water_mark: Fraction of the quota uploads may fill
+            admission_timeout: Seconds an upload may wait for space before FileQuotaError
+            poll_interval: Seconds between checks for space freed elsewhere while waiting
+        """
+        self.settings = {'quota_bytes': quota_bytes, 'high_water_mark': high_water_mark,
+                         'admission_timeout': admission_timeout, 'poll_interval': poll_interval}
+        self.limit = int(quota_bytes * high_water_mark)
+        self.admission_timeout = admission_timeout
+        self.poll_interval = poll_interval
+        # Least recently used first
+        self._files: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._uploading = set()
+        self._reserved = 0
+        # Evicted files whose deletion is still in flight
+        self._deleting = 0
+        self._external = None
+        self._condition = threading.Condition()
+        self.stats = {'uploaded': 0, 'reused': 0, 'evicted': 0, 'waited': 0.0, 'peak_bytes': 0}
+
+    @staticmethod
+    def _key(video_path: str) -> Tuple:
+        stat = os.stat(video_path)
+        return str(Path(video_path).resolve()), stat.st_size, stat.st_mtime_ns
+
+    def usage(self) -> int:
+        """Bytes used or reserved in the File API, including files the manager didn't upload."""
+        return (sum(entry['size'] for entry in self._files.values()) + self._reserved + self._deleting
+                + (self._external or 0))
+
+    def _refresh_external(self, client) -> None:
+        # Storage used by files this manager doesn't track, as reported by the File API
+        tracked = {entry['name'] for entry in self._files.values()}
+        try:
+            self._external = sum(
+                getattr(f, 'size_bytes', 0) or 0 for f in client.files.list() if f.name not in tracked
+            )
+        except Exception as e:
+            logger.warning(f"Could not list uploaded files, counting this run's uploads only: {e}")
+            self._external = self._external or 0
+
+    def _drop_expired(self) -> None:
+        now = time.time()
+        for key in [key for key, entry in self._files.items() if entry['expires_at'] <= now]:
+            del self._files[key]
+
+    def _evict_one(self) -> bool:
+        # Called with the lock held. The entry is taken out under the lock, but the lock is
+        # released for the delete call so other threads aren't blocked on the network;
+        # its size still counts as used until the file is gone.
+        key = next((key for key, entry in self._files.items() if entry['users'] == 0), None)
+        if key is None:
+            return False
+        entry = self._files.pop(key)
+        self._deleting += entry['size']
+        self._condition.release()
+        try:
+            delete_file(entry['client'], entry['name'])
+        finally:
+            self._condition.acquire()
+            self._deleting -= entry['size']
+            self._condition.notify_all()
+        self.stats['evicted'] += 1
+        logger.info(f"Evicted {entry['name']} ({entry['size'] / (1024 * 1024):.1f}MB) to make room",
+                    extra={'video': key[0]})
+        return True
+
+    def acquire(self, client, video_path: str, api_key: Optional[str] = None,
+                timeout: Optional[float] = None) -> str:
+        """
+        Get the File API name of a video, uploading it once there is room (blocking).
+
+        Every acquire must be paired with a release once the file is no longer needed.
+
+        Args:
+            client: google-genai Client, or a stand-in with the same files methods
+            video_path: Video to upload
+            api_key: Gemini API key for resumable uploads (GOOGLE_API_KEY if omitted)
+            timeout: Seconds to wait for space (admission_timeout if omitted, 0 to fail at once)
+
+        Returns:
+            The File API name of the upload (e.g. 'files/abc123')
+
+        Raises:
+            FileQuotaError: The video doesn't fit in the quota, or no room was freed in time
+        """
+        key = self._key(video_path)
+        size = key[1]
+        timeout = self.admission_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waiting_since = None
+
+        with self._condition:
+            if self._external is None:
+                self._refresh_external(client)
+            while True:
+                self._drop_expired()
+                entry = self._files.get(key)
+                if entry is not None:
+                    entry['users'] += 1
+                    self._files.move_to_end(key)
+                    self.stats['reused'] += 1
+                    return entry['name']
+                if key not in self._uploading:
+                    if size > self.limit:
+                        raise FileQuotaError(f"{Path(video_path).name} ({size / 1024 ** 3:.1f}GB) is larger than "
+                                             f"the file storage limit ({self.limit / 1024 ** 3:.1f}GB)")
+                    if self.usage() + size <= self.limit:
+                        break
+                    if self._evict_one():
+                        continue
+
+                # Another thread is uploading the same video, or every file is in use: wait
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise FileQuotaError(f"No room for {Path(video_path).name} in the file storage quota "
+                                         f"after waiting {timeout:.0f}s")
+                if waiting_since is None:
+                    waiting_since = time.monotonic()
+                    if key not in self._uploading:
+                        logger.info(f"Waiting for file storage space for {Path(video_path).name}",
+                                    extra={'video': video_path, 'usage_bytes': self.usage()})
+                if not self._condition.wait(min(remaining, self.poll_interval)):
+                    # Nothing released here for a while: check for space freed by other processes
+                    self._refresh_external(client)
+
+            if waiting_since is not None:
+                self.stats['waited'] += time.monotonic() - waiting_since
+            self._uploading.add(key)
+            self._reserved += size
+            self.stats['peak_bytes'] = max(self.stats['peak_bytes'], self.usage())
+
+        name = None
+        try:
+            name = upload_video(client, video_path, api_key)
+        finally:
+            with self._condition:
+                self._uploading.discard(key)
+                self._reserved -= size
+                if name is not None:
+                    self._files[key] = {'name': name, 'size': size, 'users': 1, 'client': client,
+                                        'expires_at': time.time() + FILE_TTL_SECONDS}
+                    self.stats['uploaded'] += 1
+                self._condition.notify_all()
+        return name
+
+    def release(self, name: str) -> None:
+        """Mark an acquired file as no longer in use; it stays uploaded until evicted or closed."""
+        with self._condition:
+            for key, entry in self._files.items():
+                if entry['name'] == name:
+                    entry['users'] = max(entry['users'] - 1, 0)
+                    self._files.move_to_end(key)
+                    break
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Delete every file uploaded through the manager."""
+        with self._condition:
+            files = list(self._files.values())
+            self._files.clear()
+            self._condition.notify_all()
+        deleted = sum(delete_file(entry['client'], entry['name']) for entry in files)
+        if files:
+            logger.info(f"Deleted {deleted}/{len(files)} uploaded video file(s)",
+                        extra={'deleted_files': deleted, **self.stats})
+
+
+@contextmanager
+def uploaded_video(client, video_path: str, api_key: Optional[str] = None) -> Iterator[str]:
+    """
+    Upload a video for the duration of a with block, yielding its File API name.
+
+    Uses the run's file manager when one is open; otherwise the upload is
+    deleted when the block exits.
+    """
+    manager = _active_manager
+    if manager is not None:
+        name = manager.acquire(client, video_path, api_key)
+    else:
+        name = upload_video(client, video_path, api_key)
+    try:
+        yield name
+    finally:
+        if manager is not None:
+            manager.release(name)
+        else:
+            delete_file(client, name)
+
+
+def open_file_manager(**kwargs) -> GeminiFileManager:
+    """Open the run's file manager; GeminiVideoTool uses it until close_file_manager()."""
+    global _active_manager
+    _active_manager = GeminiFileManager(**kwargs)
+    return _active_manager
+
+
+def active_file_manager() -> Optional[GeminiFileManager]:
+    """The file manager of the current run, if one is open."""
+    return _active_manager
+
+
+def close_file_manager() -> None:
+    """Delete the current run's uploads and stop managing files."""
+    global _active_manager
+    if _active_manager is not None:
+        _active_manager.close()
+        _active_manager = None
@@ -0,0 +1,118 @@
+"""
+Run-scoped Gemini context cache for the instructions shared by every video.
+
+While a cache is open, GeminiVideoTool stores each distinct instruction block
+(per model) as cached content the first time it's used, and later calls
+reference it instead of resending the text. The cache expires with the run and
+is deleted explicitly when the run ends.
+
+Gemini only caches contexts above a minimum size. The compact analysis caches
+its prompt together with a detailed guide and the response schema, which clears
+it (see compact_analysis.cached_instructions). Blocks are sized locally rather
+than with a count_tokens call, and blocks that are too small, or that Gemini
+refuses to cache, are remembered and sent inline for the rest of the run.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Smallest context Gemini accepts for explicit caching
+MIN_CACHE_TOKENS = int(os.getenv("GEMINI_CACHE_MIN_TOKENS", "1024"))
+
+# Rough size of a token in English text, used to size instruction blocks without an API call
+CHARS_PER_TOKEN = 4
+
+_active_cache: Optional["PromptCache"] = None
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Approximate number of tokens in a text."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+class PromptCache:
+    """Cached contents for shared instruction blocks, keyed by model and text."""
+
+    def __init__(self, ttl_seconds: float = 3600, min_tokens: int = MIN_CACHE_TOKENS):
+        """
+        Args:
+            ttl_seconds: Lifetime of cached contents, normally the run's time budget
+            min_tokens: Instruction blocks below this size are not cached
+        """
+        self.ttl_seconds = max(int(ttl_seconds), 60)
+        self.min_tokens = min_tokens
+        self._entries: Dict[Tuple[str, str], Optional[str]] = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, client, model: str, instructions: str) -> Optional[str]:
+        """
+        Get the cached content name for an instruction block, creating it on first use.
+
+        Returns:
+            Name of the cached content, or None if the block should be sent inline
+        """
+        key = (model, instructions)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+
+            name = None
+            tokens = estimate_text_tokens(instructions)
+            try:
+                if tokens >= self.min_tokens:
+                    from google.genai import types
+
+                    cached = client.caches.create(
+                        model=model,
+                        config=types.CreateCachedContentConfig(
+                            display_name="hackreporter-analysis-instructions",
+                            system_instruction=instructions,
+                            ttl=f"{self.ttl_seconds}s"
+                        )
+                    )
+                    name = cached.name
+                    self._clients[name] = client
+                    logger.info(f"Cached analysis instructions (~{tokens} tokens) as {name}")
+            except Exception as e:
+                # Caching is an optimization only: fall back to inline instructions
+                logger.warning(f"Context caching unavailable, sending instructions inline: {e}")
+
+            # Remembered either way, so every block is sized or created once per run
+            self._entries[key] = name
+            return name
+
+    def close(self) -> None:
+        """Delete every cached content created during the run."""
+        with self._lock:
+            for name, client in self._clients.items():
+                try:
+                    client.caches.delete(name=name)
+                except Exception as e:
+                    logger.warning(f"Could not delete cached content {name} (it expires on its own): {e}")
+            self._clients.clear()
+            self._entries.clear()
+
+
+def open_prompt_cache(ttl_seconds: float = 3600) -> PromptCache:
+    """Open the run's prompt cache; GeminiVideoTool uses it until close_prompt_cache()."""
+    global _active_cache
+    _active_cache = PromptCache(ttl_seconds)
+    return _active_cache
+
+
+def active_prompt_cache() -> Optional[PromptCache]:
+    """The prompt cache of the current run, if one is open."""
+    return _active_cache
+
+
+def close_prompt_cache() -> None:
+    """Delete the current run's cached contents and stop caching."""
+    global _active_cache
+    if _active_cache is not None:
+        _active_cache.close()
+        _active_cache = None
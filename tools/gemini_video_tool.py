@@ -1,11 +1,22 @@
 from crewai.tools import BaseTool
 from typing import Type, Any, Optional, Dict
 from pydantic import BaseModel, Field
-from google import genai
 import os
 import time
 from pathlib import Path
 
+from discovery import mime_type_for
+from sampling import estimate_tokens, sampling_for_video, segment_length
+from logging_config import get_logger
+from .compact_analysis import COMPACT_PROMPT, COMPACT_SCHEMA, cached_instructions, format_compact
+from .gemini_prompt_cache import active_prompt_cache
+from .gemini_file_manager import uploaded_video
+
+logger = get_logger(__name__)
+
+# Compact analyses are the default; set GEMINI_COMPACT_ANALYSIS=false for the full free-form report
+COMPACT_BY_DEFAULT = os.getenv("GEMINI_COMPACT_ANALYSIS", "true").lower() not in ("0", "false", "no")
+
 
 class GeminiVideoToolInput(BaseModel):
     """Input schema for GeminiVideoTool."""
@@ -23,13 +34,22 @@ class GeminiVideoToolInput(BaseModel):
         description="End time for video clip in MM:SS format (e.g., '02:45')"
     )
     fps: Optional[float] = Field(
-        default=1.0,
-        description="Frames per second to sample (default: 1 FPS)"
+        default=None,
+        description="Frames per second to sample (default: chosen from the video's duration to fit the token budget)"
     )
     transcribe: bool = Field(
         default=False,
         description="Whether to transcribe audio with timestamps"
     )
+    model: str = Field(
+        default="gemini-2.0-flash",
+        description="Gemini model to use (e.g. a smaller model for a quick first pass)"
+    )
+    compact: bool = Field(
+        default=COMPACT_BY_DEFAULT,
+        description=("Return only the project name, description, tagline, team and highlights "
+                     "(the transcript is saved to a file); ignored with a custom prompt")
+    )
 
 
 class GeminiVideoTool(BaseTool):
@@ -47,8 +67,10 @@ class GeminiVideoTool(BaseTool):
         prompt: Optional[str] = None,
         start_time: Optional[str] = None,
         end_time: Optional[str] = None,
-        fps: Optional[float] = 1.0,
-        transcribe: bool = False
+        fps: Optional[float] = None,
+        transcribe: bool = False,
+        model: str = "gemini-2.0-flash",
+        compact: bool = COMPACT_BY_DEFAULT
     ) -> str:
         """
         Analyze a video using Gemini API with advanced video understanding features.
@@ -59,13 +81,19 @@ class GeminiVideoTool(BaseTool):
             prompt: Custom prompt for analysis
             start_time: Start time for video clip (MM:SS format)
             end_time: End time for video clip (MM:SS format)
-            fps: Frames per second to sample
+            fps: Frames per second to sample (chosen automatically if omitted)
             transcribe: Whether to transcribe audio with timestamps
+            model: Gemini model to use
+            compact: Ask for the structured compact analysis instead of the full report
+                (only without a custom prompt; the transcript goes to output/transcripts/)
 
         Returns:
             Analysis results as a string
         """
         try:
+            from google import genai
+            from google.genai import types
+
             # Configure Gemini API
             api_key = os.getenv("GOOGLE_API_KEY")
             if not api_key:
@@ -77,8 +105,12 @@ class GeminiVideoTool(BaseTool):
             # Get file size for metadata
             file_size = os.path.getsize(video_path) / (1024 * 1024)  # Size in MB
 
-            # Prepare the analysis prompt
-            if transcribe:
+            # Prepare the analysis prompt. The compact analysis always includes the
+            # transcript, since it is saved to disk rather than returned.
+            compact = compact and not prompt
+            if compact:
+                analysis_prompt = COMPACT_PROMPT
+            elif transcribe:
                 analysis_prompt = (
                     "Transcribe the audio from this video, giving timestamps for salient events. "
                     "Also provide visual descriptions of what's happening at key moments. "
@@ -89,7 +121,7 @@ class GeminiVideoTool(BaseTool):
             # Add custom prompt or default hackathon analysis
             if prompt:
                 analysis_prompt += prompt
-            else:
+            elif not compact:
                 analysis_prompt += (
                     "Analyze this hackathon project video and provide:\n"
                     "1. Project name and what it does\n"
@@ -103,68 +135,114 @@ class GeminiVideoTool(BaseTool):
                     "9. Demo highlights and visual elements"
                 )
 
-            # Add metadata to prompt if clipping or custom FPS specified
+            # Add metadata to prompt if clipping. This part differs per video, so it's kept
+            # apart from the shared instructions that can be served from the context cache.
+            segment_note = ""
             if start_time or end_time:
-                analysis_prompt += f"\n\nPlease focus on the video segment from {start_time or 'start'} to {end_time or 'end'}."
-            if fps != 1.0:
-                analysis_prompt += f"\n\nNote: The video is sampled at {fps} FPS for this analysis."
-
-            print(f"Uploading video file ({file_size:.1f}MB) using File API...")
-
-            # Upload the video file
-            video_file = client.files.upload(file=video_path)
-
-            # Wait for file to be processed
-            print("Waiting for video to be processed...")
-
-            # Poll until the file is ready
-            for _ in range(30):  # Max 60 seconds wait
-                time.sleep(2)
-                file_info = client.files.get(name=video_file.name)
-                if file_info.state.name == "ACTIVE":
-                    break
-                elif file_info.state.name == "FAILED":
-                    return f"Error: Video processing failed"
-                print(".", end="", flush=True)
-            else:
-                return "Error: Video processing timeout - file not ready after 60 seconds"
-
-            print("\nVideo processed successfully. Generating analysis...")
+                segment_note = f"\n\nPlease focus on the video segment from {start_time or 'start'} to {end_time or 'end'}."
+
+            # Sampling: the fps is chosen from the length of the analyzed segment so it fits
+            # the token budget, unless it was given explicitly
+            start_offset = self._parse_timestamp(start_time)
+            end_offset = self._parse_timestamp(end_time)
+            sampling = sampling_for_video(video_path, start_offset=start_offset, end_offset=end_offset)
+            if fps is not None:
+                sampling.update(fps=fps, end_offset=end_offset, policy='manual')
+                if sampling['duration'] > 0:
+                    segment = segment_length(sampling['duration'], start_offset, end_offset)
+                    sampling['estimated_tokens'] = estimate_tokens(segment, fps)
+            end_offset = sampling['end_offset']
+
+            logger.info(f"Uploading video file ({file_size:.1f}MB) using File API...",
+                        extra={'video': video_path, 'size_mb': round(file_size, 1)})
+
+            # Upload the video file, in resumable chunks if it is large. With a run's file
+            # manager open, the upload is shared and kept until the run ends; otherwise it
+            # is deleted once the analysis is done.
+            with uploaded_video(client, video_path, api_key) as video_name:
+                # Wait for file to be processed
+                logger.debug("Waiting for video to be processed...", extra={'video': video_path})
+
+                # Poll until the file is ready (a reused upload already is)
+                processing_timeout = int(os.getenv("GEMINI_PROCESSING_TIMEOUT", "60"))
+                ready_by = time.monotonic() + processing_timeout
+                while True:
+                    file_info = client.files.get(name=video_name)
+                    if file_info.state.name == "ACTIVE":
+                        break
+                    elif file_info.state.name == "FAILED":
+                        return f"Error: Video processing failed"
+                    if time.monotonic() >= ready_by:
+                        return f"Error: Video processing timeout - file not ready after {processing_timeout} seconds"
+                    logger.debug(f"Still processing {video_name}", extra={'video': video_path})
+                    time.sleep(2)
+
+                logger.info("Video processed successfully. Generating analysis...", extra={'video': video_path})
+
+                video_metadata = types.VideoMetadata(
+                    fps=sampling['fps'],
+                    start_offset=f"{start_offset}s" if start_offset is not None else None,
+                    end_offset=f"{end_offset}s" if end_offset is not None else None
+                )
+                video_part = types.Part(
+                    file_data=types.FileData(file_uri=file_info.uri, mime_type=file_info.mime_type),
+                    video_metadata=video_metadata
+                )
 
-            # Generate analysis using the processed file
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=[file_info, analysis_prompt]
-            )
+                # Shared instructions come from the run's context cache when one is open
+                prompt_cache = active_prompt_cache()
+                cached_content = (prompt_cache.lookup(client, model, cached_instructions(analysis_prompt))
+                                  if prompt_cache else None)
+                config_args = {}
+                if compact:
+                    config_args.update(response_mime_type='application/json', response_schema=COMPACT_SCHEMA)
+                if cached_content:
+                    contents = [video_part] + ([segment_note.strip()] if segment_note else [])
+                    config_args['cached_content'] = cached_content
+                else:
+                    contents = [video_part, analysis_prompt + segment_note]
+                config = types.GenerateContentConfig(**config_args) if config_args else None
+
+                # Generate analysis using the processed file
+                response = client.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config
+                )
 
             # Format the response
-            result = response.text
+            result = format_compact(response.text, video_path) if compact else response.text
 
             # Add metadata about the analysis
             result += f"\n\n--- Video Analysis Metadata ---\n"
             result += f"Video: {Path(video_path).name}\n"
             result += f"Size: {file_size:.1f}MB\n"
-            result += f"FPS Sampling: {fps}\n"
-            if start_time or end_time:
-                result += f"Clip: {start_time or '00:00'} - {end_time or 'end'}\n"
+            result += f"FPS Sampling: {sampling['fps']} ({sampling['policy']})\n"
+            result += f"Model: {model}\n"
+            if cached_content:
+                result += f"Cached Instructions: {cached_content}\n"
+            if sampling['duration'] > 0:
+                result += f"Duration: {sampling['duration']:.0f}s\n"
+            if start_offset is not None or end_offset is not None:
+                result += f"Clip: {start_offset or 0}s - {f'{end_offset}s' if end_offset is not None else 'end'}\n"
+            if sampling['estimated_tokens'] is not None:
+                result += f"Estimated Video Tokens: {sampling['estimated_tokens']} (budget {sampling['budget']})\n"
 
             return result
 
         except Exception as e:
             return f"Error analyzing video: {str(e)}"
 
+    @staticmethod
+    def _parse_timestamp(timestamp: Optional[str]) -> Optional[int]:
+        """Convert an MM:SS (or HH:MM:SS) timestamp to seconds."""
+        if not timestamp:
+            return None
+        seconds = 0
+        for part in timestamp.strip().split(':'):
+            seconds = seconds * 60 + int(part)
+        return seconds
+
     def _get_mime_type(self, video_path: str) -> str:
         """Determine MIME type from file extension."""
-        ext = Path(video_path).suffix.lower()
-        mime_types = {
-            '.mp4': 'video/mp4',
-            '.mpeg': 'video/mpeg',
-            '.mpg': 'video/mpg',
-            '.mov': 'video/mov',
-            '.avi': 'video/avi',
-            '.flv': 'video/x-flv',
-            '.webm': 'video/webm',
-            '.wmv': 'video/wmv',
-            '.3gpp': 'video/3gpp'
-        }
-        return mime_types.get(ext, 'video/mp4')
+        return mime_type_for(video_path)
@@ -0,0 +1,200 @@
+"""
+Resumable, chunked uploads to the Gemini File API.
+
+`client.files.upload` sends a video in a single request, so a dropped connection
+near the end of a large file restarts the upload from zero. ResumableUploader
+uses the File API's resumable protocol instead: it opens an upload session, then
+sends the file in fixed-size chunks sliced from a memory-mapped file, one chunk
+in memory at a time. A chunk that fails is retried with exponential backoff after
+asking the server how many bytes it actually received, so a failure costs at most
+one chunk.
+"""
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from discovery import mime_type_for
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+UPLOAD_URL = "https://generativelanguage.googleapis.com/upload/v1beta/files"
+
+# Chunks must be a multiple of this size, except the last one
+CHUNK_GRANULARITY = 256 * 1024
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("GEMINI_UPLOAD_CHUNK_MB", "8")) * 1024 * 1024
+
+# Files at least this large are uploaded resumably; smaller ones in one request
+RESUMABLE_THRESHOLD = int(os.getenv("GEMINI_RESUMABLE_THRESHOLD_MB", "20")) * 1024 * 1024
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class ResumableUploadError(RuntimeError):
+    """An upload that could not be completed."""
+
+
+class _RetryableResponse(Exception):
+    pass
+
+
+class ResumableUploader:
+    """Upload files to the Gemini File API in retryable chunks."""
+
+    def __init__(self, api_key: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_retries: int = 5, backoff: float = 1.0, timeout: float = 120.0, session=None,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Args:
+            api_key: Gemini API key (GOOGLE_API_KEY if omitted)
+            chunk_size: Bytes per chunk, rounded down to a multiple of 256 KiB
+            max_retries: Consecutive failed attempts allowed before the upload is given up
+            backoff: Seconds before the first retry, doubled on every further retry
+            timeout: Seconds each HTTP request may take
+            session: requests.Session, or a stand-in with the same post method (created if omitted)
+            progress: Called with (bytes uploaded, total bytes) after every chunk (optional)
+        """
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.chunk_size = max(chunk_size // CHUNK_GRANULARITY, 1) * CHUNK_GRANULARITY
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._session = session
+        self.progress = progress
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def _post(self, url: str, headers: Dict, **kwargs):
+        response = self.session.post(url, headers={'x-goog-api-key': self.api_key, **headers},
+                                     timeout=self.timeout, **kwargs)
+        if response.status_code in RETRYABLE_STATUS:
+            raise _RetryableResponse(f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            raise ResumableUploadError(f"Upload failed with HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _wait(self, failures: int, error: Exception, what: str) -> None:
+        if failures > self.max_retries:
+            raise ResumableUploadError(f"{what} failed after {failures} attempts: {error}") from error
+        delay = self.backoff * 2 ** (failures - 1)
+        logger.warning(f"{what} failed ({error}), retrying in {delay:.0f}s")
+        time.sleep(delay)
+
+    def start(self, size: int, mime_type: str, display_name: str) -> str:
+        """Open an upload session and return its upload URL."""
+        failures = 0
+        while True:
+            try:
+                response = self._post(UPLOAD_URL, {
+                    'X-Goog-Upload-Protocol': 'resumable',
+                    'X-Goog-Upload-Command': 'start',
+                    'X-Goog-Upload-Header-Content-Length': str(size),
+                    'X-Goog-Upload-Header-Content-Type': mime_type,
+                    'Content-Type': 'application/json',
+                }, json={'file': {'display_name': display_name}})
+            except (OSError, _RetryableResponse) as e:
+                failures += 1
+                self._wait(failures, e, "Starting the upload")
+                continue
+            upload_url = response.headers.get('X-Goog-Upload-URL')
+            if not upload_url:
+                raise ResumableUploadError("Upload session was not created (no upload URL returned)")
+            return upload_url
+
+    def query(self, upload_url: str) -> Tuple[int, Optional[Dict]]:
+        """
+        Ask the server how much of the file it has received.
+
+        Returns:
+            (bytes received, file resource if the upload is already finalized, else None)
+        """
+        response = self._post(upload_url, {'X-Goog-Upload-Command': 'query'})
+        received = int(response.headers.get('X-Goog-Upload-Size-Received', 0))
+        if response.headers.get('X-Goog-Upload-Status') == 'final':
+            return received, response.json()['file']
+        return received, None
+
+    def upload(self, path: str, mime_type: Optional[str] = None, display_name: Optional[str] = None) -> Dict:
+        """
+        Upload a file (blocking).
+
+        Args:
+            path: File to upload
+            mime_type: MIME type (guessed from the file if omitted)
+            display_name: Name shown in the File API (the file name if omitted)
+
+        Returns:
+            The File API resource of the uploaded file (name, uri, mimeType, state, ...)
+        """
+        path = Path(path)
+        size = path.stat().st_size
+        upload_url = self.start(size, mime_type or mime_type_for(path), display_name or path.name)
+        logger.debug(f"Resumable upload of {path.name} ({size / (1024 * 1024):.1f}MB) in "
+                     f"{self.chunk_size / (1024 * 1024):g}MB chunks", extra={'video': str(path)})
+
+        with open(path, 'rb') as f:
+            # mmap can't map an empty file
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            try:
+                return self._upload_chunks(upload_url, data, size, path)
+            finally:
+                if size:
+                    data.close()
+
+    def _upload_chunks(self, upload_url: str, data, size: int, path: Path) -> Dict:
+        offset = 0
+        failures = 0
+        while True:
+            end = min(offset + self.chunk_size, size)
+            final = end == size
+            try:
+                response = self._post(upload_url, {
+                    'X-Goog-Upload-Command': 'upload, finalize' if final else 'upload',
+                    'X-Goog-Upload-Offset': str(offset),
+                }, data=data[offset:end])
+            except (OSError, _RetryableResponse) as e:
+                failures += 1
+                self._wait(failures, e, f"Chunk at byte {offset} of {path.name}")
+                # Resume from what the server actually has, which may be part of the chunk
+                try:
+                    received, uploaded = self.query(upload_url)
+                except (OSError, _RetryableResponse):
+                    continue
+                if uploaded is not None:
+                    return uploaded
+                offset = received
+                continue
+
+            failures = 0
+            if self.progress:
+                self.progress(end, size)
+            logger.debug(f"Uploaded {end / (1024 * 1024):.1f}/{size / (1024 * 1024):.1f}MB of {path.name}",
+                         extra={'video': str(path), 'uploaded_bytes': end, 'total_bytes': size})
+            if final:
+                return response.json()['file']
+            offset = end
+
+
+def upload_video(client, video_path: str, api_key: Optional[str] = None) -> str:
+    """
+    Upload a video to the File API, resumably if it is large.
+
+    Args:
+        client: google-genai Client, used for files below RESUMABLE_THRESHOLD
+        video_path: Video to upload
+        api_key: Gemini API key for resumable uploads (GOOGLE_API_KEY if omitted)
+
+    Returns:
+        The File API name of the upload (e.g. 'files/abc123'), for client.files.get
+    """
+    if os.path.getsize(video_path) < RESUMABLE_THRESHOLD:
+        return client.files.upload(file=video_path).name
+    return ResumableUploader(api_key).upload(video_path)['name']
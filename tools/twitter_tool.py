@@ -1,19 +1,11 @@
 from crewai.tools import BaseTool
 from typing import Type, Any, List, Dict, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
 import os
-import logging
 
-# Set up logging
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+from logging_config import get_logger
 
-# Create console handler with formatting
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+logger = get_logger(__name__)
 
 
 class TwitterSearchToolInput(BaseModel):
@@ -71,6 +63,8 @@ class TwitterSearchTool(BaseTool):
                 logger.error("EXA_API_KEY environment variable not set")
                 return "Error: EXA_API_KEY environment variable not set"
 
+            from openai import OpenAI
+
             logger.debug("Initializing OpenAI client with Exa API")
             # Initialize OpenAI client with Exa's base URL
             client = OpenAI(
@@ -0,0 +1,107 @@
+"""Async batch publisher for creating many Typefully drafts at once"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from logging_config import get_logger
+
+if TYPE_CHECKING:
+    from .typefully_tool import TypefullyTool
+
+logger = get_logger(__name__)
+
+
+class TypefullyBatchPublisher:
+    """
+    Submit many Typefully drafts concurrently with bounded parallelism.
+
+    Each draft is a dictionary with the same fields and defaults as
+    TypefullyToolSchema (content, schedule_date, auto_split, share) plus an
+    optional "key" used to identify the draft in the returned manifest, e.g.
+    a track name or a project name for per-project quote-tweet drafts.
+    """
+
+    def __init__(self, max_concurrency: int = 4, tool: Optional['TypefullyTool'] = None):
+        """
+        Args:
+            max_concurrency: Maximum number of draft requests in flight at once
+            tool: TypefullyTool instance to publish with (created if omitted)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        if tool is None:
+            from .typefully_tool import TypefullyTool
+            tool = TypefullyTool()
+        self.tool = tool
+
+    async def publish(self, drafts: List[Dict], manifest_file: Optional[str] = None) -> List[Dict]:
+        """
+        Create all drafts concurrently and return a manifest.
+
+        Args:
+            drafts: List of draft specifications
+            manifest_file: Optional path to write the manifest to as JSON
+
+        Returns:
+            One manifest entry per draft, in input order, with key, success,
+            draft_id, share_url, scheduled_at and error
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def submit(index: int, draft: Dict) -> Dict:
+            key = draft.get("key") or f"draft_{index + 1}"
+            async with semaphore:
+                try:
+                    # TypefullyTool is a blocking requests client, so run it off the event loop
+                    result = await asyncio.to_thread(
+                        self.tool._run,
+                        content=draft["content"],
+                        schedule_date=draft.get("schedule_date"),
+                        auto_split=draft.get("auto_split", True),
+                        share=draft.get("share", False)
+                    )
+                except Exception as e:
+                    result = {"success": False, "error": str(e), "draft_id": None}
+
+            return {
+                "key": key,
+                "success": result.get("success", False),
+                "draft_id": result.get("draft_id"),
+                "share_url": result.get("share_url"),
+                "scheduled_at": result.get("scheduled_at"),
+                "error": result.get("error")
+            }
+
+        manifest = await asyncio.gather(*(submit(i, draft) for i, draft in enumerate(drafts)))
+        manifest = list(manifest)
+
+        succeeded = sum(1 for entry in manifest if entry["success"])
+        logger.info(f"✅ Created {succeeded}/{len(manifest)} Typefully drafts")
+
+        if manifest_file:
+            path = Path(manifest_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+        return manifest
+
+
+def publish_drafts(drafts: List[Dict], max_concurrency: int = 4,
+                   manifest_file: Optional[str] = None) -> List[Dict]:
+    """
+    Synchronous convenience wrapper around TypefullyBatchPublisher.publish.
+
+    Args:
+        drafts: List of draft specifications
+        max_concurrency: Maximum number of draft requests in flight at once
+        manifest_file: Optional path to write the manifest to as JSON
+
+    Returns:
+        The draft manifest
+    """
+    publisher = TypefullyBatchPublisher(max_concurrency=max_concurrency)
+    return asyncio.run(publisher.publish(drafts, manifest_file=manifest_file))
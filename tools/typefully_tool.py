@@ -6,6 +6,10 @@ from typing import Dict, List, Optional
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
 
 class TypefullyToolSchema(BaseModel):
     """Input schema for TypefullyTool"""
@@ -96,11 +100,11 @@ class TypefullyTool(BaseTool):
             }
 
             # Log success
-            print(f"✅ Typefully draft created successfully! ID: {result['draft_id']}")
+            logger.info(f"✅ Typefully draft created successfully! ID: {result['draft_id']}")
             if result['share_url']:
-                print(f"🔗 Shareable link: {result['share_url']}")
+                logger.info(f"🔗 Shareable link: {result['share_url']}")
             if result['scheduled_at']:
-                print(f"📅 Scheduled for: {result['scheduled_at']}")
+                logger.info(f"📅 Scheduled for: {result['scheduled_at']}")
 
             return result
 
@@ -113,7 +117,7 @@ class TypefullyTool(BaseTool):
                 except:
                     error_message = f"Typefully API error: {e.response.text}"
 
-            print(f"❌ {error_message}")
+            logger.error(f"❌ {error_message}")
 
             return {
                 "success": False,
@@ -122,6 +126,37 @@ class TypefullyTool(BaseTool):
             }
 
 
+    def replace_draft(
+        self,
+        draft_id: str,
+        content: str,
+        auto_split: bool = True,
+        share: bool = False
+    ) -> Dict:
+        """
+        Publish new content for an existing draft as a new draft
+
+        Typefully's v1 API can create drafts but not edit or delete them, so the
+        new content always goes into a new draft. The old draft is left as is,
+        and a warning says which one it was, so it can be deleted in Typefully.
+
+        Args:
+            draft_id: ID of the draft the new one replaces
+            content: The new content of the tweet thread
+            auto_split: Whether to auto-split long content
+            share: Whether to generate a shareable link
+
+        Returns:
+            Dictionary with the new draft information, plus replaced_draft_id
+        """
+        result = self._run(content=content, auto_split=auto_split, share=share)
+        result["replaced_draft_id"] = draft_id
+        if result["success"]:
+            logger.warning(f"⚠️  Typefully drafts can't be edited through the API: created draft "
+                           f"{result['draft_id']} to replace draft {draft_id}, delete the old one in Typefully")
+        return result
+
+
 class TypefullyScheduleTool(BaseTool):
     name: str = "typefully_schedule_next_slot"
     description: str = "Schedule a draft in the next available slot in Typefully queue"
@@ -198,10 +233,10 @@ class TypefullyScheduleTool(BaseTool):
             }
 
             # Log success
-            print(f"✅ Typefully draft scheduled in next slot! ID: {result['draft_id']}")
+            logger.info(f"✅ Typefully draft scheduled in next slot! ID: {result['draft_id']}")
             if result['share_url']:
-                print(f"🔗 Shareable link: {result['share_url']}")
-            print(f"📅 Scheduled for: {result['scheduled_at']}")
+                logger.info(f"🔗 Shareable link: {result['share_url']}")
+            logger.info(f"📅 Scheduled for: {result['scheduled_at']}")
 
             return result
 
@@ -214,7 +249,7 @@ class TypefullyScheduleTool(BaseTool):
                 except:
                     error_message = f"Typefully API error: {e.response.text}"
 
-            print(f"❌ {error_message}")
+            logger.error(f"❌ {error_message}")
 
             return {
                 "success": False,
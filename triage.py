@@ -0,0 +1,143 @@
+"""
+Two-tier analysis: a cheap triage pass for every video, a deep pass for a few.
+
+The triage pass calls Gemini directly (no agent round-trip) with a smaller model,
+a lower frame rate and no transcription, and extracts just the project name,
+description, tagline and a rough engagement score. Only the top-K videos by that
+score, and videos whose triage was inconclusive, go through the full individual
+crew. Everything else is summarized from its triage result.
+"""
+import asyncio
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from result_sink import JsonlResultSink, hash_file
+from sampling import sampling_for_video
+
+TRIAGE_MODEL = os.getenv("GEMINI_TRIAGE_MODEL", "gemini-2.0-flash-lite")
+TRIAGE_FPS = 0.5
+
+TRIAGE_PROMPT = (
+    "You are triaging a hackathon project demo video. Respond with ONLY a JSON object, "
+    "no other text, with these keys:\n"
+    '- "name": the project name as presented (string)\n'
+    '- "description": one sentence describing what the project does (string)\n'
+    '- "tagline": a short catchy tagline or category (string)\n'
+    '- "engagement_score": how engaging this demo would be on social media, 0 to 10 (number)\n'
+    '- "confidence": how confident you are in the name and description, 0 to 1 (number)'
+)
+
+
+def parse_triage(text: str) -> Optional[Dict]:
+    """
+    Extract the triage JSON object from the Gemini tool output.
+
+    Returns None if the output has no usable JSON object (e.g. the tool returned an error).
+    """
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not data.get('name'):
+        return None
+
+    try:
+        engagement = float(data.get('engagement_score', 0))
+        confidence = float(data.get('confidence', 0))
+    except (TypeError, ValueError):
+        engagement, confidence = 0.0, 0.0
+
+    return {
+        'name': str(data['name']).strip(),
+        'description': str(data.get('description', '')).strip(),
+        'tagline': str(data.get('tagline', '')).strip(),
+        'engagement_score': engagement,
+        'confidence': confidence
+    }
+
+
+def triage_summary(triage: Dict) -> str:
+    """Format a triage result like the output of video_analysis_task."""
+    return f"{triage['name']}\n\n{triage['description']}\n\n{triage['tagline']}\n@unknown"
+
+
+def triage_video(video_path: str) -> Optional[Dict]:
+    """Run the cheap analysis pass on one video (blocking)."""
+    from tools import GeminiVideoTool
+
+    # Never sample more densely than the deep pass would for this video
+    sampling = sampling_for_video(video_path)
+    end_offset = sampling['end_offset']
+    output = GeminiVideoTool()._run(
+        video_path=video_path,
+        prompt=TRIAGE_PROMPT,
+        end_time=f"{end_offset // 60}:{end_offset % 60:02d}" if end_offset is not None else None,
+        fps=min(TRIAGE_FPS, sampling['fps']),
+        transcribe=False,
+        model=TRIAGE_MODEL
+    )
+    return parse_triage(output)
+
+
+async def triage_videos(video_inputs: List[Dict], max_concurrency: int = 8) -> List[Dict]:
+    """
+    Run the triage pass on every video concurrently.
+
+    Args:
+        video_inputs: Video inputs as built by process_videos
+        max_concurrency: Maximum number of triage calls in flight
+
+    Returns:
+        One entry per video with video_input, video_hash and triage (None if triage failed)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(video_input: Dict) -> Dict:
+        async with semaphore:
+            video_hash = video_input.get('video_hash') or await asyncio.to_thread(hash_file, video_input['video_path'])
+            triage = await asyncio.to_thread(triage_video, video_input['video_path'])
+        return {'video_input': {**video_input, 'video_hash': video_hash}, 'video_hash': video_hash, 'triage': triage}
+
+    return list(await asyncio.gather(*(run(video_input) for video_input in video_inputs)))
+
+
+def select_deep_pass(triaged: List[Dict], top_k: int, min_confidence: float) -> List[Dict]:
+    """
+    Pick the videos that deserve the full analysis.
+
+    Args:
+        triaged: Results of triage_videos
+        top_k: Number of top videos by preliminary engagement score to analyze in depth
+        min_confidence: Videos triaged with lower confidence (or not at all) are analyzed in depth too
+
+    Returns:
+        The selected entries, highest preliminary score first
+    """
+    uncertain = [t for t in triaged if t['triage'] is None or t['triage']['confidence'] < min_confidence]
+    confident = [t for t in triaged if t not in uncertain]
+    ranked = sorted(confident, key=lambda t: t['triage']['engagement_score'], reverse=True)
+    return ranked[:top_k] + uncertain
+
+
+def record_triage(sink: JsonlResultSink, entry: Dict) -> Dict:
+    """Write a triage-only result to the sink, in the same shape as a crew result."""
+    video_input = entry['video_input']
+    triage = entry['triage']
+    record = {
+        'video_hash': entry['video_hash'],
+        'video_filename': video_input['video_filename'],
+        'video_path': video_input['video_path'],
+        'status': 'success',
+        'error': None,
+        'summary': triage_summary(triage),
+        'fidelity': 'triage',
+        'engagement_score': triage['engagement_score'],
+        'confidence': triage['confidence']
+    }
+    sink.write(record)
+    return record
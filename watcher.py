@@ -0,0 +1,223 @@
+"""
+Watch mode: ingest hackathon videos continuously as they arrive in a folder.
+
+New files are detected with inotify when the optional `inotify_simple` package
+is installed (Linux), and by polling the directory otherwise. A file is only
+processed once its size and modification time have stopped changing for a
+settle period, so half-copied uploads are never sent to Gemini.
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from discovery import VIDEO_EXTENSIONS
+from logging_config import get_logger
+from result_sink import JsonlResultSink
+from scheduler import Deadline
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+logger = get_logger(__name__)
+
+
+class VideoWatcher:
+    """Detect new video files in a directory once they have finished copying."""
+
+    def __init__(self, directory: str, settle_seconds: float = 10.0, poll_interval: float = 2.0,
+                 ignore: Optional[Set[str]] = None):
+        """
+        Args:
+            directory: Directory to watch
+            settle_seconds: How long a file must stay unchanged before it is considered complete
+            poll_interval: Seconds between directory scans
+            ignore: Absolute paths that were already processed and should be skipped
+        """
+        self.directory = Path(directory)
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.seen = set(ignore or ())
+        # path -> (size, mtime, time the file was first seen with that size/mtime)
+        self._pending: Dict[str, Tuple[int, float, float]] = {}
+
+        self._inotify = None
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(
+                    str(self.directory),
+                    flags.CREATE | flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO
+                )
+            except OSError:
+                # e.g. watch limit reached or a filesystem without inotify support
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify else "polling"
+
+    def _scan(self) -> List[Path]:
+        """Return stable video files that haven't been seen yet."""
+        now = time.monotonic()
+        ready = []
+
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                if Path(entry.name).suffix.lower() not in VIDEO_EXTENSIONS:
+                    continue
+                path = os.path.abspath(entry.path)
+                if path in self.seen:
+                    continue
+
+                stat = entry.stat()
+                previous = self._pending.get(path)
+                if previous is None or previous[:2] != (stat.st_size, stat.st_mtime):
+                    # New file, or still growing: restart its settle timer
+                    self._pending[path] = (stat.st_size, stat.st_mtime, now)
+                elif stat.st_size > 0 and now - previous[2] >= self.settle_seconds:
+                    del self._pending[path]
+                    self.seen.add(path)
+                    ready.append(Path(path))
+
+        return sorted(ready)
+
+    async def _wait(self) -> None:
+        """Sleep until the next scan, waking early on inotify events."""
+        if self._inotify:
+            # Events only wake us up; stability is still decided by _scan
+            await asyncio.to_thread(self._inotify.read, timeout=int(self.poll_interval * 1000))
+        else:
+            await asyncio.sleep(self.poll_interval)
+
+    async def batches(self, stop: Optional[Callable[[], bool]] = None) -> AsyncIterator[List[Path]]:
+        """Yield batches of newly completed video files until stop() returns True (forever if omitted)."""
+        while not (stop and stop()):
+            ready = self._scan()
+            if ready:
+                yield ready
+            await self._wait()
+
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
+
+
+async def watch_videos(directory: str, attendee_list: str | None = None, project_gallery_url: str | None = None,
+                       settle_seconds: float = 10.0, poll_interval: float = 2.0,
+                       aggregate_on_exit: bool = True, incremental: bool = False,
+                       deadline: Optional[Deadline] = None, aggregation_reserve: float = 300.0,
+                       polish: bool = False, share: bool = False, project_drafts: bool = False,
+                       process: Optional[Callable[..., Awaitable[dict]]] = None,
+                       aggregate: Optional[Callable[..., Awaitable]] = None, **options) -> dict:
+    """
+    Process videos as they arrive in a directory until interrupted.
+
+    Each batch of completed files goes through process_videos without aggregation.
+    The running set of project summaries is kept in output/all_summaries.json, and
+    the aggregator crew runs once over all of them when watching stops. In incremental
+    mode each batch is instead scored and inserted into the ranked thread as it arrives.
+
+    Ctrl+C during a batch interrupts process_videos, which keeps the videos completed
+    so far; watching then stops and the final aggregation still runs. Watching also
+    stops once the deadline is near, leaving aggregation_reserve for the aggregation.
+
+    Args:
+        directory: Directory to watch for video files
+        attendee_list: Path to attendee list file (optional)
+        project_gallery_url: URL of hackathon project gallery to scrape (optional)
+        settle_seconds: How long a file must stay unchanged before processing
+        poll_interval: Seconds between directory scans
+        aggregate_on_exit: Whether to run the aggregator crew when watching stops
+        incremental: Update the ranking and Typefully draft after every batch
+        deadline: Deadline for the whole session, shared by every batch (optional)
+        aggregation_reserve: Seconds before the deadline kept free for aggregation
+        polish: Let the LLM polish project descriptions in the final aggregation
+        share: Ask Typefully for a shareable link to the thread's draft
+        project_drafts: Also create a Typefully draft for every project in the final aggregation
+        process: Coroutine function processing a batch (crew.process_videos)
+        aggregate: Coroutine function aggregating the session's records (crew.aggregate_summaries)
+        **options: Further process_videos options used for every batch, e.g. video_timeout,
+            max_concurrency, tiered, preflight, fingerprint, processes, batch or reuse_history
+
+    Returns:
+        Dictionary with processing results
+    """
+    # The crew is only imported once watching starts
+    if process is None or aggregate is None:
+        from crew import aggregate_summaries, process_videos
+        process = process or process_videos
+        aggregate = aggregate or aggregate_summaries
+
+    deadline = deadline or Deadline()
+    output_dir = Path('output')
+    output_dir.mkdir(exist_ok=True)
+    sink = JsonlResultSink(output_dir / 'results.jsonl')
+
+    def deadline_near() -> bool:
+        remaining = deadline.remaining()
+        return remaining is not None and remaining <= aggregation_reserve
+
+    # Files already processed successfully by an earlier run are skipped
+    processed = {record['video_path'] for record in sink.records() if record.get('status') == 'success'}
+    watcher = VideoWatcher(directory, settle_seconds, poll_interval, ignore=processed)
+    session_hashes = []
+
+    logger.info(f"👀 Watching '{directory}' for new videos ({watcher.mode}, settle {settle_seconds:.0f}s). "
+                f"Press Ctrl+C to stop.")
+
+    try:
+        async for batch in watcher.batches(stop=deadline_near):
+            logger.info(f"📥 {len(batch)} new video(s): {', '.join(p.name for p in batch)}")
+            results = await process(
+                directory=directory,
+                attendee_list=attendee_list,
+                project_gallery_url=project_gallery_url,
+                video_files=batch,
+                aggregate=False,
+                deadline=deadline,
+                aggregation_reserve=aggregation_reserve,
+                **options
+            )
+            session_hashes.extend(results.get('video_hashes', []))
+
+            # Keep the running set of project records up to date
+            with open(output_dir / 'all_summaries.json', 'w') as f:
+                json.dump(sink.summaries(session_hashes, status='success'), f, indent=2)
+            logger.info(f"📚 {len(set(session_hashes))} project(s) processed so far")
+
+            if incremental:
+                from crew import aggregate_incremental
+                await aggregate_incremental(sink.latest(results.get('video_hashes', [])), output_dir, share=share)
+
+            if results.get('interrupted'):
+                # process_videos handled the Ctrl+C itself, so it won't reach this loop
+                logger.info("⏹️  Stopped watching")
+                break
+        else:
+            logger.warning("⏱️  Deadline near, stopped watching")
+    except asyncio.CancelledError:
+        logger.info("⏹️  Stopped watching")
+    finally:
+        watcher.close()
+
+    results = {
+        'processed_videos': len(set(session_hashes)),
+        'video_hashes': session_hashes,
+        'results_file': str(sink.path)
+    }
+
+    if aggregate_on_exit and not incremental and session_hashes:
+        results['final_result'] = await asyncio.wait_for(
+            aggregate(sink.latest(session_hashes), output_dir, polish=polish, share=share,
+                      project_drafts=project_drafts),
+            deadline.remaining()
+        )
+
+    return results
@@ -0,0 +1,156 @@
+"""
+A pool of worker processes whose jobs can be stopped one at a time.
+
+ProcessPoolExecutor can't stop a call once it is running: a crew that overran
+its timeout keeps its worker busy until the pool shuts down, and jobs queued
+behind it use up their own timeouts while they wait. WorkerPool talks to each
+worker process over its own pipe instead. A job is only dispatched to an idle
+worker, so its timeout starts when it actually starts, and a worker whose job
+times out or is cancelled is terminated and replaced by a fresh one.
+"""
+import asyncio
+import multiprocessing
+from typing import Any, Callable, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _worker_main(conn, initializer: Optional[Callable], initargs: Tuple, finalizer: Optional[Callable]) -> None:
+    if initializer is not None:
+        initializer(*initargs)
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+            fn, arg = job
+            try:
+                conn.send(('ok', fn(arg)))
+            except Exception as e:
+                try:
+                    conn.send(('error', e))
+                except Exception:
+                    # The exception itself can't be pickled
+                    conn.send(('error', RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        if finalizer is not None:
+            finalizer()
+
+
+class _Worker:
+    def __init__(self, context, initializer, initargs, finalizer):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, initargs, finalizer),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def terminate(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class WorkerPool:
+    """Bounded pool of worker processes; a job that times out only takes down its own worker."""
+
+    def __init__(self, max_workers: int, initializer: Optional[Callable] = None, initargs: Tuple = (),
+                 finalizer: Optional[Callable] = None, mp_context=None):
+        """
+        Args:
+            max_workers: Maximum number of worker processes
+            initializer: Called with initargs in every worker process when it starts (optional)
+            initargs: Arguments for the initializer (must be picklable)
+            finalizer: Called in a worker process when it is shut down gracefully (optional)
+            mp_context: multiprocessing context (spawn if omitted, so workers don't inherit
+                the event loop, threads or open connections of the parent)
+        """
+        self.max_workers = max_workers
+        self._context = mp_context or multiprocessing.get_context('spawn')
+        self._worker_args = (initializer, initargs, finalizer)
+        self._workers = set()
+        self._idle: Optional[asyncio.Queue] = None
+        self.replaced = 0
+
+    async def _acquire(self) -> _Worker:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and len(self._workers) < self.max_workers:
+            worker = None
+        else:
+            # None stands for the slot of a terminated worker
+            worker = await self._idle.get()
+        if worker is None:
+            worker = _Worker(self._context, *self._worker_args)
+            self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker: _Worker) -> None:
+        # The slot goes back to the queue, so a job waiting for a worker starts a fresh one
+        self._workers.discard(worker)
+        worker.terminate()
+        self._idle.put_nowait(None)
+        self.replaced += 1
+
+    async def run(self, fn: Callable[[Any], Any], arg: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(arg) in a worker process once one is free.
+
+        Args:
+            fn: Picklable function of one argument
+            arg: Picklable argument
+            timeout: Seconds the job may run once dispatched (None for no limit)
+
+        Raises:
+            asyncio.TimeoutError: The job didn't finish in time; its worker was terminated
+            RuntimeError: The worker process died
+        """
+        worker = await self._acquire()
+        try:
+            worker.conn.send((fn, arg))
+            # The receiving thread ends as soon as the worker answers or is terminated
+            status, value = await asyncio.wait_for(asyncio.to_thread(worker.conn.recv), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Terminating worker process {worker.process.pid} after {timeout:g}s")
+            self._discard(worker)
+            raise
+        except asyncio.CancelledError:
+            self._discard(worker)
+            raise
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise RuntimeError(f"Worker process died (exit code {worker.process.exitcode})") from e
+
+        self._idle.put_nowait(worker)
+        if status == 'error':
+            raise value
+        return value
+
+    def shutdown(self, grace_period: float = 5.0) -> None:
+        """
+        Stop every worker: idle ones finish their finalizer, busy ones are terminated.
+
+        Args:
+            grace_period: Seconds an idle worker gets to run its finalizer
+        """
+        idle = set()
+        while self._idle is not None and not self._idle.empty():
+            worker = self._idle.get_nowait()
+            if worker is not None:
+                idle.add(worker)
+        for worker in idle:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            if worker in idle:
+                worker.process.join(timeout=grace_period)
+            worker.terminate()
+        self._workers.clear()